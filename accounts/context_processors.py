@@ -3,14 +3,22 @@ from __future__ import annotations
 
 from django.conf import settings
 from django.middleware.csrf import get_token
+from django.utils.functional import SimpleLazyObject
 
 
 def csrf_token_context(request):
-    """Expose the CSRF cookie value so templates can embed it for JavaScript."""
+    """Expose the CSRF cookie value so templates can embed it for JavaScript.
+
+    The token is resolved lazily so partials that never print it do not
+    force a token to be generated.
+    """
+
+    def _resolve_token() -> str:
+        token = request.COOKIES.get(settings.CSRF_COOKIE_NAME)
+        if not token:
+            token = request.META.get("CSRF_COOKIE") or get_token(request)
+        return token
 
-    token = request.COOKIES.get(settings.CSRF_COOKIE_NAME)
-    if not token:
-        token = request.META.get("CSRF_COOKIE") or get_token(request)
     return {
-        "csrf_cookie_value": token,
+        "csrf_cookie_value": SimpleLazyObject(_resolve_token),
     }
@@ -30,6 +30,17 @@ class LoginForm(AuthenticationForm):
 class RegistrationForm(UserCreationForm):
     """Public user registration form."""
 
+    email = forms.EmailField(
+        label="Email",
+        required=False,
+        help_text="Optional. We email booking decisions and payment receipts here.",
+        widget=forms.EmailInput(
+            attrs={
+                "class": "w-full rounded-xl bg-white/10 border border-white/30 px-4 py-3 text-white placeholder-white/60 backdrop-blur",
+                "placeholder": "Email (optional)",
+            }
+        ),
+    )
     password1 = forms.CharField(
         label="Password",
         widget=forms.PasswordInput(
@@ -51,7 +62,7 @@ class RegistrationForm(UserCreationForm):
 
     class Meta(UserCreationForm.Meta):
         model = get_user_model()
-        fields = ("username",)
+        fields = ("username", "email")
         widgets = {
             "username": forms.TextInput(
                 attrs={
@@ -0,0 +1,299 @@
+"""Admin decisions on pending bookings and the conflicts they resolve.
+
+``apply_bulk_decision`` locks the selected pending rows, moves them with a
+single ``bulk_update`` and brings their payments back to ``waiting`` with one
+``UPDATE``. Because bulk writes skip the model signals, payments missing for
+approved bookings are created here and cancelled windows are handed to
+``refresh_reserved_windows`` explicitly. Every approval and cancellation
+appends its outbox event inside the same transaction.
+
+Approval never produces a double booking: it runs under the venue
+reservation lock and checks each request against bookings that are already
+approved. Pending requests left overlapping a fresh approval are cancelled
+or merely flagged, depending on ``BOOKING_CONFLICT_POLICY``.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, Sequence
+
+from django import forms
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import outbox
+from .models import Booking, Payment
+from .pricing import DEFAULT_DEPOSIT, DEFAULT_METHOD, new_reference_code, quote_queryset
+from .reservations import lock_venue
+from .signals import refresh_reserved_windows
+from .slots import Interval, merge_intervals
+
+APPROVE = "approve"
+CANCEL = "cancel"
+DECISION_FIELDS = ["status", "approved_at", "approved_by", "updated_at"]
+CONFLICT_CANCEL = "cancel"
+CONFLICT_FLAG = "flag"
+
+
+@dataclass
+class BulkDecisionResult:
+    """Bookings a bulk decision moved, skipped or found in conflict with approved bookings."""
+
+    decision: str
+    processed: list[int] = field(default_factory=list)
+    skipped: list[int] = field(default_factory=list)
+    conflicted: list[int] = field(default_factory=list)
+    auto_cancelled: list[int] = field(default_factory=list)
+
+
+@dataclass
+class RequestGroup:
+    """Pending requests of one venue whose windows overlap each other, in start order."""
+
+    bookings: list[Booking]
+
+    @property
+    def is_conflict(self) -> bool:
+        return len(self.bookings) > 1
+
+
+def _overlaps(merged: Sequence[Interval], start: datetime, end: datetime) -> bool:
+    """Whether ``[start, end)`` meets one of the sorted, disjoint ``merged`` intervals."""
+
+    index = bisect_left(merged, (end,))
+    return index > 0 and merged[index - 1][1] > start
+
+
+def sweep_conflicts(candidates: Iterable[tuple[int, datetime, datetime]], blocked: Iterable[Interval]) -> list[int]:
+    """Ids of ``(id, start, end)`` candidates that overlap any ``blocked`` interval.
+
+    Both sides are sorted by start and walked once, so the cost is dominated by
+    the sorts rather than a pairwise comparison.
+    """
+
+    merged = merge_intervals(blocked)
+    hits: list[int] = []
+    index = 0
+    for pk, start, end in sorted(candidates, key=lambda candidate: (candidate[1], candidate[2])):
+        while index < len(merged) and merged[index][1] <= start:
+            index += 1
+        if index < len(merged) and merged[index][0] < end:
+            hits.append(pk)
+    return hits
+
+
+def group_overlapping(bookings: Iterable[Booking]) -> list[RequestGroup]:
+    """Cluster bookings whose windows overlap, per venue, with a sweep over start times."""
+
+    groups: list[RequestGroup] = []
+    group_end: dict[int, datetime] = {}
+    open_group: dict[int, RequestGroup] = {}
+    for booking in sorted(bookings, key=lambda item: (item.start_datetime, item.pk)):
+        current = open_group.get(booking.venue_id)
+        if current is not None and booking.start_datetime < group_end[booking.venue_id]:
+            current.bookings.append(booking)
+            group_end[booking.venue_id] = max(group_end[booking.venue_id], booking.end_datetime)
+            continue
+        current = RequestGroup(bookings=[booking])
+        groups.append(current)
+        open_group[booking.venue_id] = current
+        group_end[booking.venue_id] = booking.end_datetime
+    return groups
+
+
+def _approved_windows(venue_ids: Iterable[int], start: datetime, end: datetime) -> dict[int, list[Interval]]:
+    rows = Booking.objects.filter(
+        venue_id__in=set(venue_ids),
+        status__in=Booking.APPROVED_STATUSES,
+        start_datetime__lt=end,
+        end_datetime__gt=start,
+    ).values_list("venue_id", "start_datetime", "end_datetime")
+    windows: dict[int, list[Interval]] = defaultdict(list)
+    for venue_id, window_start, window_end in rows:
+        windows[venue_id].append((window_start, window_end))
+    return defaultdict(list, {venue_id: merge_intervals(found) for venue_id, found in windows.items()})
+
+
+def flag_blocked_requests(pending: Sequence[Booking]) -> None:
+    """Set ``conflicts_with_approved`` on each pending booking for the approvals page."""
+
+    if not pending:
+        return
+    approved = _approved_windows(
+        (booking.venue_id for booking in pending),
+        min(booking.start_datetime for booking in pending),
+        max(booking.end_datetime for booking in pending),
+    )
+    blocked: set[int] = set()
+    by_venue: dict[int, list[Booking]] = defaultdict(list)
+    for booking in pending:
+        by_venue[booking.venue_id].append(booking)
+    for venue_id, bookings in by_venue.items():
+        candidates = [(booking.pk, booking.start_datetime, booking.end_datetime) for booking in bookings]
+        blocked.update(sweep_conflicts(candidates, approved[venue_id]))
+    for booking in pending:
+        booking.conflicts_with_approved = booking.pk in blocked
+
+
+def _create_missing_payments(booking_ids: list[int]) -> None:
+    missing = Booking.objects.filter(pk__in=booking_ids, payment__isnull=True)
+    Payment.objects.bulk_create(
+        Payment(
+            booking_id=pk,
+            method=DEFAULT_METHOD,
+            status="waiting",
+            total_amount=quote.total,
+            deposit_amount=DEFAULT_DEPOSIT,
+            reference_code=new_reference_code(),
+        )
+        for pk, quote in quote_queryset(missing).items()
+    )
+
+
+def _cancel_locked(bookings: list[Booking], now: datetime, reason: str) -> None:
+    freed = [booking.reservation_snapshot() for booking in bookings]
+    for booking in bookings:
+        booking.cancel(save=False)
+        booking.updated_at = now
+    Booking.objects.bulk_update(bookings, DECISION_FIELDS)
+    outbox.record_many(outbox.event(outbox.BOOKING_CANCELLED, booking, reason=reason) for booking in bookings)
+    Payment.objects.filter(booking__in=bookings).exclude(status="waiting").update(status="waiting", updated_at=now)
+    refresh_reserved_windows(window for window in freed if window is not None)
+
+
+def _resolve_conflicts(approved: Sequence[Booking], exclude: Iterable[int], now: datetime) -> list[int]:
+    """Find pending bookings overlapping ``approved`` and cancel them unless the policy only flags."""
+
+    if not approved:
+        return []
+    pending = list(
+        Booking.objects.select_for_update()
+        .filter(
+            venue_id__in={booking.venue_id for booking in approved},
+            status=Booking.STATUS_PENDING,
+            start_datetime__lt=max(booking.end_datetime for booking in approved),
+            end_datetime__gt=min(booking.start_datetime for booking in approved),
+        )
+        .exclude(pk__in=list(exclude))
+    )
+    windows: dict[int, list[Interval]] = defaultdict(list)
+    for booking in approved:
+        windows[booking.venue_id].append((booking.start_datetime, booking.end_datetime))
+    by_venue: dict[int, list[tuple[int, datetime, datetime]]] = defaultdict(list)
+    for booking in pending:
+        by_venue[booking.venue_id].append((booking.pk, booking.start_datetime, booking.end_datetime))
+    losers: set[int] = set()
+    for venue_id, candidates in by_venue.items():
+        losers.update(sweep_conflicts(candidates, windows[venue_id]))
+    if settings.BOOKING_CONFLICT_POLICY == CONFLICT_CANCEL and losers:
+        _cancel_locked([booking for booking in pending if booking.pk in losers], now, "conflict")
+        return sorted(losers)
+    return []
+
+
+def approve_booking(booking: Booking, approver) -> list[int]:
+    """Approve one booking under its venue lock and return the pending requests it cancelled.
+
+    Raises ``forms.ValidationError`` when the booking is no longer pending or an
+    approved booking already holds the window.
+    """
+
+    with transaction.atomic():
+        lock_venue(booking.venue_id)
+        # Another admin may have decided on it since the caller loaded it.
+        current = Booking.objects.select_for_update().filter(pk=booking.pk, status=Booking.STATUS_PENDING).first()
+        if current is None:
+            raise forms.ValidationError("Booking ini sudah diproses.")
+        booking.start_datetime, booking.end_datetime = current.start_datetime, current.end_datetime
+        if (
+            Booking.objects.filter(
+                venue_id=booking.venue_id,
+                status__in=Booking.APPROVED_STATUSES,
+                start_datetime__lt=booking.end_datetime,
+                end_datetime__gt=booking.start_datetime,
+            )
+            .exclude(pk=booking.pk)
+            .exists()
+        ):
+            raise forms.ValidationError("Booking ini bentrok dengan booking lain yang sudah disetujui.")
+        booking.status = Booking.STATUS_ACTIVE
+        booking.approved_at = timezone.now()
+        booking.approved_by = approver
+        booking.save(update_fields=DECISION_FIELDS)
+        payment = booking.ensure_payment()
+        if payment.status != "waiting":
+            payment.status = "waiting"
+            payment.save(update_fields=["status", "updated_at"])
+        outbox.record(outbox.BOOKING_APPROVED, booking)
+        return _resolve_conflicts([booking], [booking.pk], booking.approved_at)
+
+
+def apply_bulk_decision(booking_ids: Iterable[int], decision: str, approver) -> BulkDecisionResult:
+    """Approve or cancel every still-pending booking of ``booking_ids`` in one transaction.
+
+    Approvals are granted first come, first served: a request whose window is
+    taken by an approved booking, or by an earlier request in the same batch,
+    is reported in ``conflicted``. Under the cancel policy it is also cancelled
+    and listed in ``auto_cancelled``; otherwise it stays pending.
+    """
+
+    if decision not in (APPROVE, CANCEL):
+        raise ValueError("Keputusan tidak valid.")
+    requested = sorted(set(booking_ids))
+    result = BulkDecisionResult(decision=decision)
+    with transaction.atomic():
+        bookings = list(
+            Booking.objects.select_for_update()
+            .filter(pk__in=requested, status=Booking.STATUS_PENDING)
+            .order_by("created_at", "pk")
+        )
+        now = timezone.now()
+        if decision == CANCEL:
+            _cancel_locked(bookings, now, "admin")
+            result.processed = sorted(booking.pk for booking in bookings)
+        elif bookings:
+            venue_ids = sorted({booking.venue_id for booking in bookings})
+            for venue_id in venue_ids:
+                lock_venue(venue_id)
+            taken = _approved_windows(
+                venue_ids,
+                min(booking.start_datetime for booking in bookings),
+                max(booking.end_datetime for booking in bookings),
+            )
+            approved: list[Booking] = []
+            for booking in bookings:
+                window = (booking.start_datetime, booking.end_datetime)
+                if _overlaps(taken[booking.venue_id], *window):
+                    result.conflicted.append(booking.pk)
+                    continue
+                insort(taken[booking.venue_id], window)
+                booking.status = Booking.STATUS_ACTIVE
+                booking.approved_at = now
+                booking.approved_by = approver
+                booking.updated_at = now
+                approved.append(booking)
+            Booking.objects.bulk_update(approved, DECISION_FIELDS)
+            outbox.record_many(outbox.event(outbox.BOOKING_APPROVED, booking) for booking in approved)
+            result.processed = sorted(booking.pk for booking in approved)
+            Payment.objects.filter(booking_id__in=result.processed).exclude(status="waiting").update(
+                status="waiting", updated_at=now
+            )
+            _create_missing_payments(result.processed)
+            result.auto_cancelled = _resolve_conflicts(approved, result.processed, now)
+            if settings.BOOKING_CONFLICT_POLICY == CONFLICT_CANCEL:
+                # Requests blocked by bookings approved before this batch overlap none of its approvals.
+                cancelled = set(result.auto_cancelled)
+                blocked = [
+                    booking for booking in bookings if booking.pk in result.conflicted and booking.pk not in cancelled
+                ]
+                if blocked:
+                    _cancel_locked(blocked, now, "conflict")
+                    result.auto_cancelled = sorted(cancelled.union(booking.pk for booking in blocked))
+
+    done = set(result.processed) | set(result.conflicted)
+    result.skipped = [pk for pk in requested if pk not in done]
+    return result
@@ -7,4 +7,4 @@ class FieldBookingConfig(AppConfig):
     verbose_name = "Field Booking"
 
     def ready(self):  # pragma: no cover
-        from . import signals  # noqa: F401
+        from . import notifications, payment_events, rollups, signals  # noqa: F401
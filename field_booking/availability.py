@@ -0,0 +1,58 @@
+"""Query helpers answering venue availability questions in the database."""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Exists, OuterRef, QuerySet
+from django.utils import timezone
+
+from .models import Booking
+
+
+def booking_horizon() -> tuple[date, date]:
+    """Return the first and last local day that availability questions may ask about."""
+
+    today = timezone.localdate()
+    reach = timedelta(days=settings.BOOKING_HORIZON_DAYS)
+    return today - reach, today + reach
+
+
+def validate_within_horizon(value: date) -> None:
+    first_day, last_day = booking_horizon()
+    if not first_day <= value <= last_day:
+        raise ValidationError(
+            f"Dates must fall between {first_day.isoformat()} and {last_day.isoformat()}.", code="out_of_range"
+        )
+
+
+def date_range_bounds(start_date: date, end_date: date) -> tuple[datetime, datetime]:
+    """Return the aware ``[start, end)`` instants covering whole local days."""
+
+    if end_date < start_date:
+        start_date, end_date = end_date, start_date
+    current_timezone = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(start_date, time.min), current_timezone)
+    end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min), current_timezone)
+    return start, end
+
+
+def overlapping_bookings(start: datetime, end: datetime) -> QuerySet:
+    """Active bookings intersecting ``[start, end)``."""
+
+    return Booking.objects.filter(
+        status__in=Booking.ACTIVE_STATUSES,
+        start_datetime__lt=end,
+        end_datetime__gt=start,
+    )
+
+
+def exclude_reserved_venues(queryset: QuerySet, start_date: date, end_date: date) -> QuerySet:
+    """Drop venues with an active booking between the two dates (inclusive).
+
+    This is a single ``NOT EXISTS`` anti-join served by ``booking_venue_window_idx``.
+    """
+
+    start, end = date_range_bounds(start_date, end_date)
+    return queryset.exclude(Exists(overlapping_bookings(start, end).filter(venue=OuterRef("pk"))))
@@ -0,0 +1,129 @@
+"""Versioned cache of the monthly availability calendar served to the venue page.
+
+Each ``(venue, month)`` pair has a version counter in the shared cache and each
+venue has a generation for changes that touch every month, such as its opening
+hours. Payload keys embed both numbers, so invalidating a month is a single
+``incr`` and superseded payloads simply age out. Counters start from a
+timestamp so an evicted counter never resurrects an older payload.
+"""
+from __future__ import annotations
+
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .availability import booking_horizon
+from .slots import SLOT_LENGTH, venue_day_slots, with_live_holds
+
+VENUE_GENERATION_KEY = "field_booking:availability:{venue_id}:generation"
+MONTH_VERSION_KEY = "field_booking:availability:{venue_id}:{month}:version"
+MONTH_PAYLOAD_KEY = "field_booking:availability:{venue_id}:{month}:{generation}:{version}"
+
+
+def parse_month(value: str) -> date:
+    """Return the first day of a ``YYYY-MM`` month within the booking horizon.
+
+    Raises ``ValueError`` with a message fit for the client otherwise.
+    """
+
+    year, _, month = value.partition("-")
+    try:
+        if len(year) != 4 or len(month) != 2:
+            raise ValueError(value)
+        first_day = date(int(year), int(month), 1)
+    except ValueError as exc:
+        raise ValueError("Month must use the YYYY-MM format.") from exc
+    horizon_start, horizon_end = booking_horizon()
+    if first_day > horizon_end or _month_end(first_day) < horizon_start:
+        raise ValueError(f"Month must fall within {settings.BOOKING_HORIZON_DAYS} days of today.")
+    return first_day
+
+
+def month_label(day: date) -> str:
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def _month_end(first_day: date) -> date:
+    next_month = (first_day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def months_between(first_day: date, last_day: date) -> list[str]:
+    months: list[str] = []
+    current = first_day.replace(day=1)
+    while current <= last_day:
+        months.append(month_label(current))
+        current = _month_end(current) + timedelta(days=1)
+    return months
+
+
+def _bump(keys: Iterable[str]) -> None:
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def _bump_now_and_on_commit(keys: list[str]) -> None:
+    if not keys:
+        return
+    _bump(keys)
+    # Readers may cache the pre-commit state under the new version meanwhile.
+    transaction.on_commit(lambda: _bump(keys))
+
+
+def invalidate_months(venue_id: int, months: Iterable[str]) -> None:
+    _bump_now_and_on_commit(
+        [MONTH_VERSION_KEY.format(venue_id=venue_id, month=month) for month in sorted(set(months))]
+    )
+
+
+def invalidate_venue(venue_id: int) -> None:
+    """Drop every cached month of a venue."""
+
+    _bump_now_and_on_commit([VENUE_GENERATION_KEY.format(venue_id=venue_id)])
+
+
+def invalidate_window(venue_id: int, start: datetime, end: datetime) -> None:
+    """Invalidate the months whose slots can intersect ``[start, end)``."""
+
+    # Overnight opening hours attach the small hours to the previous day.
+    first_day = timezone.localtime(start).date() - timedelta(days=1)
+    invalidate_months(venue_id, months_between(first_day, timezone.localtime(end).date()))
+
+
+def _versions(venue_id: int, month: str) -> tuple[int, int]:
+    generation_key = VENUE_GENERATION_KEY.format(venue_id=venue_id)
+    version_key = MONTH_VERSION_KEY.format(venue_id=venue_id, month=month)
+    found = cache.get_many([generation_key, version_key])
+    for key in (generation_key, version_key):
+        if key not in found:
+            found[key] = cache.get_or_set(key, time.time_ns, timeout=None)
+    return found[generation_key], found[version_key]
+
+
+def month_availability(venue, first_day: date, viewer_id: int | None = None) -> dict[str, Any]:
+    """Per-day and per-slot availability of ``venue`` for the month of ``first_day``.
+
+    Live holds of users other than ``viewer_id`` are overlaid on the cached days.
+    """
+
+    month = month_label(first_day)
+    generation, version = _versions(venue.pk, month)
+    key = MONTH_PAYLOAD_KEY.format(venue_id=venue.pk, month=month, generation=generation, version=version)
+    days = cache.get(key)
+    if days is None:
+        days = venue_day_slots(venue, first_day.replace(day=1), _month_end(first_day))
+        cache.set(key, days, timeout=settings.AVAILABILITY_CACHE_TIMEOUT)
+    return {
+        "venue": venue.slug,
+        "month": month,
+        "slot_minutes": int(SLOT_LENGTH.total_seconds() // 60),
+        "days": [day.as_dict() for day in with_live_holds(venue.pk, days, viewer_id)],
+    }
@@ -1,9 +1,11 @@
 """Booking and payment forms."""
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Optional
 
 from django import forms
+from django.contrib.admin.widgets import AdminDateWidget
 from django.utils import timezone
 
 from .models import Booking, Payment
@@ -50,6 +52,19 @@ def normalize_booking_window(start_date, end_date, venue) -> tuple[datetime, dat
     return start, end
 
 
+def _narrow_to_hours(opening, closing, start_date, end_date, start_time, end_time) -> tuple[datetime, datetime]:
+    """Restrict a booking window to the hours the user picked."""
+
+    start = opening if start_time is None else _ensure_timezone(datetime.combine(start_date, start_time))
+    end = closing if end_time is None else _ensure_timezone(datetime.combine(end_date, end_time))
+    if end <= start and end_time is not None:
+        # Overnight venues close on the following calendar day.
+        end += timedelta(days=1)
+    if start < opening or end > closing or end <= start:
+        raise forms.ValidationError("Selected hours must fall within the venue's available hours.")
+    return start, end
+
+
 def ensure_no_overlap(venue, start: datetime, end: datetime, instance_pk: Optional[int] = None) -> None:
     if venue is None:
         return
@@ -82,6 +97,29 @@ class BookingForm(forms.ModelForm):
             }
         )
     )
+    start_time = forms.TimeField(
+        required=False,
+        label="From",
+        help_text="Leave empty to book the whole day.",
+        widget=forms.TimeInput(
+            attrs={
+                "type": "time",
+                "step": 3600,
+                "class": "w-full rounded-xl border border-white/40 bg-white/10 px-4 py-3 text-white placeholder-white/60 backdrop-blur",
+            }
+        ),
+    )
+    end_time = forms.TimeField(
+        required=False,
+        label="Until",
+        widget=forms.TimeInput(
+            attrs={
+                "type": "time",
+                "step": 3600,
+                "class": "w-full rounded-xl border border-white/40 bg-white/10 px-4 py-3 text-white placeholder-white/60 backdrop-blur",
+            }
+        ),
+    )
     notes = forms.CharField(
         required=False,
         widget=forms.Textarea(
@@ -127,64 +165,24 @@ class BookingForm(forms.ModelForm):
         end_date = cleaned_data.get("end_datetime")
 
         if start_date and end_date:
-            start_time = getattr(self.venue, "available_start_time", None)
-            end_time = getattr(self.venue, "available_end_time", None)
-
-            if start_time is None or end_time is None:
-                start_time = datetime.min.time()
-                end_time = datetime.max.time().replace(microsecond=0)
-
-            start = datetime.combine(start_date, start_time)
-            end = datetime.combine(end_date, end_time)
-
-            current_timezone = timezone.get_current_timezone()
-            if timezone.is_naive(start):
-                try:
-                    start = timezone.make_aware(start, timezone=current_timezone)
-                except Exception:
-                    try:
-                        start = timezone.make_aware(start, timezone=current_timezone, is_dst=True)
-                    except Exception:
-                        # Timezone support disabled or timezone not found; keep naive datetime.
-                        pass
-            if timezone.is_naive(end):
-                try:
-                    end = timezone.make_aware(end, timezone=current_timezone)
-                except Exception:
-                    try:
-                        end = timezone.make_aware(end, timezone=current_timezone, is_dst=True)
-                    except Exception:
-                        pass
-
+            start, end = normalize_booking_window(start_date, end_date, self.venue)
+            # Store aware datetimes before any check, so an error never hands plain dates to the model.
             cleaned_data["start_datetime"] = start
             cleaned_data["end_datetime"] = end
-
-            if end.date() < start.date():
+            if end_date < start_date:
                 raise forms.ValidationError("End date must be on or after the start date.")
-
             if end <= start:
                 raise forms.ValidationError(
                     "Selected dates must fall within the venue's available hours."
                 )
 
-        if start_date and end_date and self.venue is not None:
-            start = cleaned_data.get("start_datetime")
-            end = cleaned_data.get("end_datetime")
-            overlapping = (
-                Booking.objects.filter(
-                    venue=self.venue,
-                    status__in=Booking.ACTIVE_STATUSES,
-                )
-                .filter(start_datetime__lt=end, end_datetime__gt=start)
-                .exclude(pk=self.instance.pk)
-            )
-            if overlapping.exists():
-                raise forms.ValidationError(
-                    "This venue is already booked for the selected dates."
-                )
-
-            if self.venue is not None:
-                ensure_no_overlap(self.venue, start, end, self.instance.pk)
+            slot_start = cleaned_data.get("start_time")
+            slot_end = cleaned_data.get("end_time")
+            if slot_start is not None or slot_end is not None:
+                start, end = _narrow_to_hours(start, end, start_date, end_date, slot_start, slot_end)
+            cleaned_data["start_datetime"] = start
+            cleaned_data["end_datetime"] = end
+        # Overlaps are checked once, under the venue lock, by reservations.reserve_booking().
         return cleaned_data
 
 
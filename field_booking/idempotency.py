@@ -0,0 +1,215 @@
+"""Idempotency keys for booking and payment submissions.
+
+Clients send an ``Idempotency-Key`` header, and the HTML forms post an
+``idempotency_key`` field rendered by ``{% idempotency_key_input %}``. The
+first request carrying a key claims an ``IdempotencyKey`` row and runs the
+view. Its redirect or JSON response is stored together with a fingerprint of
+the request. A retry of the same request within
+``IDEMPOTENCY_KEY_TTL_HOURS`` receives the stored response and flash messages
+without running the view again. Reusing a key for a different request is
+rejected. A retry that arrives while the first request is still running gets
+a 409 when it came from a script (a key header or an AJAX request); a form
+resubmission is sent back to the page it came from with a notice instead.
+A request that died without finishing holds its key only for
+``IDEMPOTENCY_PROCESSING_LEASE_SECONDS``; after that, a retry runs again.
+"""
+from __future__ import annotations
+
+import hashlib
+from datetime import timedelta
+from functools import wraps
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.contrib import messages
+from django.db import IntegrityError, transaction
+from django.http import HttpRequest, HttpResponse, HttpResponseRedirect, JsonResponse
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import url_has_allowed_host_and_scheme
+
+from .models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+FORM_FIELD = "idempotency_key"
+MAX_KEY_LENGTH = 255
+# Fields that differ between otherwise identical submissions.
+VOLATILE_FIELDS = {"csrfmiddlewaretoken", FORM_FIELD}
+
+
+def request_key(request: HttpRequest) -> Optional[str]:
+    key = (request.headers.get(HEADER) or request.POST.get(FORM_FIELD) or "").strip()
+    return key[:MAX_KEY_LENGTH] or None
+
+
+def request_fingerprint(request: HttpRequest) -> str:
+    digest = hashlib.sha256(request.path.encode())
+    for name in sorted(set(request.POST) - VOLATILE_FIELDS):
+        for value in request.POST.getlist(name):
+            digest.update(f"\0{name}={value}".encode())
+    return digest.hexdigest()
+
+
+def _wants_json(request: HttpRequest) -> bool:
+    return HEADER in request.headers or request.headers.get("x-requested-with", "").lower() == "xmlhttprequest"
+
+
+def _back_url(request: HttpRequest) -> str:
+    referer = request.headers.get("referer", "")
+    if url_has_allowed_host_and_scheme(referer, allowed_hosts={request.get_host()}, require_https=request.is_secure()):
+        return referer
+    return reverse("booked-places")
+
+
+def _messages_so_far(request: HttpRequest) -> list:
+    """Every flash message of the request so far, left in place for the next page."""
+
+    storage = messages.get_messages(request)
+    found = list(storage)
+    # Iterating marks the messages as shown; keep them queued.
+    storage.used = False
+    return found
+
+
+def _replay(request: HttpRequest, record: IdempotencyKey) -> HttpResponse:
+    for level, message in record.response_messages:
+        messages.add_message(request, level, message)
+    if record.response_location:
+        response = HttpResponseRedirect(record.response_location)
+        response.status_code = record.status_code
+    else:
+        response = HttpResponse(
+            bytes(record.response_body), status=record.status_code, content_type=record.response_content_type
+        )
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _claim(request: HttpRequest, scope: str, key: str, fingerprint: str) -> tuple[IdempotencyKey, bool]:
+    """Return the key's row and whether this request created it."""
+
+    now = timezone.now()
+    expires_at = now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+    # Look first so replays cost a single read.
+    record = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+    if record is None:
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    user=request.user,
+                    key=key,
+                    scope=scope,
+                    request_fingerprint=fingerprint,
+                    claimed_at=now,
+                    expires_at=expires_at,
+                )
+            return record, True
+        except IntegrityError:
+            record = IdempotencyKey.objects.get(user=request.user, key=key)
+    abandoned = (
+        record.status_code is None
+        and record.claimed_at <= now - timedelta(seconds=settings.IDEMPOTENCY_PROCESSING_LEASE_SECONDS)
+        and (record.scope, record.request_fingerprint) == (scope, fingerprint)
+    )
+    if record.expires_at <= now or abandoned:
+        # Take over an expired row, or one whose request died mid-flight; the
+        # conditional update lets only one retry win.
+        claimed = IdempotencyKey.objects.filter(
+            pk=record.pk, claimed_at=record.claimed_at, status_code=record.status_code
+        ).update(
+            scope=scope,
+            request_fingerprint=fingerprint,
+            status_code=None,
+            response_location="",
+            response_content_type="",
+            response_body=b"",
+            response_messages=[],
+            claimed_at=now,
+            expires_at=expires_at,
+        )
+        if claimed:
+            record.refresh_from_db()
+            return record, True
+        record.refresh_from_db()
+    return record, False
+
+
+def _is_storable(response: HttpResponse) -> bool:
+    if getattr(response, "streaming", False):
+        return False
+    return 300 <= response.status_code < 400 or response.get("Content-Type", "").startswith("application/json")
+
+
+def _store(request: HttpRequest, record: IdempotencyKey, response: HttpResponse, queued_before: int) -> None:
+    queued = _messages_so_far(request)[queued_before:]
+    record.status_code = response.status_code
+    record.response_location = response.get("Location", "")
+    record.response_content_type = "" if record.response_location else response.get("Content-Type", "")
+    record.response_body = b"" if record.response_location else response.content
+    record.response_messages = [[message.level, str(message.message)] for message in queued]
+    record.save(
+        update_fields=[
+            "status_code",
+            "response_location",
+            "response_content_type",
+            "response_body",
+            "response_messages",
+        ]
+    )
+
+
+def idempotent(scope: str) -> Callable:
+    """Decorate a view method taking ``(self, request, ...)`` so keyed retries replay its response.
+
+    Requests without a key run unchanged. Responses that are neither redirects
+    nor JSON, such as a re-rendered form with errors, release the key.
+    """
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+            key = request_key(request)
+            if key is None or not request.user.is_authenticated:
+                return view(self, request, *args, **kwargs)
+            fingerprint = request_fingerprint(request)
+            record, created = _claim(request, scope, key, fingerprint)
+            if not created:
+                if record.scope != scope or record.request_fingerprint != fingerprint:
+                    return JsonResponse(
+                        {"error": "This idempotency key was already used for a different request."}, status=422
+                    )
+                if record.status_code is None:
+                    if _wants_json(request):
+                        return JsonResponse({"error": "The original request is still being processed."}, status=409)
+                    messages.info(request, "Your earlier submission is still being processed. Check back in a moment.")
+                    return redirect(_back_url(request))
+                return _replay(request, record)
+
+            queued_before = len(_messages_so_far(request))
+            try:
+                response = view(self, request, *args, **kwargs)
+            except Exception:
+                record.delete()
+                raise
+            if _is_storable(response):
+                _store(request, record, response, queued_before)
+            else:
+                record.delete()
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def sweep_expired_keys(batch_size: int = 1000) -> int:
+    """Delete expired keys in batches and return how many were removed."""
+
+    removed = 0
+    now = timezone.now()
+    while True:
+        batch = list(IdempotencyKey.objects.filter(expires_at__lte=now).values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            return removed
+        removed += IdempotencyKey.objects.filter(pk__in=batch).delete()[0]
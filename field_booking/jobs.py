@@ -0,0 +1,261 @@
+"""Database-backed queue for work that should not run inside a request.
+
+Views and signals call ``enqueue`` inside their own transaction, so a job
+exists exactly when the change that needs it was committed. ``run_jobs``
+workers claim due jobs by priority with ``SKIP LOCKED`` and run them.
+Failures are retried with exponential backoff until the type's
+``max_attempts``. A type's ``concurrency`` caps how many of its jobs run at
+once: each running job holds a numbered slot, and a partial unique constraint
+rejects a second claim of the same slot. A worker that dies mid-job loses its
+lease after ``JOB_LEASE_SECONDS`` and the job is queued again.
+
+Job types register with ``@job("name")`` in the module that owns the work;
+handlers receive the payload as keyword arguments. A handler runs in one
+transaction with its success mark unless its type is registered with
+``atomic=False``, for work that commits in batches and must not roll back
+what it already did, such as sending email.
+"""
+from __future__ import annotations
+
+import logging
+import traceback
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 0
+PRIORITY_LOW = -10
+MAX_BACKOFF_SECONDS = 3600
+
+
+@dataclass(frozen=True)
+class JobType:
+    """How jobs of one type are run and retried."""
+
+    name: str
+    handler: Callable[..., Any]
+    max_attempts: int = 5
+    retry_delay: int = 30
+    concurrency: Optional[int] = None
+    priority: int = PRIORITY_NORMAL
+    # Handlers that commit in batches of their own run outside the job's transaction.
+    atomic: bool = True
+
+    def backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.retry_delay * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS))
+
+
+_job_types: dict[str, JobType] = {}
+
+
+def job(
+    name: str,
+    *,
+    max_attempts: int = 5,
+    retry_delay: int = 30,
+    concurrency: Optional[int] = None,
+    priority: int = PRIORITY_NORMAL,
+    atomic: bool = True,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Register ``handler`` as the job type ``name``."""
+
+    def register(handler: Callable[..., Any]) -> Callable[..., Any]:
+        _job_types[name] = JobType(name, handler, max_attempts, retry_delay, concurrency, priority, atomic)
+        return handler
+
+    return register
+
+
+def registered_job_types() -> dict[str, JobType]:
+    return dict(_job_types)
+
+
+def enqueue(
+    job_type: str,
+    payload: Optional[dict[str, Any]] = None,
+    *,
+    priority: Optional[int] = None,
+    run_after: Optional[datetime] = None,
+    unique_key: Optional[str] = None,
+) -> Job:
+    """Queue a job and return it.
+
+    With ``unique_key``, an equal job that is still queued is returned instead,
+    moved up to run no later than this one would have.
+    """
+
+    spec = _job_types[job_type]
+    fields = {
+        "job_type": job_type,
+        "payload": payload or {},
+        "priority": spec.priority if priority is None else priority,
+        "run_after": run_after or timezone.now(),
+        "unique_key": unique_key,
+    }
+    if unique_key is None:
+        return Job.objects.create(**fields)
+    while True:
+        try:
+            with transaction.atomic():
+                return Job.objects.create(**fields)
+        except IntegrityError:
+            queued = Job.objects.filter(unique_key=unique_key, status=Job.STATUS_QUEUED)
+            queued.filter(run_after__gt=fields["run_after"]).update(run_after=fields["run_after"])
+            existing = queued.first()
+            if existing is not None:
+                return existing
+            # A worker claimed the equal job in between; queue this one after all.
+
+
+def requeue_expired(now: Optional[datetime] = None) -> int:
+    """Put running jobs whose worker lost its lease back in the queue; return how many were requeued."""
+
+    now = now or timezone.now()
+    expired = Job.objects.filter(status=Job.STATUS_RUNNING, locked_until__lte=now)
+    released = {"slot": None, "locked_by": "", "locked_until": None}
+    with transaction.atomic():
+        keyed = expired.filter(unique_key__isnull=False)
+        # An equal job that is queued, or requeued just now, already covers a lost one.
+        covered = set(
+            Job.objects.filter(status=Job.STATUS_QUEUED, unique_key__in=keyed.values("unique_key")).values_list(
+                "unique_key", flat=True
+            )
+        )
+        redundant = []
+        for pk, unique_key in keyed.order_by("id").values_list("pk", "unique_key"):
+            if unique_key in covered:
+                redundant.append(pk)
+            covered.add(unique_key)
+        expired.filter(pk__in=redundant).update(
+            status=Job.STATUS_FAILED, last_error="Lease lost; an equal job is queued.", finished_at=now, **released
+        )
+        return expired.update(status=Job.STATUS_QUEUED, **released)
+
+
+def _claim(worker: str, types: dict[str, JobType], now: datetime) -> Optional[Job]:
+    running = dict(
+        Job.objects.filter(status=Job.STATUS_RUNNING, job_type__in=list(types))
+        .values_list("job_type")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    open_types = [
+        name for name, spec in types.items() if spec.concurrency is None or running.get(name, 0) < spec.concurrency
+    ]
+    if not open_types:
+        return None
+    with transaction.atomic():
+        claimed = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.STATUS_QUEUED, job_type__in=open_types, run_after__lte=now)
+            .order_by("-priority", "run_after", "id")
+            .first()
+        )
+        if claimed is None:
+            return None
+        spec = types[claimed.job_type]
+        if spec.concurrency is not None:
+            taken = set(
+                Job.objects.filter(status=Job.STATUS_RUNNING, job_type=claimed.job_type).values_list("slot", flat=True)
+            )
+            free = [slot for slot in range(spec.concurrency) if slot not in taken]
+            if not free:
+                return None
+            claimed.slot = free[0]
+        claimed.status = Job.STATUS_RUNNING
+        claimed.attempts += 1
+        claimed.locked_by = worker
+        claimed.locked_until = now + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        claimed.save(update_fields=["status", "slot", "attempts", "locked_by", "locked_until"])
+    return claimed
+
+
+def claim_next(worker: str, types: Optional[Iterable[str]] = None, now: Optional[datetime] = None) -> Optional[Job]:
+    """Lease the most urgent due job this worker may run, or return ``None``."""
+
+    registered = registered_job_types()
+    if types is not None:
+        registered = {name: registered[name] for name in types}
+    try:
+        return _claim(worker, registered, now or timezone.now())
+    except IntegrityError:
+        # Another worker took the same concurrency slot first.
+        return None
+
+
+def _finish(claimed: Job, **fields: Any) -> None:
+    fields.update(slot=None, locked_by="", locked_until=None)
+    # Only the lease holder may finish the job; a requeued job belongs to its next worker.
+    Job.objects.filter(pk=claimed.pk, status=Job.STATUS_RUNNING, locked_by=claimed.locked_by).update(**fields)
+
+
+def run_job(claimed: Job) -> bool:
+    """Run a claimed job, then mark it succeeded, retry it later or fail it; return whether it succeeded."""
+
+    spec = _job_types[claimed.job_type]
+    try:
+        with transaction.atomic() if spec.atomic else nullcontext():
+            spec.handler(**claimed.payload)
+            # Database work of an atomic handler and the success mark commit together.
+            _finish(claimed, status=Job.STATUS_SUCCEEDED, last_error="", finished_at=timezone.now())
+    except Exception as exc:
+        now = timezone.now()
+        error = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+        if claimed.attempts >= spec.max_attempts:
+            logger.exception("Job %s #%s failed after %s attempts.", claimed.job_type, claimed.pk, claimed.attempts)
+            _finish(claimed, status=Job.STATUS_FAILED, last_error=error, finished_at=now)
+        else:
+            try:
+                with transaction.atomic():
+                    _finish(
+                        claimed,
+                        status=Job.STATUS_QUEUED,
+                        last_error=error,
+                        run_after=now + spec.backoff(claimed.attempts),
+                    )
+            except IntegrityError:
+                # An equal job was queued while this one ran, and it covers the retry.
+                superseded = f"{error}\nSuperseded by an equal queued job."
+                _finish(claimed, status=Job.STATUS_FAILED, last_error=superseded, finished_at=now)
+        return False
+    return True
+
+
+def work(worker: str, *, types: Optional[Iterable[str]] = None, max_jobs: Optional[int] = None) -> tuple[int, int]:
+    """Run due jobs until none is left or ``max_jobs`` ran; return ``(succeeded, failed attempts)``."""
+
+    types = list(types) if types is not None else None
+    requeue_expired()
+    succeeded = failed = 0
+    while max_jobs is None or succeeded + failed < max_jobs:
+        claimed = claim_next(worker, types)
+        if claimed is None:
+            break
+        if run_job(claimed):
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
+
+
+def purge_finished(before: datetime, batch_size: int = 1000) -> int:
+    """Delete succeeded and failed jobs finished before ``before``; return how many were removed."""
+
+    removed = 0
+    finished = Job.objects.filter(status__in=[Job.STATUS_SUCCEEDED, Job.STATUS_FAILED], finished_at__lt=before)
+    while True:
+        batch = list(finished.values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            return removed
+        removed += Job.objects.filter(pk__in=batch).delete()[0]
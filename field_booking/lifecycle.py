@@ -0,0 +1,93 @@
+"""Batch status transitions for bookings whose time has passed.
+
+Approved bookings that have ended become ``completed`` and pending requests
+whose start passed without a decision become ``expired``. Each pass walks the
+``(status, time)`` indexes in batches, locks the rows that still carry a
+source status and moves them with one ``UPDATE``, so overlapping runs and
+concurrent admin decisions never move a row twice, and rows already moved
+drop out of the next batch's query. ``UPDATE`` bypasses the
+model signals, so every batch refreshes the reserved calendar and the cached
+availability of the windows it touched, and appends the outbox events of the
+rows it moved.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional, Sequence
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import outbox
+from .models import Booking
+from .signals import refresh_reserved_windows
+
+ProgressCallback = Callable[[str, int], None]
+
+
+@dataclass(frozen=True)
+class Transition:
+    """Move bookings in ``sources`` whose ``time_field`` is at or before now to ``target``."""
+
+    name: str
+    sources: Sequence[str]
+    target: str
+    time_field: str
+    topic: str
+
+
+COMPLETE_PAST = Transition(
+    "completed", Booking.APPROVED_STATUSES, Booking.STATUS_COMPLETED, "end_datetime", outbox.BOOKING_COMPLETED
+)
+EXPIRE_PENDING = Transition(
+    "expired", (Booking.STATUS_PENDING,), Booking.STATUS_EXPIRED, "start_datetime", outbox.BOOKING_EXPIRED
+)
+TRANSITIONS = (COMPLETE_PAST, EXPIRE_PENDING)
+
+
+def run_transition(
+    transition: Transition,
+    *,
+    now: Optional[datetime] = None,
+    batch_size: int = 1000,
+    max_batches: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
+    """Apply ``transition`` in batches and return how many bookings moved."""
+
+    now = now or timezone.now()
+    due = Booking.objects.filter(status__in=transition.sources, **{f"{transition.time_field}__lte": now})
+    moved = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        # No ORDER BY: the index yields any due rows and moved rows drop out of ``due``.
+        rows = list(
+            due.order_by().values_list("pk", "venue_id", "start_datetime", "end_datetime", "user_id")[:batch_size]
+        )
+        if not rows:
+            break
+        with transaction.atomic():
+            # Lock the rows that still qualify so exactly those get an outbox event.
+            moving = set(due.select_for_update().filter(pk__in=[row[0] for row in rows]).values_list("pk", flat=True))
+            moved += Booking.objects.filter(pk__in=moving).update(status=transition.target, updated_at=now)
+            refresh_reserved_windows(row[1:4] for row in rows)
+            outbox.record_many(
+                outbox.event(
+                    transition.topic,
+                    Booking(
+                        pk=pk,
+                        venue_id=venue_id,
+                        user_id=user_id,
+                        start_datetime=start,
+                        end_datetime=end,
+                        status=transition.target,
+                    ),
+                )
+                for pk, venue_id, start, end, user_id in rows
+                if pk in moving
+            )
+        batches += 1
+        if progress is not None:
+            progress(transition.name, moved)
+    return moved
@@ -0,0 +1,41 @@
+"""Complete past bookings and expire pending requests that were never decided."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from field_booking.lifecycle import TRANSITIONS, run_transition
+
+
+class Command(BaseCommand):
+    help = (
+        "Move ended bookings to completed and stale pending requests to expired in indexed batches. "
+        "Safe to schedule every minute."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Stop each transition after this many batches; the next run picks up the rest.",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        verbosity = options["verbosity"]
+
+        def report(name: str, moved: int) -> None:
+            if verbosity > 0:
+                self.stdout.write(f"  {name}: {moved} bookings so far")
+
+        for transition in TRANSITIONS:
+            moved = run_transition(
+                transition,
+                now=now,
+                batch_size=options["batch_size"],
+                max_batches=options["max_batches"],
+                progress=report,
+            )
+            self.stdout.write(self.style.SUCCESS(f"Marked {moved} bookings {transition.name}."))
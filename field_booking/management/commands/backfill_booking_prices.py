@@ -0,0 +1,33 @@
+"""Fill the booking price snapshot columns for rows written before they existed."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from field_booking.models import Booking
+from field_booking.pricing import SNAPSHOT_FIELDS, apply_quote, quote_queryset
+
+
+class Command(BaseCommand):
+    help = "Recompute billed hours and amounts on bookings. Only unpriced bookings unless --all is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--all", action="store_true", help="Reprice every booking, not only unpriced ones.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        bookings = Booking.objects.order_by("pk")
+        if not options["all"]:
+            bookings = bookings.filter(billed_hours=0)
+        ids = list(bookings.values_list("pk", flat=True))
+        updated = 0
+        for offset in range(0, len(ids), batch_size):
+            quotes = quote_queryset(Booking.objects.filter(pk__in=ids[offset : offset + batch_size]))
+            batch = []
+            for pk, quote in quotes.items():
+                booking = Booking(pk=pk)
+                apply_quote(booking, quote)
+                batch.append(booking)
+            Booking.objects.bulk_update(batch, SNAPSHOT_FIELDS)
+            updated += len(batch)
+        self.stdout.write(self.style.SUCCESS(f"Backfilled prices on {updated} bookings."))
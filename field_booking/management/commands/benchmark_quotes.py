@@ -0,0 +1,126 @@
+"""Benchmark bulk booking quotes against the per-instance ``Booking.total_cost`` path."""
+from __future__ import annotations
+
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from datetime import time as clock
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from addons.models import AddOn
+from field_booking.models import Booking
+from field_booking.pricing import quote_queryset
+from field_management.models import Category, Venue
+
+BENCHMARK_CITY = "Quote Benchmark City"
+OPENING_HOURS = [(clock(7), clock(22)), (clock(8), clock(17)), (clock(18), clock(2))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare quote_queryset with Booking.total_cost on synthetic bookings and check they agree. "
+        "Everything runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bookings", type=int, default=20_000)
+        parser.add_argument("--venues", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        with transaction.atomic():
+            venues = self._create_venues(options["venues"])
+            self._create_bookings(venues, options["bookings"])
+            self._run(options["repeat"])
+            transaction.set_rollback(True)
+
+    def _create_venues(self, count: int) -> list[Venue]:
+        category = Category.objects.create(name="Quote Benchmark", slug="benchmark-quotes")
+        Venue.objects.bulk_create(
+            Venue(
+                category=category,
+                name=f"Quote venue {index}",
+                slug=f"benchmark-quote-venue-{index}",
+                description="Synthetic venue.",
+                location="Benchmark",
+                city=BENCHMARK_CITY,
+                price_per_hour=Decimal(random.randrange(50, 300) * 1000),
+                facilities="",
+                available_start_time=OPENING_HOURS[index % len(OPENING_HOURS)][0],
+                available_end_time=OPENING_HOURS[index % len(OPENING_HOURS)][1],
+            )
+            for index in range(count)
+        )
+        venues = list(Venue.objects.filter(city=BENCHMARK_CITY))
+        AddOn.objects.bulk_create(
+            AddOn(venue=venue, name=f"Extra {index}", description="Synthetic add-on.", price=Decimal(price))
+            for venue in venues
+            for index, price in enumerate(("25000.00", "50000.00"))
+        )
+        return venues
+
+    def _create_bookings(self, venues: list[Venue], count: int) -> None:
+        user = get_user_model().objects.create_user("benchmark-quotes")
+        addons: dict[int, list[int]] = {}
+        for venue_id, addon_id in AddOn.objects.filter(venue__in=venues).values_list("venue_id", "pk"):
+            addons.setdefault(venue_id, []).append(addon_id)
+        today = timezone.localdate()
+        bookings = []
+        for _ in range(count):
+            venue = random.choice(venues)
+            day = today + timedelta(days=random.randrange(365))
+            if random.random() < 0.5:
+                # Whole opening days, the branch that depends on local time.
+                span = random.randint(0, 2)
+                start = timezone.make_aware(datetime.combine(day, venue.available_start_time))
+                end_day = day + timedelta(days=span + (venue.available_end_time <= venue.available_start_time))
+                end = timezone.make_aware(datetime.combine(end_day, venue.available_end_time))
+            else:
+                start = timezone.make_aware(datetime.combine(day, clock(random.randint(6, 20))))
+                end = start + timedelta(hours=random.randint(1, 4))
+            bookings.append(Booking(user=user, venue=venue, start_datetime=start, end_datetime=end))
+        started = time.perf_counter()
+        Booking.objects.bulk_create(bookings, batch_size=5000)
+        Through = Booking.addons.through
+        Through.objects.bulk_create(
+            (
+                Through(booking_id=booking.pk, addon_id=addon_id)
+                for booking in bookings
+                for addon_id in random.sample(addons[booking.venue_id], random.randint(0, 2))
+            ),
+            batch_size=5000,
+        )
+        self.stdout.write(f"Inserted {count} bookings in {time.perf_counter() - started:.1f}s")
+
+    def _run(self, repeat: int) -> None:
+        queryset = Booking.objects.filter(venue__city=BENCHMARK_CITY)
+        per_instance: list[float] = []
+        bulk: list[float] = []
+        expected: dict[int, Decimal] = {}
+        quotes = {}
+        for _ in range(repeat):
+            started = time.perf_counter()
+            expected = {
+                booking.pk: booking.total_cost
+                for booking in queryset.select_related("venue").prefetch_related("addons")
+            }
+            per_instance.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            quotes = quote_queryset(queryset)
+            bulk.append((time.perf_counter() - started) * 1000)
+        mismatches = [pk for pk, total in expected.items() if quotes[pk].total != total]
+        if mismatches or len(quotes) != len(expected):
+            raise CommandError(f"Bulk quotes disagree with Booking.total_cost for bookings {mismatches[:10]}")
+        self.stdout.write(
+            f"Booking.total_cost: median {statistics.median(per_instance):.1f} ms, best {min(per_instance):.1f} ms"
+        )
+        self.stdout.write(f"quote_queryset:     median {statistics.median(bulk):.1f} ms, best {min(bulk):.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"All {len(quotes)} quotes match."))
@@ -0,0 +1,20 @@
+"""Apply stored payment provider webhooks to payments and bookings."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from field_booking.payment_events import process_payment_events
+
+
+class Command(BaseCommand):
+    help = "Apply unprocessed PaymentEvent rows in batches, deduplicated by reference code. Safe to run every minute."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--max-batches", type=int, default=None)
+
+    def handle(self, *args, **options):
+        processed, updated = process_payment_events(
+            batch_size=options["batch_size"], max_batches=options["max_batches"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} payment events; updated {updated} payments."))
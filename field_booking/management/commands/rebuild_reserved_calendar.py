@@ -0,0 +1,17 @@
+"""Rebuild the per-venue reserved-day calendars from the bookings table."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from field_booking.reserved_calendar import rebuild_reserved_calendars
+
+
+class Command(BaseCommand):
+    help = "Recompute every VenueReservedCalendar row. Run after bulk booking updates that bypass signals."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        rows = rebuild_reserved_calendars(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} reserved calendar rows."))
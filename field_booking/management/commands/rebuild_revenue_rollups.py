@@ -0,0 +1,19 @@
+"""Regenerate the daily venue revenue rollups from the bookings table."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from field_booking.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute every VenueDailyRollup row. Run after bulk booking or payment writes that bypass the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        rows = rebuild_rollups(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} daily revenue rollups."))
@@ -0,0 +1,28 @@
+"""Hand new booking and payment outbox events to the registered consumers."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from field_booking.outbox import registered_consumers, relay_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver outbox events to each consumer in batches from its own cursor. Safe to run every minute."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--consumer", action="append", dest="consumers", help="Only relay to this consumer.")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--max-batches", type=int, default=None)
+
+    def handle(self, *args, **options):
+        unknown = set(options["consumers"] or ()) - set(registered_consumers())
+        if unknown:
+            raise CommandError(f"Unknown outbox consumers: {', '.join(sorted(unknown))}.")
+        delivered, failed = relay_outbox(
+            consumers=options["consumers"], batch_size=options["batch_size"], max_batches=options["max_batches"]
+        )
+        for name, count in sorted(delivered.items()):
+            self.stdout.write(f"{name}: {count} events")
+        if failed:
+            raise CommandError(f"Outbox consumers failed: {', '.join(failed)}. They resume on the next run.")
+        self.stdout.write(self.style.SUCCESS(f"Relayed outbox events to {len(delivered)} consumers."))
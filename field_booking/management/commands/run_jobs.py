@@ -0,0 +1,52 @@
+"""Run queued background jobs."""
+from __future__ import annotations
+
+import os
+import socket
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from field_booking.jobs import purge_finished, registered_job_types, work
+
+
+class Command(BaseCommand):
+    help = (
+        "Claim and run queued jobs by priority, retrying failures with backoff. Runs until interrupted; "
+        "start several for more throughput or pass --once to drain the queue from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--type", action="append", dest="types", help="Only run jobs of this type.")
+        parser.add_argument("--once", action="store_true", help="Exit once no job is due.")
+        parser.add_argument("--max-jobs", type=int, default=None)
+        parser.add_argument("--sleep", type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--purge-days", type=int, default=None, help="First delete jobs finished this long ago.")
+
+    def handle(self, *args, **options):
+        unknown = set(options["types"] or ()) - set(registered_job_types())
+        if unknown:
+            raise CommandError(f"Unknown job types: {', '.join(sorted(unknown))}.")
+        if options["purge_days"] is not None:
+            removed = purge_finished(timezone.now() - timedelta(days=options["purge_days"]))
+            self.stdout.write(f"Purged {removed} finished jobs.")
+
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+        remaining = options["max_jobs"]
+        succeeded = failed = 0
+        try:
+            while remaining is None or remaining > 0:
+                done, errors = work(worker, types=options["types"], max_jobs=remaining)
+                succeeded += done
+                failed += errors
+                if remaining is not None:
+                    remaining -= done + errors
+                if options["once"]:
+                    break
+                if not done + errors:
+                    time.sleep(options["sleep"])
+        except KeyboardInterrupt:
+            self.stdout.write("Interrupted; the current job was left to its lease.")
+        self.stdout.write(self.style.SUCCESS(f"Ran {succeeded} jobs; {failed} attempts failed."))
@@ -0,0 +1,39 @@
+"""Send a signed webhook from the stub payment provider to a running server."""
+from __future__ import annotations
+
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from field_booking.payment_providers import PROVIDERS, StubProvider
+
+
+class Command(BaseCommand):
+    help = "Post a signed payment event for REFERENCE_CODE, as the QRIS or GoPay provider would, for local testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("reference_code")
+        parser.add_argument("--provider", choices=PROVIDERS, default="qris")
+        parser.add_argument("--status", default="confirmed")
+        parser.add_argument("--event-id", default=None, help="Reuse an id to simulate a redelivery.")
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+
+    def handle(self, *args, **options):
+        try:
+            delivery = StubProvider(options["provider"]).delivery(
+                options["reference_code"], options["status"], event_id=options["event_id"]
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        url = options["base_url"].rstrip("/") + reverse("payment-webhook", kwargs={"provider": delivery.provider})
+        request = Request(url, data=delivery.body, headers=delivery.headers, method="POST")
+        try:
+            with urlopen(request, timeout=10) as response:
+                body = response.read().decode()
+        except HTTPError as exc:
+            raise CommandError(f"{exc.code}: {exc.read().decode()}") from exc
+        except URLError as exc:
+            raise CommandError(f"Could not reach {url}: {exc.reason}") from exc
+        self.stdout.write(self.style.SUCCESS(f"Delivered to {url}: {body}"))
@@ -0,0 +1,17 @@
+"""Delete expired idempotency keys."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from field_booking.idempotency import sweep_expired_keys
+
+
+class Command(BaseCommand):
+    help = "Remove IdempotencyKey rows past their TTL in batches. Safe to schedule hourly."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        removed = sweep_expired_keys(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} expired idempotency keys."))
@@ -0,0 +1,17 @@
+"""Delete expired checkout holds."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from field_booking.reservations import sweep_expired_holds
+
+
+class Command(BaseCommand):
+    help = "Remove SlotHold rows past their expiry in batches. Safe to schedule every few minutes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        removed = sweep_expired_holds(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} expired holds."))
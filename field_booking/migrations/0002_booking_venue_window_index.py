@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('field_booking', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['venue', 'start_datetime', 'end_datetime'], name='booking_venue_window_idx'),
+        ),
+    ]
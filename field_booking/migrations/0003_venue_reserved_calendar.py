@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:09
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+import django.db.models.deletion
+
+
+# Frozen copies of the runtime values, so later changes cannot alter this migration.
+ACTIVE_STATUSES = ('pending', 'active', 'confirmed')
+CALENDAR_BYTES = 46
+
+
+def backfill_calendars(apps, schema_editor):
+    Booking = apps.get_model('field_booking', 'Booking')
+    VenueReservedCalendar = apps.get_model('field_booking', 'VenueReservedCalendar')
+    calendars = defaultdict(lambda: bytearray(CALENDAR_BYTES))
+    windows = Booking.objects.filter(status__in=ACTIVE_STATUSES).values_list(
+        'venue_id', 'start_datetime', 'end_datetime'
+    )
+    for venue_id, start_datetime, end_datetime in windows.iterator(chunk_size=2000):
+        day = timezone.localtime(start_datetime).date()
+        last_day = timezone.localtime(end_datetime).date()
+        while day <= last_day:
+            index = day.timetuple().tm_yday - 1
+            calendars[(venue_id, day.year)][index >> 3] |= 1 << (index & 7)
+            day += timedelta(days=1)
+    VenueReservedCalendar.objects.bulk_create(
+        (
+            VenueReservedCalendar(venue_id=venue_id, year=year, days=bytes(bits))
+            for (venue_id, year), bits in calendars.items()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('field_management', '0005_venue_popularity_score'),
+        ('field_booking', '0002_booking_venue_window_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueReservedCalendar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('days', models.BinaryField(default=b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reserved_calendars', to='field_management.venue')),
+            ],
+            options={
+                'unique_together': {('venue', 'year')},
+            },
+        ),
+        migrations.RunPython(backfill_calendars, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('field_management', '0005_venue_popularity_score'),
+        ('field_booking', '0003_venue_reserved_calendar'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueBookingLock',
+            fields=[
+                ('venue', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='booking_lock', serialize=False, to='field_management.venue')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
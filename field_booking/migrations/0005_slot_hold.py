@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('field_management', '0005_venue_popularity_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('field_booking', '0004_venue_booking_lock'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotHold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_datetime', models.DateTimeField()),
+                ('end_datetime', models.DateTimeField()),
+                ('expires_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slot_holds', to=settings.AUTH_USER_MODEL)),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slot_holds', to='field_management.venue')),
+            ],
+            options={
+                'ordering': ['expires_at'],
+                'indexes': [models.Index(fields=['venue', 'start_datetime', 'end_datetime'], name='slothold_venue_window_idx'), models.Index(fields=['expires_at'], name='slothold_expires_idx')],
+            },
+        ),
+    ]
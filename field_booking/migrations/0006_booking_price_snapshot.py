@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:25
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('field_booking', '0005_slot_hold'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='addons_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0'), editable=False, max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='base_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0'), editable=False, max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='billed_hours',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='total_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0'), editable=False, max_digits=10),
+        ),
+    ]
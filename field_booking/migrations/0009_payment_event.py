@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('field_booking', '0008_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(choices=[('qris', 'QRIS'), ('gopay', 'GoPay')], max_length=20)),
+                ('event_id', models.CharField(max_length=100)),
+                ('reference_code', models.CharField(max_length=100)),
+                ('status', models.CharField(max_length=20)),
+                ('payload', models.JSONField()),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('outcome', models.CharField(blank=True, choices=[('applied', 'Applied'), ('duplicate', 'Duplicate'), ('unknown_reference', 'Unknown reference'), ('booking_closed', 'Booking not payable'), ('ignored', 'Ignored status')], max_length=20)),
+            ],
+            options={
+                'ordering': ['received_at'],
+                'indexes': [models.Index(condition=models.Q(('processed_at__isnull', True)), fields=['id'], name='paymentevent_unprocessed_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='paymentevent',
+            constraint=models.UniqueConstraint(fields=('provider', 'event_id'), name='paymentevent_provider_event_unique'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:05
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('field_management', '0005_venue_popularity_score'),
+        ('field_booking', '0012_notification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('bookings', models.PositiveIntegerField(default=0)),
+                ('booked_hours', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('addon_revenue', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('paid_revenue', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='field_management.venue')),
+            ],
+            options={
+                'ordering': ['day', 'venue'],
+                'indexes': [models.Index(fields=['day', 'venue'], name='venuerollup_day_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='venuedailyrollup',
+            constraint=models.UniqueConstraint(fields=('venue', 'day'), name='venuerollup_venue_day_unique'),
+        ),
+    ]
@@ -6,7 +6,8 @@ from datetime import date, datetime, timedelta
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
 from django.utils import timezone
 
 from field_management.models import Venue
@@ -20,6 +21,7 @@ class Booking(models.Model):
     STATUS_CONFIRMED = "confirmed"
     STATUS_COMPLETED = "completed"
     STATUS_CANCELLED = "cancelled"
+    STATUS_EXPIRED = "expired"
 
     STATUS_CHOICES = [
         (STATUS_PENDING, "Pending approval"),
@@ -27,9 +29,14 @@ class Booking(models.Model):
         (STATUS_CONFIRMED, "Confirmed"),
         (STATUS_COMPLETED, "Completed"),
         (STATUS_CANCELLED, "Cancelled"),
+        (STATUS_EXPIRED, "Expired"),
     ]
 
     ACTIVE_STATUSES = (STATUS_PENDING, STATUS_ACTIVE, STATUS_CONFIRMED)
+    APPROVED_STATUSES = (STATUS_ACTIVE, STATUS_CONFIRMED)
+    CLOSED_STATUSES = (STATUS_COMPLETED, STATUS_CANCELLED, STATUS_EXPIRED)
+    # Bookings that count as demand: everything but cancelled and expired requests.
+    COUNTED_STATUSES = (*ACTIVE_STATUSES, STATUS_COMPLETED)
 
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="bookings")
     venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name="bookings")
@@ -46,16 +53,44 @@ class Booking(models.Model):
         on_delete=models.SET_NULL,
         related_name="approved_bookings",
     )
+    # Price snapshot written by ``field_booking.pricing`` whenever the booking changes.
+    billed_hours = models.PositiveIntegerField(default=0, editable=False)
+    base_amount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0"), editable=False)
+    addons_amount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0"), editable=False)
+    total_amount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0"), editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-start_datetime"]
+        indexes = [
+            # Serves the per-venue overlap checks and the catalog availability anti-join.
+            models.Index(fields=["venue", "start_datetime", "end_datetime"], name="booking_venue_window_idx"),
+            # Serve the lifecycle sweeps that complete and expire bookings in batches.
+            models.Index(fields=["status", "end_datetime"], name="booking_status_end_idx"),
+            models.Index(fields=["status", "start_datetime"], name="booking_status_start_idx"),
+        ]
 
     def clean(self):  # pragma: no cover - requires Django validation
         if self.end_datetime <= self.start_datetime:
             raise ValidationError("End datetime must be greater than start datetime")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_reservation = instance.reservation_snapshot()
+        return instance
+
+    def reservation_snapshot(self) -> tuple[int, datetime, datetime] | None:
+        """Return ``(venue_id, start, end)`` while the booking holds its time window."""
+
+        loaded = self.__dict__
+        if any(field not in loaded for field in ("venue_id", "start_datetime", "end_datetime", "status")):
+            return None
+        if self.status not in self.ACTIVE_STATUSES or not self.venue_id:
+            return None
+        return self.venue_id, self.start_datetime, self.end_datetime
+
     @property
     def duration_hours(self) -> int:
         if self.venue_id:
@@ -70,6 +105,10 @@ class Booking(models.Model):
                 daily_delta = datetime.combine(start_local.date(), self.venue.available_end_time) - datetime.combine(
                     start_local.date(), self.venue.available_start_time
                 )
+                if daily_delta <= timedelta(0):
+                    # Overnight hours close on the following day.
+                    daily_delta += timedelta(days=1)
+                    day_span -= 1
                 return max(int(daily_delta.total_seconds() // 3600) * day_span, 0)
         delta = self.end_datetime - self.start_datetime
         return int(delta.total_seconds() // 3600)
@@ -111,43 +150,37 @@ class Booking(models.Model):
     def ensure_payment(self) -> "Payment":
         """Return a payment record for this booking, creating or updating as needed."""
 
-        from uuid import uuid4
-
-        payment, created = Payment.objects.get_or_create(
-            booking=self,
-            defaults={
-                "method": "qris",
-                "status": "waiting",
-                "total_amount": self.total_cost,
-                "deposit_amount": Decimal("10000"),
-                "reference_code": uuid4().hex[:12].upper(),
-            },
-        )
-        if not created and payment.total_amount != self.total_cost:
-            payment.total_amount = self.total_cost
-            payment.save(update_fields=["total_amount", "updated_at"])
-        return payment
-
-    def approve(self, user) -> None:
-        """Mark the booking as approved by an administrator."""
-
-        self.status = self.STATUS_ACTIVE
-        self.approved_at = timezone.now()
-        self.approved_by = user
-        self.save(update_fields=["status", "approved_at", "approved_by", "updated_at"])
-        payment = self.ensure_payment()
-        if payment.status != "waiting":
-            payment.status = "waiting"
-            payment.save(update_fields=["status", "updated_at"])
-
-    def cancel(self, save: bool = True) -> None:
-        """Cancel the booking and clear any approval metadata."""
+        from .pricing import sync_payment
+
+        return sync_payment(self)
+
+    def approve(self, user) -> list[int]:
+        """Mark the booking as approved by an administrator.
+
+        Raises ``ValidationError`` if an approved booking already holds the
+        window and returns the ids of overlapping requests cancelled as a result.
+        """
+
+        from .approvals import approve_booking
+
+        return approve_booking(self, user)
+
+    def cancel(self, save: bool = True, reason: str = "guest") -> None:
+        """Cancel the booking and clear any approval metadata.
+
+        Saving also appends a ``booking.cancelled`` outbox event recording
+        ``reason``; callers passing ``save=False`` record it with their own write.
+        """
+
+        from . import outbox
 
         self.status = self.STATUS_CANCELLED
         self.approved_at = None
         self.approved_by = None
         if save:
-            self.save(update_fields=["status", "approved_at", "approved_by", "updated_at"])
+            with transaction.atomic():
+                self.save(update_fields=["status", "approved_at", "approved_by", "updated_at"])
+                outbox.record(outbox.BOOKING_CANCELLED, self, reason=reason)
 
 
 class Payment(models.Model):
@@ -178,3 +211,276 @@ class Payment(models.Model):
 
     def __str__(self) -> str:  # pragma: no cover - trivial
         return f"Payment {self.reference_code} ({self.get_status_display()})"
+
+
+class VenueReservedCalendar(models.Model):
+    """Bitset of the local days a venue is reserved within one calendar year.
+
+    Bit ``n`` (little-endian within each byte) marks day-of-year ``n + 1``.
+    Rows are maintained incrementally by ``field_booking.reserved_calendar``.
+    """
+
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name="reserved_calendars")
+    year = models.PositiveSmallIntegerField()
+    days = models.BinaryField(default=bytes(46))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("venue", "year")
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"{self.venue} reserved days in {self.year}"
+
+
+class VenueBookingLock(models.Model):
+    """Per-venue row bumped to serialise concurrent reservations of that venue."""
+
+    venue = models.OneToOneField(Venue, on_delete=models.CASCADE, primary_key=True, related_name="booking_lock")
+    version = models.PositiveBigIntegerField(default=0)
+
+
+class SlotHold(models.Model):
+    """Short-lived lease on a venue time window while a user completes checkout."""
+
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name="slot_holds")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="slot_holds")
+    start_datetime = models.DateTimeField()
+    end_datetime = models.DateTimeField()
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["expires_at"]
+        indexes = [
+            models.Index(fields=["venue", "start_datetime", "end_datetime"], name="slothold_venue_window_idx"),
+            models.Index(fields=["expires_at"], name="slothold_expires_idx"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"Hold on {self.venue} until {self.expires_at:%H:%M}"
+
+    @property
+    def is_live(self) -> bool:
+        return self.expires_at > timezone.now()
+
+
+class IdempotencyKey(models.Model):
+    """Outcome of a POST submitted with an idempotency key, replayed to retries of the same request."""
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="idempotency_keys")
+    key = models.CharField(max_length=255)
+    scope = models.CharField(max_length=100)
+    request_fingerprint = models.CharField(max_length=64)
+    # Empty until the first request finishes; retries arriving meanwhile are told to wait.
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_location = models.CharField(max_length=2048, blank=True)
+    response_content_type = models.CharField(max_length=255, blank=True)
+    response_body = models.BinaryField(blank=True, default=b"")
+    response_messages = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # When the running request took the key; past the processing lease, a retry may run it again.
+    claimed_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["user", "key"], name="idempotency_user_key_unique")]
+        indexes = [models.Index(fields=["expires_at"], name="idempotency_expires_idx")]
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"{self.scope} {self.key}"
+
+
+class PaymentEvent(models.Model):
+    """A payment provider webhook, stored as received and applied later by the batch worker."""
+
+    OUTCOME_APPLIED = "applied"
+    OUTCOME_DUPLICATE = "duplicate"
+    OUTCOME_UNKNOWN_REFERENCE = "unknown_reference"
+    OUTCOME_BOOKING_CLOSED = "booking_closed"
+    OUTCOME_IGNORED = "ignored"
+
+    OUTCOME_CHOICES = [
+        (OUTCOME_APPLIED, "Applied"),
+        (OUTCOME_DUPLICATE, "Duplicate"),
+        (OUTCOME_UNKNOWN_REFERENCE, "Unknown reference"),
+        (OUTCOME_BOOKING_CLOSED, "Booking not payable"),
+        (OUTCOME_IGNORED, "Ignored status"),
+    ]
+
+    provider = models.CharField(max_length=20, choices=Payment.METHOD_CHOICES)
+    event_id = models.CharField(max_length=100)
+    reference_code = models.CharField(max_length=100)
+    status = models.CharField(max_length=20)
+    payload = models.JSONField()
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    outcome = models.CharField(max_length=20, choices=OUTCOME_CHOICES, blank=True)
+
+    class Meta:
+        ordering = ["received_at"]
+        constraints = [
+            # Providers redeliver webhooks; the same event is stored once.
+            models.UniqueConstraint(fields=["provider", "event_id"], name="paymentevent_provider_event_unique")
+        ]
+        indexes = [
+            models.Index(
+                fields=["id"], condition=models.Q(processed_at__isnull=True), name="paymentevent_unprocessed_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"{self.provider} {self.event_id} ({self.status})"
+
+
+class OutboxEvent(models.Model):
+    """Append-only record of a booking or payment change, written in the transaction that made it."""
+
+    # A plain reference: events outlive the bookings they describe.
+    booking = models.ForeignKey(Booking, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+")
+    topic = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"{self.topic} #{self.booking_id}"
+
+
+class OutboxCursor(models.Model):
+    """How far one outbox consumer has read."""
+
+    consumer = models.CharField(max_length=100, unique=True)
+    position = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"{self.consumer} @ {self.position}"
+
+
+class Job(models.Model):
+    """A unit of background work claimed and run by the ``run_jobs`` worker."""
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    job_type = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    # Higher runs first.
+    priority = models.SmallIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    # Queued jobs sharing a key collapse into one.
+    unique_key = models.CharField(max_length=200, null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    # Running jobs of a type with a concurrency limit each hold one numbered slot.
+    slot = models.PositiveSmallIntegerField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-priority", "run_after", "id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["unique_key"], condition=models.Q(status="queued"), name="job_queued_unique_key"
+            ),
+            models.UniqueConstraint(
+                fields=["job_type", "slot"], condition=models.Q(status="running"), name="job_running_slot_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["-priority", "run_after", "id"], condition=models.Q(status="queued"), name="job_queued_idx"
+            ),
+            models.Index(fields=["status", "locked_until"], name="job_status_lease_idx"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"{self.job_type} #{self.pk} ({self.status})"
+
+
+class Notification(models.Model):
+    """An email about a booking, rendered when its outbox event is relayed and sent by the delivery job."""
+
+    KIND_APPROVED = "booking_approved"
+    KIND_CANCELLED = "booking_cancelled"
+    KIND_PAYMENT_CONFIRMED = "payment_confirmed"
+
+    KIND_CHOICES = [
+        (KIND_APPROVED, "Booking approved"),
+        (KIND_CANCELLED, "Booking cancelled"),
+        (KIND_PAYMENT_CONFIRMED, "Payment confirmed"),
+    ]
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    # One notification per event, however often the relay delivers it.
+    source_event = models.OneToOneField(OutboxEvent, on_delete=models.CASCADE, related_name="notification")
+    booking = models.ForeignKey(Booking, on_delete=models.CASCADE, related_name="notifications")
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    send_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["send_after", "id"],
+                condition=models.Q(status="pending"),
+                name="notification_pending_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"{self.kind} to {self.recipient} ({self.status})"
+
+
+class VenueDailyRollup(models.Model):
+    """Booking totals of one venue for one local day, kept in step with the outbox."""
+
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name="daily_rollups")
+    day = models.DateField()
+    bookings = models.PositiveIntegerField(default=0)
+    booked_hours = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+    addon_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+    # The part of ``revenue`` whose payment was confirmed.
+    paid_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["day", "venue"]
+        constraints = [models.UniqueConstraint(fields=["venue", "day"], name="venuerollup_venue_day_unique")]
+        indexes = [models.Index(fields=["day", "venue"], name="venuerollup_day_idx")]
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"{self.venue_id} {self.day}"
@@ -0,0 +1,175 @@
+"""Email notifications for booking decisions and payments.
+
+The ``notifications`` outbox consumer turns approval, cancellation and
+payment confirmation events into ``Notification`` rows. The rows are rendered
+from ``templates/emails/<kind>.txt`` and ``.html`` for the booking's user, so
+the decision itself never waits on templates or SMTP. Emails describe the
+booking as the event recorded it, not as it is when the relay runs, so an
+approval relayed after a later cancellation still reads as an approval.
+
+Each relay batch then queues one coalesced ``notifications.deliver`` job.
+That job sends pending rows in batches of ``NOTIFICATION_BATCH_SIZE`` over a
+single backend connection per batch. A message the backend rejects is
+retried with backoff on its own; when no connection can be opened, the whole
+job is retried. Delivery is at least once, since a worker that dies after
+sending but before committing sends again.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from . import jobs, outbox
+from .models import Booking, Notification, OutboxEvent
+
+DELIVER_JOB = "notifications.deliver"
+MAX_ATTEMPTS = 5
+RETRY_DELAY_SECONDS = 60
+
+KIND_BY_TOPIC = {
+    outbox.BOOKING_APPROVED: Notification.KIND_APPROVED,
+    outbox.BOOKING_CANCELLED: Notification.KIND_CANCELLED,
+    outbox.PAYMENT_CONFIRMED: Notification.KIND_PAYMENT_CONFIRMED,
+}
+SUBJECTS = {
+    Notification.KIND_APPROVED: "Your booking at {venue} is approved",
+    Notification.KIND_CANCELLED: "Your booking at {venue} was cancelled",
+    Notification.KIND_PAYMENT_CONFIRMED: "Payment received for {venue}",
+}
+
+
+def _site_url(name: str, *args) -> str:
+    return settings.SITE_URL + reverse(name, args=args)
+
+
+def _booking_at_event(event: OutboxEvent, booking: Booking) -> dict[str, Any]:
+    """The window and total of ``booking`` as ``event`` recorded them."""
+
+    start = timezone.localtime(outbox.payload_datetime(event.payload["start"]))
+    end = timezone.localtime(outbox.payload_datetime(event.payload["end"]))
+    return {
+        "pk": booking.pk,
+        "status": event.payload["status"],
+        "start_datetime": start,
+        "end_datetime": end,
+        "start_date": start.date(),
+        "end_date": end.date(),
+        # Events recorded before the total was part of the payload fall back to the current one.
+        "total_amount": event.payload.get("total_amount", booking.total_amount),
+    }
+
+
+def render_notification(event: OutboxEvent, booking: Booking) -> Notification:
+    """Build the unsaved notification of ``event`` for the booking's user."""
+
+    kind = KIND_BY_TOPIC[event.topic]
+    context = {
+        "booking": _booking_at_event(event, booking),
+        "user": booking.user,
+        "venue": booking.venue,
+        "event": event.payload,
+        "booked_places_url": _site_url("booked-places"),
+        "payment_url": _site_url("payment", booking.pk),
+        "venue_url": _site_url("venue-detail", booking.venue.slug),
+    }
+    return Notification(
+        source_event=event,
+        booking=booking,
+        kind=kind,
+        recipient=booking.user.email,
+        subject=SUBJECTS[kind].format(venue=booking.venue.name),
+        body=render_to_string(f"emails/{kind}.txt", context).strip(),
+        html_body=render_to_string(f"emails/{kind}.html", context),
+    )
+
+
+@outbox.consumer("notifications")
+def queue_notifications(events: list[OutboxEvent]) -> None:
+    relevant = [event for event in events if event.topic in KIND_BY_TOPIC]
+    if not relevant:
+        return
+    bookings = Booking.objects.select_related("user", "venue").in_bulk({event.booking_id for event in relevant})
+    notifications = [
+        render_notification(event, bookings[event.booking_id])
+        for event in relevant
+        if event.booking_id in bookings and bookings[event.booking_id].user.email
+    ]
+    # A redelivered event already has its notification.
+    Notification.objects.bulk_create(notifications, ignore_conflicts=True)
+    if notifications:
+        jobs.enqueue(DELIVER_JOB, unique_key=DELIVER_JOB)
+
+
+def _message(notification: Notification, connection) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(
+        notification.subject, notification.body, to=[notification.recipient], connection=connection
+    )
+    if notification.html_body:
+        message.attach_alternative(notification.html_body, "text/html")
+    return message
+
+
+def _send_batch(batch: list[Notification], now: datetime) -> int:
+    sent = 0
+    # Opening the connection up front fails the whole batch, and the job retries it.
+    with get_connection(fail_silently=False) as connection:
+        for notification in batch:
+            notification.attempts += 1
+            try:
+                _message(notification, connection).send()
+            except Exception as exc:
+                notification.last_error = str(exc)[:1000] or type(exc).__name__
+                if notification.attempts >= MAX_ATTEMPTS:
+                    notification.status = Notification.STATUS_FAILED
+                else:
+                    delay = RETRY_DELAY_SECONDS * 2 ** (notification.attempts - 1)
+                    notification.send_after = now + timedelta(seconds=delay)
+            else:
+                notification.status = Notification.STATUS_SENT
+                notification.sent_at = now
+                notification.last_error = ""
+                sent += 1
+    Notification.objects.bulk_update(batch, ["status", "attempts", "send_after", "last_error", "sent_at"])
+    return sent
+
+
+def deliver_notifications(batch_size: Optional[int] = None, max_batches: Optional[int] = None) -> tuple[int, int]:
+    """Send due notifications in batches; return ``(sent, failed attempts)``."""
+
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    sent = attempted = batches = 0
+    while max_batches is None or batches < max_batches:
+        now = timezone.now()
+        with transaction.atomic():
+            batch = list(
+                Notification.objects.select_for_update(skip_locked=True)
+                .filter(status=Notification.STATUS_PENDING, send_after__lte=now)
+                .order_by("send_after", "id")[:batch_size]
+            )
+            if not batch:
+                break
+            sent += _send_batch(batch, now)
+        attempted += len(batch)
+        batches += 1
+    return sent, attempted - sent
+
+
+@jobs.job(DELIVER_JOB, concurrency=1, retry_delay=RETRY_DELAY_SECONDS, atomic=False)
+def deliver_notifications_job() -> None:
+    deliver_notifications()
+    retry_at = (
+        Notification.objects.filter(status=Notification.STATUS_PENDING)
+        .order_by("send_after")
+        .values_list("send_after", flat=True)
+        .first()
+    )
+    if retry_at is not None:
+        # Messages waiting out their backoff get a delivery run of their own.
+        jobs.enqueue(DELIVER_JOB, run_after=retry_at, unique_key=DELIVER_JOB)
@@ -0,0 +1,139 @@
+"""Transactional outbox for booking and payment changes.
+
+Every status change appends an ``OutboxEvent`` inside the transaction that
+makes the change, so an event exists exactly when the change was committed.
+``relay_outbox`` later hands new events, in id order and in batches, to each
+registered consumer. Every consumer keeps its own ``OutboxCursor`` and only
+advances it once a batch was handled, so a failing consumer is retried on the
+next run without holding back the others. Delivery is at least once: handlers
+must tolerate seeing an event again.
+
+Consumers register with ``@consumer("name")`` from their app's ``ready()``.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Booking, OutboxCursor, OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+BOOKING_REQUESTED = "booking.requested"
+BOOKING_APPROVED = "booking.approved"
+BOOKING_CANCELLED = "booking.cancelled"
+BOOKING_COMPLETED = "booking.completed"
+BOOKING_EXPIRED = "booking.expired"
+PAYMENT_SUBMITTED = "payment.submitted"
+PAYMENT_CONFIRMED = "payment.confirmed"
+
+Handler = Callable[[list[OutboxEvent]], None]
+
+_consumers: dict[str, Handler] = {}
+
+
+def consumer(name: str) -> Callable[[Handler], Handler]:
+    """Register ``handler`` to receive every outbox event in batches under ``name``."""
+
+    def register(handler: Handler) -> Handler:
+        _consumers[name] = handler
+        return handler
+
+    return register
+
+
+def registered_consumers() -> dict[str, Handler]:
+    return dict(_consumers)
+
+
+def booking_payload(booking: Booking, **extra: Any) -> dict[str, Any]:
+    return {
+        "status": booking.status,
+        "venue_id": booking.venue_id,
+        "user_id": booking.user_id,
+        "start": booking.start_datetime,
+        "end": booking.end_datetime,
+        "total_amount": booking.total_amount,
+        **extra,
+    }
+
+
+def payload_datetime(value: Any) -> datetime:
+    """A payload timestamp as an aware datetime; stored payloads hold ISO strings."""
+
+    return parse_datetime(value) if isinstance(value, str) else value
+
+
+def event(topic: str, booking: Booking, **extra: Any) -> OutboxEvent:
+    """Build an unsaved event describing ``booking`` as it is now."""
+
+    return OutboxEvent(booking_id=booking.pk, topic=topic, payload=booking_payload(booking, **extra))
+
+
+def record(topic: str, booking: Booking, **extra: Any) -> OutboxEvent:
+    """Append one event; call it inside the transaction that changed ``booking``."""
+
+    outbox_event = event(topic, booking, **extra)
+    outbox_event.save()
+    return outbox_event
+
+
+def record_many(events: Iterable[OutboxEvent]) -> None:
+    """Append events built with ``event()`` in a single insert."""
+
+    OutboxEvent.objects.bulk_create(list(events))
+
+
+def _relay_to(name: str, handler: Handler, settled: datetime, batch_size: int, max_batches: Optional[int]) -> int:
+    OutboxCursor.objects.get_or_create(consumer=name)
+    delivered = batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            # The row lock keeps two relays from handing the same batch to one consumer.
+            cursor = OutboxCursor.objects.select_for_update().get(consumer=name)
+            events = list(
+                OutboxEvent.objects.filter(pk__gt=cursor.position, created_at__lte=settled).order_by("pk")[:batch_size]
+            )
+            if not events:
+                break
+            handler(events)
+            cursor.position = events[-1].pk
+            cursor.save(update_fields=["position", "updated_at"])
+        delivered += len(events)
+        batches += 1
+    return delivered
+
+
+def relay_outbox(
+    *,
+    consumers: Optional[Iterable[str]] = None,
+    batch_size: int = 500,
+    max_batches: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> tuple[dict[str, int], list[str]]:
+    """Deliver new events to each consumer; return events delivered per consumer and the consumers that failed.
+
+    Events younger than ``OUTBOX_RELAY_DELAY_SECONDS`` wait for the next run:
+    ids are assigned before commit, so a slow transaction can still commit an
+    id below one that was already relayed.
+    """
+
+    handlers = registered_consumers()
+    if consumers is not None:
+        handlers = {name: handlers[name] for name in consumers}
+    settled = (now or timezone.now()) - timedelta(seconds=settings.OUTBOX_RELAY_DELAY_SECONDS)
+    delivered: dict[str, int] = {}
+    failed: list[str] = []
+    for name, handler in handlers.items():
+        try:
+            delivered[name] = _relay_to(name, handler, settled, batch_size, max_batches)
+        except Exception:
+            logger.exception("Outbox consumer %s failed; it resumes from its last cursor on the next run.", name)
+            failed.append(name)
+    return delivered, failed
@@ -0,0 +1,149 @@
+"""Durable ingestion of payment provider webhooks and the worker that applies them.
+
+The webhook view only verifies the signature and inserts a ``PaymentEvent``.
+``process_payment_events`` later takes unprocessed events in batches. Within a
+batch, events for the same ``reference_code`` collapse into the furthest
+payment status. That status is applied with one ``bulk_update`` of payments,
+one ``UPDATE`` of bookings and one insert of ``payment.confirmed`` outbox
+events. Payment statuses only ever move forward, so redelivered or reordered
+events are recorded as duplicates instead of being applied twice. Storing an
+event queues a ``payments.apply_events`` job, so a running ``run_jobs`` worker
+settles payments moments after the webhook.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Optional
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from . import jobs, outbox
+from .models import Booking, Payment, PaymentEvent
+
+APPLY_EVENTS_JOB = "payments.apply_events"
+PAYMENT_STATUS_RANK = {"waiting": 0, "confirmed": 1, "completed": 2}
+# Provider statuses that settle a payment; anything else is stored but ignored.
+SETTLING_STATUSES = ("confirmed", "completed")
+
+
+class InvalidEvent(ValueError):
+    """The webhook body is not a payment event this project understands."""
+
+
+def parse_event(body: bytes) -> dict[str, Any]:
+    try:
+        payload = json.loads(body)
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise InvalidEvent("Body is not valid JSON.") from exc
+    if not isinstance(payload, dict):
+        raise InvalidEvent("Body must be a JSON object.")
+    for field in ("event_id", "reference_code", "status"):
+        if not isinstance(payload.get(field), str) or not payload[field]:
+            raise InvalidEvent(f"Missing {field}.")
+    return payload
+
+
+def record_event(provider: str, payload: dict[str, Any]) -> bool:
+    """Store a verified event, queue the worker and return whether it was new rather than a redelivery."""
+
+    try:
+        with transaction.atomic():
+            PaymentEvent.objects.create(
+                provider=provider,
+                event_id=payload["event_id"][:100],
+                reference_code=payload["reference_code"][:100],
+                status=payload["status"][:20],
+                payload=payload,
+            )
+            # Events arriving while one run is queued share it.
+            jobs.enqueue(APPLY_EVENTS_JOB, unique_key=APPLY_EVENTS_JOB)
+    except IntegrityError:
+        return False
+    return True
+
+
+def _process_batch(events: list[PaymentEvent]) -> int:
+    now = timezone.now()
+    latest: dict[str, PaymentEvent] = {}
+    for event in events:
+        event.processed_at = now
+        if event.status not in SETTLING_STATUSES:
+            event.outcome = PaymentEvent.OUTCOME_IGNORED
+            continue
+        current = latest.get(event.reference_code)
+        if current is None or PAYMENT_STATUS_RANK[event.status] > PAYMENT_STATUS_RANK[current.status]:
+            if current is not None:
+                current.outcome = PaymentEvent.OUTCOME_DUPLICATE
+            latest[event.reference_code] = event
+        else:
+            event.outcome = PaymentEvent.OUTCOME_DUPLICATE
+
+    payments = {
+        payment.reference_code: payment
+        for payment in Payment.objects.select_for_update()
+        .select_related("booking")
+        .filter(reference_code__in=list(latest))
+    }
+    changed: list[Payment] = []
+    confirm_bookings: list[int] = []
+    for reference_code, event in latest.items():
+        payment = payments.get(reference_code)
+        if payment is None:
+            event.outcome = PaymentEvent.OUTCOME_UNKNOWN_REFERENCE
+        elif payment.booking.status not in Booking.APPROVED_STATUSES:
+            event.outcome = PaymentEvent.OUTCOME_BOOKING_CLOSED
+        elif PAYMENT_STATUS_RANK[event.status] <= PAYMENT_STATUS_RANK.get(payment.status, 0):
+            event.outcome = PaymentEvent.OUTCOME_DUPLICATE
+        else:
+            event.outcome = PaymentEvent.OUTCOME_APPLIED
+            payment.status = event.status
+            payment.method = event.provider
+            payment.updated_at = now
+            changed.append(payment)
+            confirm_bookings.append(payment.booking_id)
+
+    Payment.objects.bulk_update(changed, ["status", "method", "updated_at"])
+    # Active to confirmed keeps the booking reserved, so skipping the save signals is safe.
+    Booking.objects.filter(pk__in=confirm_bookings, status=Booking.STATUS_ACTIVE).update(
+        status=Booking.STATUS_CONFIRMED, updated_at=now
+    )
+    for payment in changed:
+        payment.booking.status = Booking.STATUS_CONFIRMED
+    outbox.record_many(
+        outbox.event(
+            outbox.PAYMENT_CONFIRMED,
+            payment.booking,
+            method=payment.method,
+            payment_status=payment.status,
+            reference_code=payment.reference_code,
+        )
+        for payment in changed
+    )
+    PaymentEvent.objects.bulk_update(events, ["processed_at", "outcome"])
+    return len(changed)
+
+
+def process_payment_events(batch_size: int = 500, max_batches: Optional[int] = None) -> tuple[int, int]:
+    """Apply unprocessed events in batches; return ``(events processed, payments updated)``."""
+
+    processed = updated = batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            events = list(
+                PaymentEvent.objects.select_for_update(skip_locked=True)
+                .filter(processed_at__isnull=True)
+                .order_by("id")[:batch_size]
+            )
+            if not events:
+                break
+            updated += _process_batch(events)
+        processed += len(events)
+        batches += 1
+    return processed, updated
+
+
+# Each batch commits on its own, releasing its payment locks, so one bad event never undoes the batches before it.
+@jobs.job(APPLY_EVENTS_JOB, concurrency=1, retry_delay=10, priority=jobs.PRIORITY_HIGH, atomic=False)
+def apply_events_job() -> None:
+    process_payment_events()
@@ -0,0 +1,94 @@
+"""Webhook signing for the QRIS and GoPay payment providers, plus an offline stub.
+
+Providers sign ``"{timestamp}.{body}"`` with HMAC-SHA256 using the shared
+secret from ``PAYMENT_WEBHOOK_SECRETS`` and send the hex digest in the
+``X-Webhook-Signature`` header and the Unix timestamp in
+``X-Webhook-Timestamp``. Deliveries older than
+``PAYMENT_WEBHOOK_TOLERANCE_SECONDS`` are rejected so captured requests cannot
+be replayed later.
+
+``StubProvider`` produces correctly signed deliveries so the whole flow can be
+exercised locally and in tests without a provider account.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+from uuid import uuid4
+
+from django.conf import settings
+
+from .models import Payment
+
+SIGNATURE_HEADER = "X-Webhook-Signature"
+TIMESTAMP_HEADER = "X-Webhook-Timestamp"
+PROVIDERS = tuple(code for code, _ in Payment.METHOD_CHOICES)
+
+
+def provider_secret(provider: str) -> Optional[str]:
+    return settings.PAYMENT_WEBHOOK_SECRETS.get(provider) or None
+
+
+def sign(provider: str, body: bytes, timestamp: int) -> str:
+    secret = provider_secret(provider)
+    if secret is None:
+        raise ValueError(f"No webhook secret configured for {provider!r}")
+    message = str(timestamp).encode() + b"." + body
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def verify(provider: str, body: bytes, signature: str, timestamp: str, *, now: Optional[float] = None) -> bool:
+    """Whether ``signature`` is valid for ``body`` and ``timestamp`` is recent."""
+
+    if provider not in PROVIDERS or provider_secret(provider) is None:
+        return False
+    if not timestamp or not timestamp.isascii() or not timestamp.isdigit():
+        return False
+    sent_at = int(timestamp)
+    if abs((now or time.time()) - sent_at) > settings.PAYMENT_WEBHOOK_TOLERANCE_SECONDS:
+        return False
+    # Compare bytes: ``compare_digest`` refuses str arguments holding non-ASCII characters.
+    return hmac.compare_digest(sign(provider, body, sent_at).encode(), (signature or "").encode())
+
+
+@dataclass(frozen=True)
+class Delivery:
+    """A signed webhook request ready to be posted to the provider's endpoint."""
+
+    provider: str
+    body: bytes
+    headers: dict[str, str]
+
+
+class StubProvider:
+    """Build signed webhook deliveries the way the real provider would."""
+
+    def __init__(self, provider: str = "qris") -> None:
+        if provider not in PROVIDERS:
+            raise ValueError(f"Unknown payment provider {provider!r}")
+        self.provider = provider
+
+    def delivery(
+        self, reference_code: str, status: str = "confirmed", *, event_id: Optional[str] = None, **extra: Any
+    ) -> Delivery:
+        payload = {
+            "event_id": event_id or uuid4().hex,
+            "reference_code": reference_code,
+            "status": status,
+            **extra,
+        }
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        timestamp = int(time.time())
+        return Delivery(
+            provider=self.provider,
+            body=body,
+            headers={
+                SIGNATURE_HEADER: sign(self.provider, body, timestamp),
+                TIMESTAMP_HEADER: str(timestamp),
+                "Content-Type": "application/json",
+            },
+        )
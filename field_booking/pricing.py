@@ -0,0 +1,205 @@
+"""Booking pricing and payment synchronisation.
+
+``sync_payment`` computes a booking's price once, stores it in the booking's
+snapshot columns (``billed_hours``, ``base_amount``, ``addons_amount`` and
+``total_amount``) and writes its ``Payment`` at most once. The model signals
+call it as a safety net for ad-hoc writes; multi-step writes such as
+``reserve_booking`` wrap themselves in ``deferred_pricing()`` so the signals
+stand down and price the booking a single time after the add-ons are attached.
+"""
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Iterable, Iterator, Optional
+from uuid import uuid4
+
+from django.db.models import DecimalField, OuterRef, QuerySet, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from addons.models import AddOn
+
+from .models import Booking, Payment
+
+DEFAULT_DEPOSIT = Decimal("10000")
+DEFAULT_METHOD = "qris"
+
+_state = threading.local()
+
+
+@dataclass(frozen=True)
+class BookingQuote:
+    """Price breakdown of a booking."""
+
+    hours: int
+    base: Decimal
+    addons: Decimal
+
+    @property
+    def total(self) -> Decimal:
+        return self.base + self.addons
+
+
+def quote_booking(booking: Booking, addons: Optional[Iterable] = None) -> BookingQuote:
+    """Price ``booking``; pass ``addons`` when they are already in memory."""
+
+    if addons is None:
+        addons = booking.addons.all()
+    hours = booking.duration_hours
+    return BookingQuote(
+        hours=hours,
+        base=booking.venue.hourly_total(hours),
+        addons=sum((addon.price for addon in addons), Decimal("0")),
+    )
+
+
+# (opening, closing, price_per_hour, start_datetime, end_datetime, add-ons total)
+QuoteRow = tuple[time, time, Decimal, datetime, datetime, Decimal]
+
+
+def _daily_hours(opening: time, closing: time) -> tuple[int, bool]:
+    """Whole hours of one opening day and whether it closes after midnight."""
+
+    anchor = date.min
+    delta = datetime.combine(anchor, closing) - datetime.combine(anchor, opening)
+    overnight = delta <= timedelta(0)
+    if overnight:
+        delta += timedelta(days=1)
+    return int(delta.total_seconds() // 3600), overnight
+
+
+def quote_rows(rows: Iterable[QuoteRow]) -> list[BookingQuote]:
+    """Price many bookings in one pass; each result equals ``Booking.total_cost``.
+
+    Mirrors ``Booking.duration_hours`` with the per-venue day length memoised,
+    one timezone conversion per datetime and integer arithmetic in place of
+    ``datetime.combine``.
+    """
+
+    tz = timezone.get_current_timezone()
+    day_lengths: dict[tuple[time, time], tuple[int, bool]] = {}
+    quotes: list[BookingQuote] = []
+    for opening, closing, price, start, end, addons in rows:
+        start_local = start.astimezone(tz)
+        end_local = end.astimezone(tz)
+        start_day = start_local.toordinal()
+        end_day = end_local.toordinal()
+        if start_local.time() == opening and end_local.time() == closing and end_day >= start_day:
+            key = (opening, closing)
+            if key not in day_lengths:
+                day_lengths[key] = _daily_hours(opening, closing)
+            daily, overnight = day_lengths[key]
+            hours = max(daily * (end_day - start_day + (0 if overnight else 1)), 0)
+        else:
+            hours = int((end - start).total_seconds() // 3600)
+        quotes.append(BookingQuote(hours=hours, base=price * Decimal(hours), addons=addons))
+    return quotes
+
+
+def quote_queryset(bookings: QuerySet) -> dict[int, BookingQuote]:
+    """Quote every booking of ``bookings`` from a single query, keyed by pk."""
+
+    addons_total = (
+        AddOn.objects.filter(bookings=OuterRef("pk"))
+        .order_by()
+        .values("bookings")
+        .annotate(total=Sum("price"))
+        .values("total")
+    )
+    rows = bookings.order_by().annotate(
+        quote_addons=Coalesce(
+            Subquery(addons_total), Value(Decimal("0")), output_field=DecimalField(max_digits=10, decimal_places=2)
+        )
+    ).values_list(
+        "pk",
+        "venue__available_start_time",
+        "venue__available_end_time",
+        "venue__price_per_hour",
+        "start_datetime",
+        "end_datetime",
+        "quote_addons",
+    )
+    pks: list[int] = []
+    inputs: list[QuoteRow] = []
+    for pk, *row in rows.iterator(chunk_size=2000):
+        pks.append(pk)
+        inputs.append(tuple(row))
+    return dict(zip(pks, quote_rows(inputs)))
+
+
+SNAPSHOT_FIELDS = ("billed_hours", "base_amount", "addons_amount", "total_amount")
+
+
+def apply_quote(booking: Booking, quote: BookingQuote) -> bool:
+    """Copy ``quote`` onto the snapshot columns and report whether they changed."""
+
+    values = (quote.hours, quote.base, quote.addons, quote.total)
+    if tuple(getattr(booking, name) for name in SNAPSHOT_FIELDS) == values:
+        return False
+    for name, value in zip(SNAPSHOT_FIELDS, values):
+        setattr(booking, name, value)
+    return True
+
+
+def new_reference_code() -> str:
+    return uuid4().hex[:12].upper()
+
+
+def _current_payment(booking: Booking) -> Optional[Payment]:
+    if Booking.payment.is_cached(booking):
+        return booking.payment
+    return Payment.objects.filter(booking=booking).first()
+
+
+def sync_payment(
+    booking: Booking,
+    addons: Optional[Iterable] = None,
+    *,
+    created: bool = False,
+    quote: Optional[BookingQuote] = None,
+) -> Payment:
+    """Refresh the price snapshot and payment with at most one write each.
+
+    ``created`` skips the payment lookup for bookings inserted in this
+    transaction; ``quote`` reuses a price computed before the insert.
+    """
+
+    quote = quote or quote_booking(booking, addons)
+    if apply_quote(booking, quote):
+        Booking.objects.filter(pk=booking.pk).update(
+            **{name: getattr(booking, name) for name in SNAPSHOT_FIELDS}
+        )
+    payment = None if created else _current_payment(booking)
+    if payment is None:
+        payment = Payment.objects.create(
+            booking=booking,
+            method=DEFAULT_METHOD,
+            status="waiting",
+            total_amount=quote.total,
+            deposit_amount=DEFAULT_DEPOSIT,
+            reference_code=new_reference_code(),
+        )
+    elif payment.total_amount != quote.total:
+        payment.total_amount = quote.total
+        payment.save(update_fields=["total_amount", "updated_at"])
+    Booking.payment.related.set_cached_value(booking, payment)
+    return payment
+
+
+def pricing_deferred() -> bool:
+    return getattr(_state, "depth", 0) > 0
+
+
+@contextmanager
+def deferred_pricing() -> Iterator[None]:
+    """Silence the pricing signals; the caller must call ``sync_payment`` itself."""
+
+    _state.depth = getattr(_state, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _state.depth -= 1
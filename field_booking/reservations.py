@@ -0,0 +1,168 @@
+"""Transactional reservation path for bookings and checkout holds.
+
+Every reservation first bumps the venue's ``VenueBookingLock`` row. That
+``UPDATE`` takes a row lock on PostgreSQL and MySQL and the database write
+lock on SQLite, so concurrent submissions for the same venue run one after
+the other and the single overlap check that follows is authoritative.
+
+A ``SlotHold`` leases a window to one user for ``SLOT_HOLD_MINUTES`` while
+they complete the booking form; other users cannot hold or book it until the
+hold expires or is consumed by the holder's booking. A hold spans at most
+``SLOT_HOLD_MAX_HOURS``, and a user keeps at most ``SLOT_HOLD_MAX_PER_USER``
+live holds, so one account cannot fence off a venue's calendar.
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Optional
+
+from django import forms
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+from .forms import ensure_no_overlap
+from . import outbox
+from .models import Booking, SlotHold, VenueBookingLock
+from .pricing import apply_quote, deferred_pricing, quote_booking, sync_payment
+
+# SQLite reports a contended write lock as an error instead of queueing.
+LOCK_ATTEMPTS = 10
+LOCK_BACKOFF_SECONDS = 0.05
+
+
+def lock_venue(venue_id: int) -> None:
+    """Hold the venue's reservation lock until the surrounding transaction ends."""
+
+    locks = VenueBookingLock.objects.filter(venue_id=venue_id)
+    if not locks.update(version=F("version") + 1):
+        VenueBookingLock.objects.bulk_create([VenueBookingLock(venue_id=venue_id)], ignore_conflicts=True)
+        locks.update(version=F("version") + 1)
+
+
+def live_holds(venue_id: int, start: datetime, end: datetime) -> QuerySet:
+    """Unexpired holds on ``venue_id`` intersecting ``[start, end)``."""
+
+    return SlotHold.objects.filter(
+        venue_id=venue_id,
+        start_datetime__lt=end,
+        end_datetime__gt=start,
+        expires_at__gt=timezone.now(),
+    )
+
+
+def ensure_not_held(venue_id: int, start: datetime, end: datetime, user_id: Optional[int]) -> None:
+    if live_holds(venue_id, start, end).exclude(user_id=user_id).exists():
+        raise forms.ValidationError(
+            "Another guest is checking out these hours. Please try again in a few minutes."
+        )
+
+
+def ensure_hold_allowed(venue_id: int, user_id: int, start: datetime, end: datetime) -> None:
+    if end - start > timedelta(hours=settings.SLOT_HOLD_MAX_HOURS):
+        raise forms.ValidationError(
+            f"A hold can cover at most {settings.SLOT_HOLD_MAX_HOURS} hours.", code="hold_too_long"
+        )
+    # The user's hold on this venue is about to be replaced, so it does not count.
+    others = SlotHold.objects.filter(user_id=user_id, expires_at__gt=timezone.now()).exclude(venue_id=venue_id)
+    if others.count() >= settings.SLOT_HOLD_MAX_PER_USER:
+        raise forms.ValidationError(
+            "You are already holding hours at too many venues. Finish or wait out one of those bookings first.",
+            code="too_many_holds",
+        )
+
+
+def _run_locked(venue_id: int, work: Callable[[], object], *, on_retry: Optional[Callable[[], None]] = None):
+    attempts = 1 if connection.in_atomic_block else LOCK_ATTEMPTS
+    for attempt in range(attempts):
+        try:
+            with transaction.atomic():
+                lock_venue(venue_id)
+                return work()
+        except OperationalError:
+            if on_retry is not None:
+                on_retry()
+            if attempt == attempts - 1:
+                raise
+            time.sleep(LOCK_BACKOFF_SECONDS * (attempt + 1))
+
+
+def place_hold(venue_id: int, user_id: int, start: datetime, end: datetime) -> SlotHold:
+    """Lease ``[start, end)`` to a user, replacing their previous hold on the venue.
+
+    Raises ``forms.ValidationError`` when the window is booked or held by someone
+    else, longer than a hold may be, or when the user already holds too many windows.
+    """
+
+    def work() -> SlotHold:
+        ensure_hold_allowed(venue_id, user_id, start, end)
+        ensure_no_overlap(venue_id, start, end)
+        ensure_not_held(venue_id, start, end, user_id)
+        SlotHold.objects.filter(venue_id=venue_id, user_id=user_id).delete()
+        return SlotHold.objects.create(
+            venue_id=venue_id,
+            user_id=user_id,
+            start_datetime=start,
+            end_datetime=end,
+            expires_at=timezone.now() + timedelta(minutes=settings.SLOT_HOLD_MINUTES),
+        )
+
+    return _run_locked(venue_id, work)
+
+
+def sweep_expired_holds(batch_size: int = 1000) -> int:
+    """Delete expired holds in batches and return how many were removed."""
+
+    removed = 0
+    now = timezone.now()
+    while True:
+        batch = list(SlotHold.objects.filter(expires_at__lte=now).values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            return removed
+        removed += SlotHold.objects.filter(pk__in=batch).delete()[0]
+
+
+def reserve_booking(
+    booking: Booking,
+    *,
+    save_m2m: Optional[Callable[[], None]] = None,
+    addons: Optional[Iterable] = None,
+) -> Booking:
+    """Save ``booking`` unless an active booking or foreign hold overlaps it.
+
+    Live holds of other users count as conflicts; the booker's own hold on the
+    venue is consumed. The payment is priced once, from ``addons`` when the
+    caller already has them in memory. Raises ``forms.ValidationError`` on conflicts. Outside of
+    an existing transaction, lock contention reported by the database is
+    retried with a short backoff.
+    """
+
+    adding = booking._state.adding
+
+    def work() -> Booking:
+        ensure_no_overlap(booking.venue_id, booking.start_datetime, booking.end_datetime, booking.pk)
+        ensure_not_held(booking.venue_id, booking.start_datetime, booking.end_datetime, booking.user_id)
+        quote = None
+        if addons is not None:
+            # Price before the insert so the snapshot columns are written with the row.
+            quote = quote_booking(booking, addons)
+            apply_quote(booking, quote)
+        with deferred_pricing():
+            booking.save()
+            if save_m2m is not None:
+                save_m2m()
+        sync_payment(booking, created=adding, quote=quote)
+        if adding:
+            outbox.record(outbox.BOOKING_REQUESTED, booking)
+        # The booking now blocks the window itself, so the user's hold is spent.
+        SlotHold.objects.filter(venue_id=booking.venue_id, user_id=booking.user_id).delete()
+        return booking
+
+    def reset() -> None:
+        if adding:
+            booking.pk = None
+            booking._state.adding = True
+
+    return _run_locked(booking.venue_id, work, on_retry=reset)
@@ -0,0 +1,159 @@
+"""Per-venue calendar of reserved days stored as one bitset per year.
+
+Each ``VenueReservedCalendar`` row holds 366 bits, one per day of the year,
+set while any active booking touches that local day. Saving or cancelling a
+booking refreshes only the days it covered, so the venue page can answer
+"which of the next N days are reserved" by reading N bits from a cached
+bitset instead of walking every booking of the venue.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .availability import date_range_bounds
+from .models import Booking, VenueReservedCalendar
+
+CALENDAR_BYTES = 46  # ceil(366 / 8)
+CALENDAR_CACHE_KEY = "field_booking:reserved_days:{venue_id}:{year}"
+
+
+def _day_index(day: date) -> int:
+    return day.timetuple().tm_yday - 1
+
+
+def _is_set(bits: bytes, day: date) -> bool:
+    index = _day_index(day)
+    return bool(bits[index >> 3] & (1 << (index & 7)))
+
+
+def _set(bits: bytearray, day: date, reserved: bool) -> None:
+    index = _day_index(day)
+    if reserved:
+        bits[index >> 3] |= 1 << (index & 7)
+    else:
+        bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+
+def _local_day(value) -> date:
+    return timezone.localtime(value).date()
+
+
+def _days(first_day: date, last_day: date) -> Iterable[date]:
+    current = first_day
+    while current <= last_day:
+        yield current
+        current += timedelta(days=1)
+
+
+def _invalidate(keys: list[str]) -> None:
+    if not keys:
+        return
+    cache.delete_many(keys)
+    # Readers may repopulate the cache from the old row before we commit.
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def refresh_reserved_days(venue_id: int, first_day: date, last_day: date) -> None:
+    """Recompute the calendar bits of ``venue_id`` between two dates (inclusive)."""
+
+    if last_day < first_day:
+        first_day, last_day = last_day, first_day
+    start, end = date_range_bounds(first_day, last_day)
+    touched: list[str] = []
+    with transaction.atomic():
+        calendars = {
+            calendar.year: calendar
+            for calendar in VenueReservedCalendar.objects.select_for_update().filter(
+                venue_id=venue_id, year__range=(first_day.year, last_day.year)
+            )
+        }
+        # ``end_datetime`` is inclusive here to match ``Booking.reserved_dates``.
+        windows = Booking.objects.filter(
+            venue_id=venue_id,
+            status__in=Booking.ACTIVE_STATUSES,
+            start_datetime__lt=end,
+            end_datetime__gte=start,
+        ).values_list("start_datetime", "end_datetime")
+        reserved: set[date] = set()
+        for start_datetime, end_datetime in windows:
+            reserved.update(
+                _days(max(_local_day(start_datetime), first_day), min(_local_day(end_datetime), last_day))
+            )
+
+        for year in range(first_day.year, last_day.year + 1):
+            calendar = calendars.get(year)
+            if calendar is None:
+                if not any(day.year == year for day in reserved):
+                    continue
+                calendar, _ = VenueReservedCalendar.objects.get_or_create(venue_id=venue_id, year=year)
+            bits = bytearray(calendar.days)
+            for day in _days(max(first_day, date(year, 1, 1)), min(last_day, date(year, 12, 31))):
+                _set(bits, day, day in reserved)
+            if bytes(bits) != bytes(calendar.days):
+                calendar.days = bytes(bits)
+                calendar.save(update_fields=["days", "updated_at"])
+            touched.append(CALENDAR_CACHE_KEY.format(venue_id=venue_id, year=year))
+        _invalidate(touched)
+
+
+def _year_bits(venue_id: int, year: int) -> bytes:
+    key = CALENDAR_CACHE_KEY.format(venue_id=venue_id, year=year)
+    bits = cache.get(key)
+    if bits is None:
+        row = VenueReservedCalendar.objects.filter(venue_id=venue_id, year=year).values_list("days", flat=True).first()
+        bits = bytes(row) if row is not None else bytes(CALENDAR_BYTES)
+        cache.set(key, bits, timeout=None)
+    return bits
+
+
+def reserved_dates_in_range(venue_id: int, first_day: date, last_day: date) -> set[date]:
+    """Return the reserved days of a venue between two dates (inclusive)."""
+
+    reserved: set[date] = set()
+    for year in range(first_day.year, last_day.year + 1):
+        bits = _year_bits(venue_id, year)
+        if not any(bits):
+            continue
+        for day in _days(max(first_day, date(year, 1, 1)), min(last_day, date(year, 12, 31))):
+            if _is_set(bits, day):
+                reserved.add(day)
+    return reserved
+
+
+def rebuild_reserved_calendars(batch_size: int = 500) -> int:
+    """Rebuild every calendar from the active bookings and return the row count.
+
+    Needed after bulk ``UPDATE`` statements that bypass the model signals.
+    """
+
+    calendars: dict[tuple[int, int], bytearray] = defaultdict(lambda: bytearray(CALENDAR_BYTES))
+    windows = Booking.objects.filter(status__in=Booking.ACTIVE_STATUSES).values_list(
+        "venue_id", "start_datetime", "end_datetime"
+    )
+    for venue_id, start_datetime, end_datetime in windows.iterator(chunk_size=2000):
+        for day in _days(_local_day(start_datetime), _local_day(end_datetime)):
+            _set(calendars[(venue_id, day.year)], day, True)
+
+    with transaction.atomic():
+        stale = list(VenueReservedCalendar.objects.values_list("venue_id", "year"))
+        VenueReservedCalendar.objects.all().delete()
+        VenueReservedCalendar.objects.bulk_create(
+            (
+                VenueReservedCalendar(venue_id=venue_id, year=year, days=bytes(bits))
+                for (venue_id, year), bits in calendars.items()
+            ),
+            batch_size=batch_size,
+        )
+        _invalidate(
+            [
+                CALENDAR_CACHE_KEY.format(venue_id=venue_id, year=year)
+                for venue_id, year in set(stale) | set(calendars)
+            ]
+        )
+    return len(calendars)
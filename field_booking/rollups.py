@@ -0,0 +1,172 @@
+"""Daily revenue and occupancy rollups per venue.
+
+``VenueDailyRollup`` holds, for each venue and local day, the bookings that
+still count (anything not cancelled or expired). It stores how many start
+that day and the billed hours, priced total, add-on part and paid part that
+fall on that day. The workspace revenue dashboard reads only this table.
+
+A booking that covers several days is split across them. Its hours and
+amounts are shared in proportion to how much of each day's opening window
+it occupies. As on the slot calendar, overnight hours belong to the day the
+venue opened. A full-day booking over three days thus puts a third of
+everything on each day.
+
+The ``revenue-rollups`` outbox consumer keeps the table current. Every
+booking or payment event marks the venue and days of its booking. Each
+marked day is recomputed from ``Booking`` through the venue window index.
+Recomputing instead of adding deltas makes redelivered events harmless.
+``rebuild_revenue_rollups`` regenerates the whole table, e.g. after bulk
+writes that recorded no events.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Iterable, Iterator
+
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from . import outbox
+from .models import Booking, OutboxEvent, VenueDailyRollup
+
+PAID_PAYMENT_STATUSES = ("confirmed", "completed")
+ROLLUP_FIELDS = ["bookings", "booked_hours", "revenue", "addon_revenue", "paid_revenue", "updated_at"]
+CENT = Decimal("0.01")
+
+Key = tuple[int, date]
+
+
+def _day_start(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _local_day(value: datetime) -> date:
+    return timezone.localtime(value).date()
+
+
+def day_shares(start: datetime, end: datetime, opening: time, closing: time) -> dict[date, float]:
+    """Return the seconds of ``[start, end)`` inside each day's opening window, keyed by opening day."""
+
+    shares: dict[date, float] = {}
+    # The window of the day before can run past midnight into the first day.
+    day = _local_day(start) - timedelta(days=1)
+    while day <= _local_day(end):
+        window_start = timezone.make_aware(datetime.combine(day, opening))
+        window_end = timezone.make_aware(datetime.combine(day, closing))
+        if window_end <= window_start:
+            window_end += timedelta(days=1)
+        overlap = (min(end, window_end) - max(start, window_start)).total_seconds()
+        if overlap > 0:
+            shares[day] = overlap
+        day += timedelta(days=1)
+    # A booking outside the opening hours still counts, on its start day.
+    return shares or {_local_day(start): 1.0}
+
+
+def _split(total, weights: list[float], quantum) -> list:
+    """Split ``total`` in proportion to ``weights`` into parts of ``quantum`` that add up to it exactly."""
+
+    parts = []
+    whole = sum(weights)
+    allotted = running = 0
+    for weight in weights:
+        running += weight
+        share = total * Decimal(running / whole) if isinstance(total, Decimal) else total * running / whole
+        upto = share.quantize(quantum) if isinstance(total, Decimal) else round(share)
+        parts.append(upto - allotted)
+        allotted = upto
+    return parts
+
+
+def _aggregate(bookings: QuerySet) -> dict[Key, VenueDailyRollup]:
+    rollups: dict[Key, VenueDailyRollup] = defaultdict(VenueDailyRollup)
+    rows = (
+        bookings.filter(status__in=Booking.COUNTED_STATUSES)
+        .annotate(paid=Q(payment__status__in=PAID_PAYMENT_STATUSES))
+        .values_list(
+            "venue_id",
+            "start_datetime",
+            "end_datetime",
+            "venue__available_start_time",
+            "venue__available_end_time",
+            "billed_hours",
+            "total_amount",
+            "addons_amount",
+            "paid",
+        )
+    )
+    for venue_id, start, end, opening, closing, hours, total, addons, paid in rows.iterator(chunk_size=2000):
+        shares = day_shares(start, end, opening, closing)
+        days = sorted(shares)
+        weights = [shares[day] for day in days]
+        for index, (day, day_hours, day_total, day_addons) in enumerate(
+            zip(days, _split(hours, weights, 1), _split(total, weights, CENT), _split(addons, weights, CENT))
+        ):
+            rollup = rollups[(venue_id, day)]
+            rollup.venue_id, rollup.day = venue_id, day
+            rollup.bookings += 1 if index == 0 else 0
+            rollup.booked_hours += day_hours
+            rollup.revenue += day_total
+            rollup.addon_revenue += day_addons
+            if paid:
+                rollup.paid_revenue += day_total
+    return rollups
+
+
+def refresh_rollups(keys: Iterable[Key]) -> int:
+    """Recompute the rollups of the given ``(venue_id, day)`` pairs; return how many rows remain."""
+
+    keys = set(keys)
+    if not keys:
+        return 0
+    spans: dict[int, tuple[date, date]] = {}
+    for venue_id, day in keys:
+        first, last = spans.get(venue_id, (day, day))
+        spans[venue_id] = (min(first, day), max(last, day))
+    windows = Q()
+    for venue_id, (first, last) in spans.items():
+        # Overnight hours of the last day run into the day after it.
+        windows |= Q(
+            venue_id=venue_id,
+            start_datetime__lt=_day_start(last + timedelta(days=2)),
+            end_datetime__gt=_day_start(first),
+        )
+    rows = [rollup for key, rollup in _aggregate(Booking.objects.filter(windows)).items() if key in keys]
+    emptied = keys - {(rollup.venue_id, rollup.day) for rollup in rows}
+    with transaction.atomic():
+        if emptied:
+            gone = Q()
+            for venue_id, day in emptied:
+                gone |= Q(venue_id=venue_id, day=day)
+            VenueDailyRollup.objects.filter(gone).delete()
+        VenueDailyRollup.objects.bulk_create(
+            rows, update_conflicts=True, unique_fields=["venue", "day"], update_fields=ROLLUP_FIELDS
+        )
+    return len(rows)
+
+
+def rebuild_rollups(batch_size: int = 500) -> int:
+    """Regenerate every rollup from the bookings table and return the row count."""
+
+    rollups = list(_aggregate(Booking.objects.all()).values())
+    with transaction.atomic():
+        VenueDailyRollup.objects.all().delete()
+        VenueDailyRollup.objects.bulk_create(rollups, batch_size=batch_size)
+    return len(rollups)
+
+
+def _event_keys(event: OutboxEvent) -> Iterator[Key]:
+    start, end = outbox.payload_datetime(event.payload["start"]), outbox.payload_datetime(event.payload["end"])
+    # Every day the booking can contribute to, including the overnight window of the day before.
+    day = _local_day(start) - timedelta(days=1)
+    while day <= _local_day(end):
+        yield event.payload["venue_id"], day
+        day += timedelta(days=1)
+
+
+@outbox.consumer("revenue-rollups")
+def refresh_rollups_for_events(events: list[OutboxEvent]) -> None:
+    refresh_rollups(key for event in events for key in _event_keys(event))
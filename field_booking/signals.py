@@ -1,28 +1,129 @@
-"""Signals ensuring booking payments stay in sync."""
+"""Signals keeping booking payments, reserved calendars and cached availability in sync."""
 from __future__ import annotations
 
-from django.db.models.signals import m2m_changed, post_save
+from datetime import datetime
+from typing import Iterable
+
+from django.db.models import Max
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
+
+from field_management.models import Venue, VenueAvailability
 
+from . import availability_cache
 from .models import Booking
+from .pricing import pricing_deferred, sync_payment
+from .reserved_calendar import refresh_reserved_days
 
 
 @receiver(post_save, sender=Booking)
-def ensure_payment_for_booking(sender, instance: Booking, created: bool, **kwargs):
-    """Ensure a payment record exists whenever a booking is created."""
+def ensure_payment_for_booking(sender, instance: Booking, created: bool, raw: bool = False, **kwargs):
+    """Keep the payment in step with bookings saved outside ``deferred_pricing()``."""
 
-    payment = instance.ensure_payment()
-    if not created and payment.total_amount != instance.total_cost:
-        payment.total_amount = instance.total_cost
-        payment.save(update_fields=["total_amount", "updated_at"])
+    if raw or pricing_deferred():
+        return
+    sync_payment(instance, created=created)
 
 
 @receiver(m2m_changed, sender=Booking.addons.through)
 def update_payment_on_addons(sender, instance: Booking, action: str, **kwargs):
     """Recalculate payment totals when add-ons are modified."""
 
-    if action in {"post_add", "post_remove", "post_clear"}:
-        payment = instance.ensure_payment()
-        if payment.total_amount != instance.total_cost:
-            payment.total_amount = instance.total_cost
-            payment.save(update_fields=["total_amount", "updated_at"])
+    if action in {"post_add", "post_remove", "post_clear"} and not pricing_deferred():
+        sync_payment(instance)
+
+
+def _refresh_reserved_window(venue_id: int, start, end) -> None:
+    refresh_reserved_days(venue_id, timezone.localtime(start).date(), timezone.localtime(end).date())
+    availability_cache.invalidate_window(venue_id, start, end)
+
+
+def refresh_reserved_windows(windows: Iterable[tuple[int, datetime, datetime]]) -> None:
+    """Do the signal work for bookings changed by bulk writes, one span per venue.
+
+    ``bulk_update`` and ``QuerySet.update`` bypass the receivers above, so
+    callers pass the ``(venue_id, start, end)`` windows whose reservation changed.
+    """
+
+    spans: dict[int, tuple[datetime, datetime]] = {}
+    for venue_id, start, end in windows:
+        first, last = spans.get(venue_id, (start, end))
+        spans[venue_id] = (min(first, start), max(last, end))
+    for venue_id, (start, end) in spans.items():
+        _refresh_reserved_window(venue_id, start, end)
+
+
+@receiver(post_save, sender=Booking)
+def refresh_calendar_on_save(sender, instance: Booking, raw: bool = False, **kwargs):
+    """Re-derive the reserved days and cached months a booking touched before and after this save."""
+
+    if raw:
+        return
+    previous = getattr(instance, "_loaded_reservation", None)
+    current = instance.reservation_snapshot()
+    if previous != current:
+        for window in {previous, current} - {None}:
+            _refresh_reserved_window(*window)
+    instance._loaded_reservation = current
+
+
+@receiver(post_delete, sender=Booking)
+def refresh_calendar_on_delete(sender, instance: Booking, **kwargs):
+    window = getattr(instance, "_loaded_reservation", None) or instance.reservation_snapshot()
+    if window is not None:
+        _refresh_reserved_window(*window)
+
+
+@receiver(pre_save, sender=VenueAvailability)
+def remember_availability_window(sender, instance: VenueAvailability, raw: bool = False, **kwargs):
+    instance._previous_window = None
+    if instance.pk and not raw:
+        instance._previous_window = (
+            VenueAvailability.objects.filter(pk=instance.pk).values_list("start_datetime", "end_datetime").first()
+        )
+
+
+@receiver(post_save, sender=VenueAvailability)
+@receiver(post_delete, sender=VenueAvailability)
+def invalidate_availability_months(sender, instance: VenueAvailability, raw: bool = False, **kwargs):
+    """Invalidate the cached months an availability block opens or closes."""
+
+    if raw:
+        return
+    windows = [(instance.start_datetime, instance.end_datetime)]
+    if getattr(instance, "_previous_window", None):
+        windows.append(instance._previous_window)
+    latest_other = (
+        VenueAvailability.objects.filter(venue_id=instance.venue_id)
+        .exclude(pk=instance.pk)
+        .aggregate(latest=Max("end_datetime"))["latest"]
+    )
+    if latest_other is None:
+        # Without other blocks the venue falls back to being open every day.
+        availability_cache.invalidate_venue(instance.venue_id)
+        return
+    latest_end = max(end for _, end in windows)
+    if latest_end > latest_other:
+        # Months between the other blocks and this one flip between open and closed.
+        windows.append((latest_other, latest_end))
+    for start, end in windows:
+        availability_cache.invalidate_window(instance.venue_id, start, end)
+
+
+@receiver(pre_save, sender=Venue)
+def remember_venue_hours(sender, instance: Venue, raw: bool = False, **kwargs):
+    instance._previous_hours = None
+    if instance.pk and not raw:
+        instance._previous_hours = (
+            Venue.objects.filter(pk=instance.pk).values_list("available_start_time", "available_end_time").first()
+        )
+
+
+@receiver(post_save, sender=Venue)
+def invalidate_months_on_hours_change(sender, instance: Venue, created: bool, raw: bool = False, **kwargs):
+    previous = getattr(instance, "_previous_hours", None)
+    if raw or created or previous is None:
+        return
+    if previous != (instance.available_start_time, instance.available_end_time):
+        availability_cache.invalidate_venue(instance.pk)
@@ -0,0 +1,217 @@
+"""Hour-slot availability for a venue.
+
+Opening hours come from ``Venue.available_start_time``/``available_end_time``,
+optionally narrowed by ``VenueAvailability`` blocks. Active bookings are
+merged into sorted busy intervals and swept against the hourly slots in a
+single pass, so the cost grows with ``slots + bookings`` rather than their
+product.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable
+
+from django.utils import timezone
+
+from field_management.models import Venue, VenueAvailability
+
+from .availability import date_range_bounds
+from .forms import normalize_booking_window
+from .models import Booking
+from .reservations import live_holds
+from .reserved_calendar import reserved_dates_in_range
+
+Interval = tuple[datetime, datetime]
+
+SLOT_LENGTH = timedelta(hours=1)
+
+
+@dataclass(frozen=True)
+class Slot:
+    """A bookable hour."""
+
+    start: datetime
+    end: datetime
+    is_free: bool
+    # Free of bookings but leased to another user's checkout for now.
+    is_held: bool = False
+
+
+@dataclass
+class DayAvailability:
+    """The slots a venue offers on one local day."""
+
+    date: date
+    slots: list[Slot] = field(default_factory=list)
+
+    @property
+    def free_slots(self) -> list[Slot]:
+        return [slot for slot in self.slots if slot.is_free]
+
+    @property
+    def is_reserved(self) -> bool:
+        """True once no slot of the day can be sold any more."""
+
+        return not self.free_slots
+
+    @property
+    def free_intervals(self) -> list[Interval]:
+        return merge_intervals((slot.start, slot.end) for slot in self.free_slots)
+
+    def as_dict(self) -> dict[str, Any]:
+        """JSON-ready form with datetimes rendered in the local time zone."""
+
+        def local(value: datetime) -> str:
+            return timezone.localtime(value).isoformat()
+
+        return {
+            "date": self.date.isoformat(),
+            "is_reserved": self.is_reserved,
+            "slots": [
+                {"start": local(slot.start), "end": local(slot.end), "is_free": slot.is_free, "is_held": slot.is_held}
+                for slot in self.slots
+            ],
+            "free": [[local(start), local(end)] for start, end in self.free_intervals],
+        }
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    """Sort intervals and coalesce the ones that overlap or touch."""
+
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def intersect_intervals(left: list[Interval], right: list[Interval]) -> list[Interval]:
+    """Intersection of two merged, sorted interval lists."""
+
+    result: list[Interval] = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        start = max(left[i][0], right[j][0])
+        end = min(left[i][1], right[j][1])
+        if start < end:
+            result.append((start, end))
+        if left[i][1] < right[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def opening_windows(venue: Venue, first_day: date, last_day: date) -> list[tuple[date, Interval]]:
+    """Daily opening hours between two dates, narrowed by availability blocks.
+
+    Venues without any block from ``first_day`` onwards are open every day,
+    matching the fallback the venue page has always used.
+    """
+
+    daily: list[tuple[date, Interval]] = []
+    current = first_day
+    while current <= last_day:
+        daily.append((current, normalize_booking_window(current, current, venue)))
+        current += timedelta(days=1)
+    if not daily:
+        return []
+
+    range_start, _ = date_range_bounds(first_day, first_day)
+    upcoming_blocks = VenueAvailability.objects.filter(venue=venue, end_datetime__gt=range_start)
+    blocks = merge_intervals(
+        upcoming_blocks.filter(start_datetime__lt=daily[-1][1][1]).values_list("start_datetime", "end_datetime")
+    )
+    if not blocks:
+        return daily if not upcoming_blocks.exists() else []
+
+    windows: list[tuple[date, Interval]] = []
+    for day, window in daily:
+        windows.extend((day, interval) for interval in intersect_intervals([window], blocks))
+    return windows
+
+
+def busy_intervals(venue: Venue, start: datetime, end: datetime) -> list[Interval]:
+    """Merged intervals held by active bookings between ``start`` and ``end``."""
+
+    bookings = Booking.objects.filter(
+        venue=venue,
+        status__in=Booking.ACTIVE_STATUSES,
+        start_datetime__lt=end,
+        end_datetime__gt=start,
+    ).values_list("start_datetime", "end_datetime")
+    return merge_intervals(bookings)
+
+
+def venue_day_slots(venue: Venue, first_day: date, last_day: date) -> list[DayAvailability]:
+    """Hourly slots for every open day between two dates (inclusive)."""
+
+    windows = opening_windows(venue, first_day, last_day)
+    if not windows:
+        return []
+    range_start, range_end = windows[0][1][0], windows[-1][1][1]
+    busy: list[Interval] = []
+    # The reserved-day calendar lets quiet date ranges skip the bookings query.
+    if reserved_dates_in_range(venue.pk, first_day, timezone.localtime(range_end).date()):
+        busy = busy_intervals(venue, range_start, range_end)
+
+    days: dict[date, DayAvailability] = {}
+    cursor = 0
+    for day, (window_start, window_end) in windows:
+        availability = days.setdefault(day, DayAvailability(date=day))
+        slot_start = window_start
+        while slot_start + SLOT_LENGTH <= window_end:
+            slot_end = slot_start + SLOT_LENGTH
+            while cursor < len(busy) and busy[cursor][1] <= slot_start:
+                cursor += 1
+            is_free = cursor == len(busy) or busy[cursor][0] >= slot_end
+            availability.slots.append(Slot(slot_start, slot_end, is_free))
+            slot_start = slot_end
+    return [availability for availability in days.values() if availability.slots]
+
+
+def overlay_holds(days: list[DayAvailability], holds: Iterable[Interval]) -> list[DayAvailability]:
+    """Return ``days`` with the free slots intersecting ``holds`` marked as held."""
+
+    held = merge_intervals(holds)
+    if not held:
+        return days
+    result: list[DayAvailability] = []
+    cursor = 0
+    for day in days:
+        slots: list[Slot] = []
+        for slot in day.slots:
+            while cursor < len(held) and held[cursor][1] <= slot.start:
+                cursor += 1
+            if slot.is_free and cursor < len(held) and held[cursor][0] < slot.end:
+                slot = replace(slot, is_free=False, is_held=True)
+            slots.append(slot)
+        result.append(DayAvailability(date=day.date, slots=slots))
+    return result
+
+
+def with_live_holds(venue_id: int, days: list[DayAvailability], viewer_id: int | None = None) -> list[DayAvailability]:
+    """Overlay the unexpired holds of everyone but ``viewer_id``.
+
+    Holds expire on their own, so they are applied at read time instead of
+    being baked into cached availability.
+    """
+
+    if not days:
+        return days
+    holds = live_holds(venue_id, days[0].slots[0].start, days[-1].slots[-1].end).exclude(user_id=viewer_id)
+    return overlay_holds(days, holds.values_list("start_datetime", "end_datetime"))
+
+
+def venue_free_intervals(venue: Venue, first_day: date, last_day: date) -> list[Interval]:
+    """Merged free time of a venue between two dates, in whole slots."""
+
+    return merge_intervals(
+        (slot.start, slot.end)
+        for availability in venue_day_slots(venue, first_day, last_day)
+        for slot in availability.free_slots
+    )
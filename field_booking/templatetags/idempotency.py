@@ -0,0 +1,18 @@
+"""Template helpers for idempotent form submissions."""
+from __future__ import annotations
+
+from uuid import uuid4
+
+from django import template
+from django.utils.html import format_html
+
+from field_booking.idempotency import FORM_FIELD
+
+register = template.Library()
+
+
+@register.simple_tag
+def idempotency_key_input() -> str:
+    """A hidden input with a fresh key, so resubmitting the rendered form is deduplicated."""
+
+    return format_html('<input type="hidden" name="{}" value="{}" />', FORM_FIELD, uuid4().hex)
@@ -0,0 +1,155 @@
+"""Tests for conflict-aware booking approvals."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from field_booking.approvals import APPROVE, apply_bulk_decision, group_overlapping, sweep_conflicts
+from field_booking.models import Booking
+from field_management.models import Category, Venue
+
+
+class ApprovalConflictTests(TestCase):
+    """Approving a request never double-books and settles the requests it overlaps."""
+
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.admin = user_model.objects.create_user(username="conflict-admin", password="secret123", is_staff=True)
+        self.guest = user_model.objects.create_user(username="conflict-guest", password="secret123")
+        self.venue = Venue.objects.create(
+            category=Category.objects.create(name="Conflict Arena"),
+            name="Conflict Court",
+            description="Court.",
+            location="Downtown",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+        )
+        self.day = timezone.localdate() + timedelta(days=8)
+
+    def _at(self, hour: int) -> datetime:
+        return timezone.make_aware(datetime.combine(self.day, time(hour)))
+
+    def _request(self, start_hour: int, end_hour: int) -> Booking:
+        # Pending requests are created directly, as overlapping ones slip in before approval.
+        return Booking.objects.create(
+            user=self.guest, venue=self.venue, start_datetime=self._at(start_hour), end_datetime=self._at(end_hour)
+        )
+
+    def _statuses(self, *bookings: Booking) -> list[str]:
+        return [Booking.objects.get(pk=booking.pk).status for booking in bookings]
+
+    def test_sweep_finds_candidates_overlapping_blocked_intervals(self) -> None:
+        blocked = [(self._at(9), self._at(11)), (self._at(14), self._at(15))]
+        candidates = [
+            (1, self._at(8), self._at(9)),
+            (2, self._at(10), self._at(12)),
+            (3, self._at(11), self._at(14)),
+            (4, self._at(13), self._at(16)),
+        ]
+
+        self.assertEqual(sweep_conflicts(candidates, blocked), [2, 4])
+
+    def test_overlapping_requests_are_grouped(self) -> None:
+        first = self._request(9, 11)
+        second = self._request(10, 12)
+        apart = self._request(12, 13)
+
+        groups = group_overlapping([apart, second, first])
+
+        self.assertEqual(
+            [[booking.pk for booking in group.bookings] for group in groups], [[first.pk, second.pk], [apart.pk]]
+        )
+
+    def test_approval_cancels_overlapping_requests(self) -> None:
+        winner = self._request(9, 11)
+        loser = self._request(10, 12)
+        neighbour = self._request(11, 12)
+
+        cancelled = winner.approve(self.admin)
+
+        self.assertEqual(cancelled, [loser.pk])
+        self.assertEqual(self._statuses(winner, loser, neighbour), ["active", "cancelled", "pending"])
+
+    def test_approval_is_refused_when_an_approved_booking_holds_the_window(self) -> None:
+        approved = self._request(9, 11)
+        Booking.objects.filter(pk=approved.pk).update(status=Booking.STATUS_ACTIVE)
+        late = self._request(10, 12)
+
+        with self.assertRaisesMessage(ValidationError, "bentrok"):
+            late.approve(self.admin)
+
+        self.assertEqual(self._statuses(late), ["pending"])
+
+    def test_approval_is_refused_once_another_admin_decided(self) -> None:
+        booking = self._request(9, 11)
+        Booking.objects.filter(pk=booking.pk).update(status=Booking.STATUS_CANCELLED)
+
+        with self.assertRaisesMessage(ValidationError, "sudah diproses"):
+            booking.approve(self.admin)
+
+        self.assertEqual(self._statuses(booking), ["cancelled"])
+        self.assertIsNone(Booking.objects.get(pk=booking.pk).approved_at)
+
+    def test_bulk_approval_is_first_come_first_served(self) -> None:
+        first = self._request(9, 11)
+        second = self._request(10, 12)
+        other = self._request(13, 14)
+
+        result = apply_bulk_decision([second.pk, first.pk, other.pk], APPROVE, self.admin)
+
+        self.assertEqual(result.processed, sorted([first.pk, other.pk]))
+        self.assertEqual(result.conflicted, [second.pk])
+        self.assertEqual(result.auto_cancelled, [second.pk])
+        self.assertEqual(self._statuses(first, second, other), ["active", "cancelled", "active"])
+
+    def test_bulk_approval_cancels_requests_blocked_by_earlier_approvals(self) -> None:
+        approved = self._request(9, 11)
+        Booking.objects.filter(pk=approved.pk).update(status=Booking.STATUS_ACTIVE)
+        blocked = self._request(10, 12)
+        free = self._request(13, 14)
+
+        result = apply_bulk_decision([blocked.pk, free.pk], APPROVE, self.admin)
+
+        self.assertEqual((result.processed, result.conflicted), ([free.pk], [blocked.pk]))
+        self.assertEqual(result.auto_cancelled, [blocked.pk])
+        self.assertEqual(self._statuses(blocked, free), ["cancelled", "active"])
+
+        with self.settings(BOOKING_CONFLICT_POLICY="flag"):
+            flagged = self._request(10, 11)
+            result = apply_bulk_decision([flagged.pk], APPROVE, self.admin)
+        self.assertEqual((result.conflicted, result.auto_cancelled), ([flagged.pk], []))
+        self.assertEqual(self._statuses(flagged), ["pending"])
+
+    @override_settings(BOOKING_CONFLICT_POLICY="flag")
+    def test_flag_policy_leaves_conflicts_pending_and_marks_them(self) -> None:
+        winner = self._request(9, 11)
+        loser = self._request(10, 12)
+
+        self.assertEqual(winner.approve(self.admin), [])
+
+        self.assertEqual(self._statuses(loser), ["pending"])
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("admin-bookings"))
+        flagged = [booking.pk for booking in response.context["pending_bookings"] if booking.conflicts_with_approved]
+        self.assertEqual(flagged, [loser.pk])
+        self.assertContains(response, "Overlaps an approved booking")
+
+    def test_overlap_banner_follows_the_conflict_policy(self) -> None:
+        self._request(9, 11)
+        self._request(10, 12)
+        self.client.force_login(self.admin)
+
+        response = self.client.get(reverse("admin-bookings"))
+        self.assertContains(response, "2 requests overlap at Conflict Court.")
+        self.assertContains(response, "Approving one cancels the requests that overlap it.")
+
+        with self.settings(BOOKING_CONFLICT_POLICY="flag"):
+            response = self.client.get(reverse("admin-bookings"))
+        self.assertContains(response, "Approving one flags the requests that overlap it.")
@@ -0,0 +1,119 @@
+"""Tests for the versioned monthly availability cache and its API."""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from field_booking import availability_cache
+from field_booking.models import Booking
+from field_management.models import Category, Venue, VenueAvailability
+
+
+def _at(day: date, hour: int) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time(hour, 0)))
+
+
+class AvailabilityCacheTests(TestCase):
+    """Signals invalidate only the months a change can affect."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="months", password="secret123")
+        self.venue = Venue.objects.create(
+            category=Category.objects.create(name="Month Arena"),
+            name="Month Court",
+            description="Court.",
+            location="Downtown",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+            available_start_time=time(8, 0),
+            available_end_time=time(10, 0),
+        )
+        this_month = timezone.localdate().replace(day=1)
+        self.month = (this_month + timedelta(days=40)).replace(day=1)
+        self.other_month = (self.month + timedelta(days=40)).replace(day=1)
+        self.day = self.month + timedelta(days=9)
+
+    def _payload(self, first_day: date) -> dict:
+        return availability_cache.month_availability(self.venue, first_day)
+
+    def _day(self, payload: dict, day: date) -> dict:
+        return next(entry for entry in payload["days"] if entry["date"] == day.isoformat())
+
+    def test_cached_month_is_served_without_queries(self) -> None:
+        self._payload(self.month)
+
+        # Only the live-hold overlay touches the database.
+        with self.assertNumQueries(1):
+            payload = self._payload(self.month)
+
+        self.assertEqual(payload["month"], availability_cache.month_label(self.month))
+        self.assertEqual(len(self._day(payload, self.day)["slots"]), 2)
+
+    def test_booking_invalidates_its_month_only(self) -> None:
+        self._payload(self.month)
+        self._payload(self.other_month)
+
+        Booking.objects.create(
+            user=self.user, venue=self.venue, start_datetime=_at(self.day, 8), end_datetime=_at(self.day, 9)
+        )
+
+        with self.assertNumQueries(1):
+            self._payload(self.other_month)
+        self.assertEqual(
+            [slot["is_free"] for slot in self._day(self._payload(self.month), self.day)["slots"]], [False, True]
+        )
+
+    def test_cancelling_a_booking_frees_the_cached_slots(self) -> None:
+        booking = Booking.objects.create(
+            user=self.user, venue=self.venue, start_datetime=_at(self.day, 8), end_datetime=_at(self.day, 10)
+        )
+        self.assertTrue(self._day(self._payload(self.month), self.day)["is_reserved"])
+
+        booking.cancel()
+
+        self.assertFalse(self._day(self._payload(self.month), self.day)["is_reserved"])
+
+    def test_changing_venue_hours_invalidates_every_month(self) -> None:
+        self._payload(self.month)
+        self._payload(self.other_month)
+
+        self.venue.available_end_time = time(12, 0)
+        self.venue.save()
+
+        for first_day in (self.month, self.other_month):
+            day = first_day + timedelta(days=1)
+            self.assertEqual(len(self._day(self._payload(first_day), day)["slots"]), 4)
+
+    def test_first_availability_block_closes_other_months(self) -> None:
+        self._payload(self.month)
+
+        VenueAvailability.objects.create(
+            venue=self.venue, start_datetime=_at(self.other_month, 0), end_datetime=_at(self.other_month, 23)
+        )
+
+        self.assertEqual(self._payload(self.month)["days"], [])
+        open_days = [day["date"] for day in self._payload(self.other_month)["days"]]
+        self.assertEqual(open_days, [self.other_month.isoformat()])
+
+    def test_endpoint_validates_month(self) -> None:
+        self.client.force_login(self.user)
+        url = reverse("venue-availability", kwargs={"slug": self.venue.slug})
+
+        response = self.client.get(url, {"month": availability_cache.month_label(self.month)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["venue"], self.venue.slug)
+
+        self.assertEqual(self.client.get(url, {"month": "2024-13"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"month": "May"}).status_code, 400)
+
+        far_future = self.client.get(url, {"month": "9999-12"})
+        self.assertEqual(far_future.status_code, 400)
+        self.assertIn("within", far_future.json()["error"])
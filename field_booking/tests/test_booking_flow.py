@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import warnings
 from datetime import time, timedelta
 
 from django.contrib.auth import get_user_model
@@ -8,6 +9,7 @@ from django.urls import reverse
 from django.utils import timezone
 
 from addons.models import AddOn
+from field_booking.forms import BookingForm
 from field_booking.models import Booking
 from field_management.models import Category, Venue
 
@@ -87,6 +89,14 @@ class BookingFlowTests(TestCase):
         self.client.force_login(self.user)
         start_date = timezone.localdate() + timedelta(days=2)
         end_date = start_date - timedelta(days=1)
+        form = BookingForm(
+            {"start_datetime": start_date.isoformat(), "end_datetime": end_date.isoformat()}, venue=self.venue
+        )
+        with warnings.catch_warnings():
+            # Plain dates reaching the model's datetime fields would warn about naive datetimes.
+            warnings.simplefilter("error", RuntimeWarning)
+            self.assertFalse(form.is_valid())
+        self.assertIn("End date must be on or after the start date.", form.non_field_errors())
         response = self.client.post(
             reverse("venue-detail", kwargs={"slug": self.venue.slug}),
             {
@@ -0,0 +1,135 @@
+"""Tests for idempotency keys on booking and payment submissions."""
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from field_booking.models import Booking, IdempotencyKey, Payment
+from field_management.models import Category, Venue
+
+
+class IdempotencyKeyTests(TestCase):
+    """Retries carrying the same key replay the first response instead of writing again."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        user_model = get_user_model()
+        self.user = user_model.objects.create_user(username="retrier", password="secret123")
+        self.admin = user_model.objects.create_user(username="retry-admin", password="secret123", is_staff=True)
+        self.venue = Venue.objects.create(
+            category=Category.objects.create(name="Retry Arena"),
+            name="Retry Court",
+            description="Court.",
+            location="Downtown",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+        )
+        self.day = (timezone.localdate() + timedelta(days=9)).isoformat()
+        self.client.force_login(self.user)
+
+    def _book(self, key: str, day: str | None = None):
+        return self.client.post(
+            reverse("venue-detail", kwargs={"slug": self.venue.slug}),
+            {"start_datetime": day or self.day, "end_datetime": day or self.day, "idempotency_key": key},
+            follow=True,
+        )
+
+    def test_booking_retry_replays_the_redirect_and_message(self) -> None:
+        first = self._book("booking-1")
+        retry = self._book("booking-1")
+
+        self.assertEqual(Booking.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(retry.redirect_chain, first.redirect_chain)
+        self.assertEqual(retry.redirect_chain[-1][0], reverse("booked-places"))
+        self.assertIn("awaiting admin approval", " ".join(str(message) for message in retry.context["messages"]))
+
+    def test_key_reused_for_a_different_request_is_rejected(self) -> None:
+        self._book("booking-2")
+        other_day = (timezone.localdate() + timedelta(days=10)).isoformat()
+
+        response = self._book("booking-2", day=other_day)
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Booking.objects.filter(user=self.user).count(), 1)
+
+    def test_retry_while_the_first_request_runs_is_refused(self) -> None:
+        first = self._book("booking-6")
+        self.assertIn("awaiting admin approval", " ".join(str(message) for message in first.context["messages"]))
+        # Leave the key looking as if the first request had not finished.
+        IdempotencyKey.objects.update(status_code=None)
+        venue_url = reverse("venue-detail", kwargs={"slug": self.venue.slug})
+        data = {"start_datetime": self.day, "end_datetime": self.day, "idempotency_key": "booking-6"}
+
+        response = self.client.post(venue_url, data, HTTP_REFERER=f"http://testserver{venue_url}", follow=True)
+        self.assertEqual(response.redirect_chain, [(f"http://testserver{venue_url}", 302)])
+        self.assertIn("still being processed", " ".join(str(message) for message in response.context["messages"]))
+
+        response = self.client.post(venue_url, data, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Booking.objects.filter(user=self.user).count(), 1)
+
+    def test_request_that_died_mid_flight_releases_its_key_after_the_lease(self) -> None:
+        self._book("booking-7")
+        Booking.objects.all().delete()
+        # The worker died before storing a response.
+        IdempotencyKey.objects.update(status_code=None)
+
+        self._book("booking-7")
+        self.assertFalse(Booking.objects.exists())
+
+        lease = timedelta(seconds=settings.IDEMPOTENCY_PROCESSING_LEASE_SECONDS + 1)
+        IdempotencyKey.objects.update(claimed_at=timezone.now() - lease)
+        response = self._book("booking-7")
+        self.assertEqual(response.redirect_chain[-1][0], reverse("booked-places"))
+        self.assertEqual(Booking.objects.filter(user=self.user).count(), 1)
+        self.assertIsNotNone(IdempotencyKey.objects.get(key="booking-7").status_code)
+
+    def test_payment_retry_does_not_write_again(self) -> None:
+        self._book("booking-3")
+        booking = Booking.objects.get(user=self.user)
+        booking.approve(self.admin)
+        url = reverse("payment", kwargs={"pk": booking.pk})
+
+        first = self.client.post(url, {"method": "gopay"}, HTTP_IDEMPOTENCY_KEY="payment-1")
+        Payment.objects.filter(booking=booking).update(method="qris")
+        with self.assertNumQueries(3):
+            retry = self.client.post(url, {"method": "gopay"}, HTTP_IDEMPOTENCY_KEY="payment-1")
+
+        self.assertEqual(retry["Location"], first["Location"])
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Payment.objects.get(booking=booking).method, "qris")
+
+    def test_cancel_retry_replays_the_json_response(self) -> None:
+        self._book("booking-4")
+        booking = Booking.objects.get(user=self.user)
+        url = reverse("booking-cancel", kwargs={"pk": booking.pk})
+        headers = {"HTTP_X_REQUESTED_WITH": "XMLHttpRequest", "HTTP_IDEMPOTENCY_KEY": "cancel-1"}
+
+        first = self.client.post(url, **headers)
+        retry = self.client.post(url, **headers)
+
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.json(), first.json())
+        self.assertTrue(retry.json()["success"])
+
+    def test_expired_keys_run_again_and_are_swept(self) -> None:
+        self._book("booking-5")
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        Booking.objects.all().delete()
+
+        self._book("booking-5")
+        self.assertEqual(Booking.objects.filter(user=self.user).count(), 1)
+
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        call_command("sweep_idempotency_keys", stdout=StringIO())
+        self.assertFalse(IdempotencyKey.objects.exists())
@@ -0,0 +1,188 @@
+"""Tests for the database-backed job queue."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from field_booking import jobs
+from field_booking.models import Booking, Job, PaymentEvent
+from field_booking.payment_events import APPLY_EVENTS_JOB, record_event
+from field_booking.reservations import reserve_booking
+from field_management.models import Category, Venue
+
+
+class JobQueueTests(TestCase):
+    """Jobs run by priority, retry with backoff and respect per-type concurrency."""
+
+    def setUp(self) -> None:
+        self.calls: list[tuple[str, dict]] = []
+        self.flaky_failures = 0
+        job_types = {
+            "test.record": jobs.JobType("test.record", self._record),
+            "test.flaky": jobs.JobType("test.flaky", self._flaky, max_attempts=3, retry_delay=10),
+            "test.single": jobs.JobType("test.single", self._record, concurrency=1),
+        }
+        patcher = patch.dict(jobs._job_types, job_types)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _record(self, **payload) -> None:
+        self.calls.append(("record", payload))
+
+    def _flaky(self, **payload) -> None:
+        # Database work of a failed attempt must roll back with it.
+        Category.objects.create(name=f"Flaky {self.flaky_failures}")
+        self.flaky_failures += 1
+        raise RuntimeError("provider timeout")
+
+    def test_jobs_run_by_priority_once_due(self) -> None:
+        jobs.enqueue("test.record", {"name": "low"}, priority=jobs.PRIORITY_LOW)
+        jobs.enqueue("test.record", {"name": "later"}, run_after=timezone.now() + timedelta(minutes=5))
+        jobs.enqueue("test.record", {"name": "normal"})
+        jobs.enqueue("test.record", {"name": "high"}, priority=jobs.PRIORITY_HIGH)
+
+        self.assertEqual(jobs.work("worker-1"), (3, 0))
+
+        self.assertEqual([payload["name"] for _, payload in self.calls], ["high", "normal", "low"])
+        self.assertEqual(Job.objects.filter(status=Job.STATUS_SUCCEEDED).count(), 3)
+        self.assertEqual(Job.objects.get(status=Job.STATUS_QUEUED).payload, {"name": "later"})
+
+    def test_failures_back_off_and_finally_fail(self) -> None:
+        queued = jobs.enqueue("test.flaky")
+
+        with self.assertLogs("field_booking.jobs", "ERROR"):
+            for attempt in range(1, 4):
+                claimed = jobs.claim_next("worker-1", now=timezone.now() + timedelta(hours=attempt))
+                self.assertEqual(claimed.pk, queued.pk)
+                self.assertFalse(jobs.run_job(claimed))
+                queued.refresh_from_db()
+                if attempt < 3:
+                    self.assertEqual(queued.status, Job.STATUS_QUEUED)
+                    self.assertAlmostEqual(
+                        (queued.run_after - timezone.now()).total_seconds(), 10 * 2 ** (attempt - 1), delta=5
+                    )
+
+        self.assertEqual((queued.status, queued.attempts), (Job.STATUS_FAILED, 3))
+        self.assertEqual(queued.last_error, "RuntimeError: provider timeout")
+        self.assertFalse(Category.objects.filter(name__startswith="Flaky").exists())
+
+    def test_concurrency_limit_holds_back_only_its_type(self) -> None:
+        jobs.enqueue("test.single", {"name": "first"}, priority=jobs.PRIORITY_HIGH)
+        jobs.enqueue("test.single", {"name": "second"}, priority=jobs.PRIORITY_HIGH)
+        jobs.enqueue("test.record", {"name": "other"})
+
+        running = jobs.claim_next("worker-1")
+        self.assertEqual((running.payload, running.slot), ({"name": "first"}, 0))
+        self.assertEqual(jobs.claim_next("worker-2").payload, {"name": "other"})
+        self.assertIsNone(jobs.claim_next("worker-2"))
+
+        jobs.run_job(running)
+        self.assertEqual(jobs.claim_next("worker-2").payload, {"name": "second"})
+
+    def test_unique_keys_collapse_queued_jobs_and_lost_leases_return(self) -> None:
+        keyed = jobs.enqueue("test.record", {"name": "keyed"}, priority=jobs.PRIORITY_HIGH, unique_key="refresh")
+        self.assertEqual(jobs.enqueue("test.record", unique_key="refresh").pk, keyed.pk)
+        plain = jobs.enqueue("test.record", {"name": "plain"})
+
+        lost = [jobs.claim_next("crashed-worker"), jobs.claim_next("crashed-worker")]
+        requeued_key = jobs.enqueue("test.record", unique_key="refresh")
+        self.assertNotEqual(requeued_key.pk, keyed.pk)
+
+        lease_end = timezone.now() + timedelta(seconds=settings.JOB_LEASE_SECONDS + 1)
+        self.assertEqual(jobs.requeue_expired(lease_end), 1)
+        self.assertEqual(Job.objects.get(pk=keyed.pk).status, Job.STATUS_FAILED)
+        self.assertEqual(
+            set(Job.objects.filter(status=Job.STATUS_QUEUED).values_list("pk", flat=True)), {plain.pk, requeued_key.pk}
+        )
+        # The crashed worker can no longer finish a job it lost.
+        for claimed in lost:
+            jobs.run_job(claimed)
+        self.assertEqual(Job.objects.get(pk=plain.pk).status, Job.STATUS_QUEUED)
+
+    def test_lost_jobs_sharing_a_key_are_requeued_once(self) -> None:
+        jobs.enqueue("test.record", unique_key="refresh")
+        first = jobs.claim_next("crashed-worker")
+        jobs.enqueue("test.record", unique_key="refresh")
+        second = jobs.claim_next("crashed-worker")
+
+        lease_end = timezone.now() + timedelta(seconds=settings.JOB_LEASE_SECONDS + 1)
+        self.assertEqual(jobs.requeue_expired(lease_end), 1)
+
+        statuses = dict(Job.objects.values_list("pk", "status"))
+        self.assertEqual(statuses, {first.pk: Job.STATUS_QUEUED, second.pk: Job.STATUS_FAILED})
+
+    def test_enqueue_queues_again_when_the_equal_job_is_claimed_meanwhile(self) -> None:
+        queued = jobs.enqueue("test.record", unique_key="refresh")
+        create = Job.objects.create
+        # The insert still collides with the queued job, which a worker claims before the lookup.
+        collision = [IntegrityError("job_queued_unique_key")]
+        jobs.claim_next("worker-1")
+
+        def create_after_collision(**fields):
+            if collision:
+                raise collision.pop()
+            return create(**fields)
+
+        with patch.object(Job.objects, "create", side_effect=create_after_collision):
+            requeued = jobs.enqueue("test.record", unique_key="refresh")
+
+        self.assertNotEqual(requeued.pk, queued.pk)
+        self.assertEqual(Job.objects.get(pk=queued.pk).status, Job.STATUS_RUNNING)
+        self.assertEqual(requeued.status, Job.STATUS_QUEUED)
+
+    def test_failed_retry_yields_to_an_equal_job_queued_during_the_run(self) -> None:
+        running = jobs.enqueue("test.flaky", unique_key="refresh")
+        claimed = jobs.claim_next("worker-1")
+        queued = jobs.enqueue("test.flaky", unique_key="refresh")
+
+        self.assertFalse(jobs.run_job(claimed))
+
+        running.refresh_from_db()
+        self.assertEqual(running.status, Job.STATUS_FAILED)
+        self.assertIn("Superseded by an equal queued job.", running.last_error)
+        self.assertEqual(Job.objects.get(status=Job.STATUS_QUEUED).pk, queued.pk)
+
+
+@override_settings(PAYMENT_WEBHOOK_SECRETS={"qris": "secret", "gopay": "secret"})
+class PaymentEventJobTests(TestCase):
+    """Stored webhooks queue one job that the worker command runs."""
+
+    def test_worker_settles_payments_queued_by_webhooks(self) -> None:
+        user_model = get_user_model()
+        user = user_model.objects.create_user(username="job-payer", password="secret123")
+        admin = user_model.objects.create_user(username="job-admin", password="secret123", is_staff=True)
+        venue = Venue.objects.create(
+            category=Category.objects.create(name="Job Arena"),
+            name="Job Court",
+            description="Court.",
+            location="Downtown",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+        )
+        start = timezone.make_aware(datetime.combine(timezone.localdate() + timedelta(days=3), time(9)))
+        booking = reserve_booking(
+            Booking(user=user, venue=venue, start_datetime=start, end_datetime=start + timedelta(hours=2))
+        )
+        booking.approve(admin)
+        reference_code = booking.payment.reference_code
+        for event_id in ("evt-1", "evt-2"):
+            record_event("qris", {"event_id": event_id, "reference_code": reference_code, "status": "confirmed"})
+
+        self.assertEqual(Job.objects.filter(job_type=APPLY_EVENTS_JOB).count(), 1)
+        out = StringIO()
+        call_command("run_jobs", once=True, type=[APPLY_EVENTS_JOB], stdout=out)
+
+        self.assertIn("Ran 1 jobs", out.getvalue())
+        booking.refresh_from_db()
+        self.assertEqual(booking.status, Booking.STATUS_CONFIRMED)
+        self.assertFalse(PaymentEvent.objects.filter(processed_at__isnull=True).exists())
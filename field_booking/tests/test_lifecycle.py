@@ -0,0 +1,85 @@
+"""Tests for the batch booking lifecycle transitions."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from field_booking.lifecycle import EXPIRE_PENDING, run_transition
+from field_booking.models import Booking
+from field_booking.reserved_calendar import reserved_dates_in_range
+from field_management.models import Category, Venue
+
+
+class BookingLifecycleTests(TestCase):
+    """Ended bookings complete, undecided past requests expire, in batches."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="lifecycle", password="secret123")
+        self.venue = Venue.objects.create(
+            category=Category.objects.create(name="Lifecycle Arena"),
+            name="Lifecycle Court",
+            description="Court.",
+            location="Downtown",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+        )
+
+    def _booking(self, day_offset: int, status: str) -> Booking:
+        day = timezone.localdate() + timedelta(days=day_offset)
+        start = timezone.make_aware(datetime.combine(day, time(9)))
+        return Booking.objects.create(
+            user=self.user,
+            venue=self.venue,
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=2),
+            status=status,
+        )
+
+    def _status(self, booking: Booking) -> str:
+        return Booking.objects.values_list("status", flat=True).get(pk=booking.pk)
+
+    def test_command_completes_and_expires_due_bookings_only(self) -> None:
+        ended = [self._booking(-offset, Booking.STATUS_CONFIRMED) for offset in (1, 2, 3)]
+        stale = self._booking(-1, Booking.STATUS_PENDING)
+        upcoming = self._booking(2, Booking.STATUS_ACTIVE)
+        waiting = self._booking(2, Booking.STATUS_PENDING)
+        cancelled = self._booking(-4, Booking.STATUS_CANCELLED)
+
+        out = StringIO()
+        call_command("advance_booking_lifecycle", batch_size=2, stdout=out)
+
+        self.assertEqual({self._status(booking) for booking in ended}, {Booking.STATUS_COMPLETED})
+        self.assertEqual(self._status(stale), Booking.STATUS_EXPIRED)
+        self.assertEqual(
+            [self._status(booking) for booking in (upcoming, waiting, cancelled)],
+            [Booking.STATUS_ACTIVE, Booking.STATUS_PENDING, Booking.STATUS_CANCELLED],
+        )
+        self.assertIn("completed: 2 bookings so far", out.getvalue())
+        self.assertIn("Marked 3 bookings completed.", out.getvalue())
+        self.assertIn("Marked 1 bookings expired.", out.getvalue())
+
+    def test_rerunning_is_a_no_op(self) -> None:
+        self._booking(-1, Booking.STATUS_PENDING)
+        run_transition(EXPIRE_PENDING)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(run_transition(EXPIRE_PENDING), 0)
+
+    def test_batches_refresh_the_reserved_calendar(self) -> None:
+        stale = self._booking(0, Booking.STATUS_PENDING)
+        Booking.objects.filter(pk=stale.pk).update(start_datetime=timezone.now() - timedelta(minutes=1))
+        today = timezone.localdate()
+        self.assertEqual(reserved_dates_in_range(self.venue.pk, today, today), {today})
+
+        run_transition(EXPIRE_PENDING, max_batches=1)
+
+        self.assertEqual(reserved_dates_in_range(self.venue.pk, today, today), set())
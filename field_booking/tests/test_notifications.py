@@ -0,0 +1,153 @@
+"""Tests for queued booking email notifications."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail import get_connection
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from field_booking import jobs, notifications, outbox
+from field_booking.models import Booking, Job, Notification, OutboxCursor
+from field_booking.reservations import reserve_booking
+from field_management.models import Category, Venue
+
+LOCMEM = "django.core.mail.backends.locmem.EmailBackend"
+
+
+class BouncingBackend(EmailBackend):
+    """Locmem backend that rejects mail to ``bounce@`` addresses."""
+
+    def send_messages(self, messages):
+        if any(address.startswith("bounce@") for message in messages for address in message.to):
+            raise OSError("550 mailbox unavailable")
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND=LOCMEM, OUTBOX_RELAY_DELAY_SECONDS=0, SITE_URL="https://ragaspace.test")
+class BookingNotificationTests(TestCase):
+    """Decisions queue rendered emails that the delivery job sends in batches."""
+
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.guest = user_model.objects.create_user(username="guest", email="guest@example.com", password="secret123")
+        self.silent = user_model.objects.create_user(username="no-email", password="secret123")
+        self.admin = user_model.objects.create_user(username="manager", password="secret123", is_staff=True)
+        self.venue = Venue.objects.create(
+            category=Category.objects.create(name="Mail Arena"),
+            name="Mail & Court",
+            description="Court.",
+            location="Downtown",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+        )
+
+    def _reserve(self, user, day_offset: int, hour: int = 9) -> Booking:
+        start = timezone.make_aware(datetime.combine(timezone.localdate() + timedelta(days=day_offset), time(hour)))
+        return reserve_booking(
+            Booking(user=user, venue=self.venue, start_datetime=start, end_datetime=start + timedelta(hours=2)),
+            addons=[],
+        )
+
+    def _relay_and_deliver(self) -> None:
+        outbox.relay_outbox(consumers=["notifications"])
+        jobs.work("test-worker", types=[notifications.DELIVER_JOB])
+
+    def test_approval_returns_before_any_email_is_sent(self) -> None:
+        booking = self._reserve(self.guest, 3)
+        self.client.force_login(self.admin)
+
+        self.client.post(reverse("admin-bookings"), {"booking_id": booking.pk, "decision": "approve"})
+
+        self.assertEqual(mail.outbox, [])
+        self.assertFalse(Notification.objects.exists())
+        self._relay_and_deliver()
+
+        self.assertEqual(len(mail.outbox), 1)
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ["guest@example.com"])
+        self.assertEqual(message.subject, "Your booking at Mail & Court is approved")
+        self.assertIn("a manager approved your booking request at Mail & Court", message.body)
+        self.assertIn(f"https://ragaspace.test/booking/{booking.pk}/payment/", message.body)
+        self.assertIn("Mail &amp; Court", message.alternatives[0][0])
+
+    def test_emails_describe_the_booking_as_each_event_recorded_it(self) -> None:
+        booking = self._reserve(self.guest, 3)
+        booking.approve(self.admin)
+        # Bulk writes after the approval must not leak into its email.
+        moved = timedelta(hours=3)
+        Booking.objects.filter(pk=booking.pk).update(
+            start_datetime=booking.start_datetime + moved, end_datetime=booking.end_datetime + moved
+        )
+        booking.refresh_from_db()
+        booking.cancel()
+
+        self._relay_and_deliver()
+
+        self.assertEqual(
+            [message.subject for message in mail.outbox],
+            ["Your booking at Mail & Court is approved", "Your booking at Mail & Court was cancelled"],
+        )
+        self.assertIn("a manager approved your booking request", mail.outbox[0].body)
+        self.assertIn("Time: 09:00 – 11:00", mail.outbox[0].body)
+        self.assertIn("Total: Rp 200000.00", mail.outbox[0].body)
+        self.assertIn("Time: 12:00 – 14:00", mail.outbox[1].body)
+
+    def test_batches_share_one_connection_and_skip_users_without_email(self) -> None:
+        declined = [self._reserve(self.guest, day) for day in (3, 4, 5)]
+        self._reserve(self.silent, 6).cancel(reason="admin")
+        for booking in declined:
+            booking.cancel(reason="admin")
+
+        with patch("field_booking.notifications.get_connection", wraps=get_connection) as connections:
+            outbox.relay_outbox(consumers=["notifications"])
+            self.assertEqual(notifications.deliver_notifications(batch_size=2), (3, 0))
+
+        self.assertEqual(connections.call_count, 2)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertTrue(all("A manager declined your booking request" in message.body for message in mail.outbox))
+
+        # A relay that redelivers the same events queues nothing new.
+        OutboxCursor.objects.filter(consumer="notifications").update(position=0)
+        outbox.relay_outbox(consumers=["notifications"])
+        self.assertFalse(Notification.objects.filter(status=Notification.STATUS_PENDING).exists())
+
+    @override_settings(EMAIL_BACKEND="field_booking.tests.test_notifications.BouncingBackend")
+    def test_rejected_messages_retry_with_backoff(self) -> None:
+        bouncing = get_user_model().objects.create_user(username="bouncer", email="bounce@example.com")
+        self._reserve(bouncing, 3).cancel()
+        self._reserve(self.guest, 4).cancel()
+
+        self._relay_and_deliver()
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("cancelled as you requested", mail.outbox[0].body)
+        failed = Notification.objects.get(recipient="bounce@example.com")
+        self.assertEqual((failed.status, failed.attempts), (Notification.STATUS_PENDING, 1))
+        self.assertEqual(failed.last_error, "550 mailbox unavailable")
+        self.assertGreater(failed.send_after, timezone.now())
+        retry = Job.objects.get(job_type=notifications.DELIVER_JOB, status=Job.STATUS_QUEUED)
+        self.assertEqual(retry.run_after, failed.send_after)
+
+        Notification.objects.filter(pk=failed.pk).update(recipient="fixed@example.com", send_after=timezone.now())
+        self.assertEqual(notifications.deliver_notifications(), (1, 0))
+        self.assertEqual(Notification.objects.get(pk=failed.pk).attempts, 2)
+
+    def test_payment_confirmation_is_announced(self) -> None:
+        booking = self._reserve(self.guest, 3)
+        booking.approve(self.admin)
+        self.client.force_login(self.guest)
+
+        self.client.post(reverse("payment", args=[booking.pk]), {"method": "gopay"})
+        self._relay_and_deliver()
+
+        subjects = [message.subject for message in mail.outbox]
+        self.assertEqual(subjects, ["Your booking at Mail & Court is approved", "Payment received for Mail & Court"])
+        self.assertIn("GOPAY payment (reference", mail.outbox[1].body)
@@ -0,0 +1,173 @@
+"""Tests for the booking outbox and its relay."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django import forms
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from field_booking import outbox
+from field_booking.lifecycle import COMPLETE_PAST, run_transition
+from field_booking.models import Booking, OutboxCursor, OutboxEvent
+from field_booking.reservations import reserve_booking
+from field_catalog import facets
+from field_management.models import Category, Venue
+
+
+class OutboxTests(TestCase):
+    """Status changes append outbox events in their own transaction; the relay fans them out."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        user_model = get_user_model()
+        self.user = user_model.objects.create_user(username="outbox", password="secret123")
+        self.admin = user_model.objects.create_user(username="outbox-admin", password="secret123", is_staff=True)
+        self.venue = Venue.objects.create(
+            category=Category.objects.create(name="Outbox Arena"),
+            name="Outbox Court",
+            description="Court.",
+            location="Downtown",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+        )
+
+    def _reserve(self, day_offset: int, hour: int = 9) -> Booking:
+        start = timezone.make_aware(datetime.combine(timezone.localdate() + timedelta(days=day_offset), time(hour)))
+        return reserve_booking(
+            Booking(user=self.user, venue=self.venue, start_datetime=start, end_datetime=start + timedelta(hours=2)),
+            addons=[],
+        )
+
+    def _topics(self, booking: Booking) -> list[str]:
+        return list(OutboxEvent.objects.filter(booking_id=booking.pk).values_list("topic", flat=True))
+
+    def test_booking_lifecycle_is_recorded_in_order(self) -> None:
+        booking = self._reserve(3)
+        rival = Booking.objects.create(
+            user=self.user,
+            venue=self.venue,
+            start_datetime=booking.start_datetime + timedelta(hours=1),
+            end_datetime=booking.end_datetime + timedelta(hours=1),
+        )
+        self.client.force_login(self.user)
+
+        self.assertEqual(booking.approve(self.admin), [rival.pk])
+        self.client.post(reverse("payment", args=[booking.pk]), {"method": "qris"})
+        self.client.post(reverse("booking-cancel", args=[booking.pk]))
+
+        self.assertEqual(
+            self._topics(booking),
+            [outbox.BOOKING_REQUESTED, outbox.BOOKING_APPROVED, outbox.PAYMENT_CONFIRMED, outbox.BOOKING_CANCELLED],
+        )
+        self.assertEqual(OutboxEvent.objects.get(booking_id=rival.pk).payload["reason"], "conflict")
+        confirmed = OutboxEvent.objects.get(booking_id=booking.pk, topic=outbox.PAYMENT_CONFIRMED)
+        self.assertEqual(confirmed.payload["method"], "qris")
+        self.assertEqual(confirmed.payload["venue_id"], self.venue.pk)
+        cancelled = OutboxEvent.objects.get(booking_id=booking.pk, topic=outbox.BOOKING_CANCELLED)
+        self.assertEqual(cancelled.payload["reason"], "guest")
+        self.assertEqual(cancelled.payload["status"], Booking.STATUS_CANCELLED)
+
+    def test_rejected_changes_leave_no_event(self) -> None:
+        approved = self._reserve(3)
+        approved.approve(self.admin)
+        overlapping = Booking.objects.create(
+            user=self.user,
+            venue=self.venue,
+            start_datetime=approved.start_datetime,
+            end_datetime=approved.end_datetime,
+        )
+        before = OutboxEvent.objects.count()
+
+        with self.assertRaises(forms.ValidationError):
+            overlapping.approve(self.admin)
+        with patch("field_booking.outbox.record", side_effect=RuntimeError("outbox unavailable")):
+            with self.assertRaises(RuntimeError):
+                approved.cancel()
+
+        self.assertEqual(OutboxEvent.objects.count(), before)
+        self.assertEqual(Booking.objects.get(pk=approved.pk).status, Booking.STATUS_ACTIVE)
+
+    def test_lifecycle_batches_record_one_event_per_moved_booking(self) -> None:
+        past = timezone.now() - timedelta(days=2)
+        ended = [
+            Booking.objects.create(
+                user=self.user,
+                venue=self.venue,
+                start_datetime=past + timedelta(hours=hour),
+                end_datetime=past + timedelta(hours=hour + 1),
+                status=Booking.STATUS_CONFIRMED,
+            )
+            for hour in range(3)
+        ]
+
+        self.assertEqual(run_transition(COMPLETE_PAST, batch_size=2), 3)
+
+        events = OutboxEvent.objects.filter(topic=outbox.BOOKING_COMPLETED)
+        self.assertEqual(sorted(events.values_list("booking_id", flat=True)), [booking.pk for booking in ended])
+        self.assertEqual({event.payload["status"] for event in events}, {Booking.STATUS_COMPLETED})
+
+    @override_settings(OUTBOX_RELAY_DELAY_SECONDS=0)
+    def test_relay_advances_each_consumer_independently(self) -> None:
+        received: list[int] = []
+        calls = {"broken": 0}
+
+        def collect(events: list[OutboxEvent]) -> None:
+            received.extend(event.pk for event in events)
+
+        def broken(events: list[OutboxEvent]) -> None:
+            calls["broken"] += 1
+            raise RuntimeError("consumer down")
+
+        bookings = [self._reserve(day) for day in (3, 4, 5)]
+        with patch.dict(outbox._consumers, {"collect": collect, "broken": broken}, clear=True):
+            with self.assertLogs("field_booking.outbox", "ERROR"):
+                delivered, failed = outbox.relay_outbox(batch_size=2)
+                self.assertEqual((delivered, failed), ({"collect": 3}, ["broken"]))
+                self.assertEqual(outbox.relay_outbox(), ({"collect": 0}, ["broken"]))
+
+            bookings[0].cancel()
+            outbox.relay_outbox(consumers=["collect"])
+
+        self.assertEqual(received, list(OutboxEvent.objects.values_list("pk", flat=True)))
+        self.assertEqual(OutboxCursor.objects.get(consumer="broken").position, 0)
+        self.assertEqual(calls["broken"], 2)
+
+    def test_relay_waits_for_recent_events(self) -> None:
+        self._reserve(3)
+        received: list[OutboxEvent] = []
+
+        with patch.dict(outbox._consumers, {"collect": received.extend}, clear=True):
+            self.assertEqual(outbox.relay_outbox(), ({"collect": 0}, []))
+            later = timezone.now() + timedelta(minutes=1)
+            self.assertEqual(outbox.relay_outbox(now=later), ({"collect": 1}, []))
+
+    @override_settings(OUTBOX_RELAY_DELAY_SECONDS=0)
+    def test_command_refreshes_date_filtered_facet_counts(self) -> None:
+        day = timezone.localdate() + timedelta(days=3)
+        filters = {
+            "q": "",
+            "city": "",
+            "category": "",
+            "max_price": "",
+            "available_from": day.isoformat(),
+            "available_to": day.isoformat(),
+        }
+        self.assertEqual(facets.get_facet_counts(filters)["city"], {"Jakarta": 1})
+        self._reserve(3)
+
+        out = StringIO()
+        call_command("relay_outbox", consumer=["catalog-facets"], stdout=out)
+
+        self.assertIn("catalog-facets: 1 events", out.getvalue())
+        self.assertEqual(facets.get_facet_counts(filters)["city"], {})
+        with self.assertRaises(CommandError):
+            call_command("relay_outbox", consumer=["missing"], stdout=StringIO())
@@ -0,0 +1,141 @@
+"""Tests for payment webhook ingestion and the batch event worker."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from field_booking.models import Booking, PaymentEvent
+from field_booking.payment_events import process_payment_events
+from field_booking.payment_providers import SIGNATURE_HEADER, TIMESTAMP_HEADER, StubProvider
+from field_booking.reservations import reserve_booking
+from field_management.models import Category, Venue
+
+SECRETS = {"qris": "qris-secret", "gopay": "gopay-secret"}
+
+
+@override_settings(PAYMENT_WEBHOOK_SECRETS=SECRETS)
+class PaymentWebhookTests(TestCase):
+    """Webhooks are verified and stored; the worker applies them once per reference code."""
+
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.user = user_model.objects.create_user(username="payer", password="secret123")
+        self.admin = user_model.objects.create_user(username="payer-admin", password="secret123", is_staff=True)
+        self.venue = Venue.objects.create(
+            category=Category.objects.create(name="Webhook Arena"),
+            name="Webhook Court",
+            description="Court.",
+            location="Downtown",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+        )
+
+    def _approved_booking(self, day_offset: int) -> Booking:
+        start = timezone.make_aware(datetime.combine(timezone.localdate() + timedelta(days=day_offset), time(9)))
+        booking = reserve_booking(
+            Booking(user=self.user, venue=self.venue, start_datetime=start, end_datetime=start + timedelta(hours=2))
+        )
+        booking.approve(self.admin)
+        return booking
+
+    def _deliver(self, delivery, provider: str = "qris"):
+        headers = {f"HTTP_{name.upper().replace('-', '_')}": value for name, value in delivery.headers.items()}
+        return self.client.post(
+            reverse("payment-webhook", kwargs={"provider": provider}),
+            data=delivery.body,
+            content_type="application/json",
+            **headers,
+        )
+
+    def test_signed_events_are_stored_without_touching_the_payment(self) -> None:
+        booking = self._approved_booking(3)
+        delivery = StubProvider("gopay").delivery(booking.payment.reference_code, event_id="evt-1")
+
+        first = self._deliver(delivery, provider="gopay")
+        redelivery = self._deliver(delivery, provider="gopay")
+
+        self.assertEqual(first.status_code, 202)
+        self.assertEqual(redelivery.json(), {"received": True, "duplicate": True})
+        self.assertEqual(PaymentEvent.objects.count(), 1)
+        booking.payment.refresh_from_db()
+        self.assertEqual(booking.payment.status, "waiting")
+
+    def test_bad_signatures_and_bodies_are_rejected(self) -> None:
+        delivery = StubProvider("qris").delivery("REF")
+        tampered = StubProvider("qris").delivery("REF")
+        tampered.headers[SIGNATURE_HEADER] = "0" * 64
+
+        self.assertEqual(self._deliver(tampered).status_code, 401)
+        tampered.headers[SIGNATURE_HEADER] = "é" * 64
+        self.assertEqual(self._deliver(tampered).status_code, 401)
+        tampered.headers.update({SIGNATURE_HEADER: delivery.headers[SIGNATURE_HEADER], TIMESTAMP_HEADER: "١٢٣"})
+        self.assertEqual(self._deliver(tampered).status_code, 401)
+        self.assertEqual(self._deliver(delivery, provider="gopay").status_code, 401)
+        self.assertEqual(self._deliver(delivery, provider="cash").status_code, 401)
+        with override_settings(PAYMENT_WEBHOOK_TOLERANCE_SECONDS=-1):
+            self.assertEqual(self._deliver(delivery).status_code, 401)
+        self.assertFalse(PaymentEvent.objects.exists())
+
+    def test_worker_applies_the_furthest_status_once_per_reference(self) -> None:
+        paid = self._approved_booking(3)
+        settled = self._approved_booking(4)
+        stub = StubProvider("qris")
+        for reference_code, status in [
+            (paid.payment.reference_code, "confirmed"),
+            (paid.payment.reference_code, "confirmed"),
+            (settled.payment.reference_code, "completed"),
+            (settled.payment.reference_code, "confirmed"),
+            ("UNKNOWN", "confirmed"),
+            (paid.payment.reference_code, "failed"),
+        ]:
+            self._deliver(stub.delivery(reference_code, status))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(process_payment_events(batch_size=100), (6, 2))
+
+        statements = [query["sql"] for query in queries.captured_queries if "SAVEPOINT" not in query["sql"]]
+        # Two reads and four writes for the batch, then the read that finds the queue empty.
+        self.assertEqual(len(statements), 7)
+
+        paid.refresh_from_db()
+        settled.refresh_from_db()
+        self.assertEqual((paid.status, paid.payment.status), (Booking.STATUS_CONFIRMED, "confirmed"))
+        self.assertEqual((settled.status, settled.payment.status), (Booking.STATUS_CONFIRMED, "completed"))
+        outcomes = sorted(PaymentEvent.objects.values_list("outcome", flat=True))
+        self.assertEqual(outcomes, ["applied", "applied", "duplicate", "duplicate", "ignored", "unknown_reference"])
+
+    def test_command_skips_payments_of_cancelled_bookings(self) -> None:
+        booking = self._approved_booking(5)
+        booking.cancel()
+        self._deliver(StubProvider("qris").delivery(booking.payment.reference_code))
+
+        call_command("process_payment_events", batch_size=1, stdout=StringIO())
+
+        booking.payment.refresh_from_db()
+        self.assertEqual(booking.payment.status, "waiting")
+        self.assertEqual(PaymentEvent.objects.get().outcome, PaymentEvent.OUTCOME_BOOKING_CLOSED)
+
+    @override_settings(PAYMENT_CONFIRMATION="webhook")
+    def test_webhook_mode_leaves_confirmation_to_the_provider(self) -> None:
+        booking = self._approved_booking(6)
+        self.client.force_login(self.user)
+
+        self.client.post(reverse("payment", args=[booking.pk]), {"method": "gopay"})
+        booking.refresh_from_db()
+        self.assertEqual((booking.status, booking.payment.status), (Booking.STATUS_ACTIVE, "waiting"))
+
+        self._deliver(StubProvider("gopay").delivery(booking.payment.reference_code), provider="gopay")
+        process_payment_events()
+
+        booking.refresh_from_db()
+        self.assertEqual((booking.status, booking.payment.status), (Booking.STATUS_CONFIRMED, "confirmed"))
@@ -0,0 +1,88 @@
+"""Tests for the denormalised booking price snapshot."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase
+from django.utils import timezone
+
+from addons.models import AddOn
+from field_booking.models import Booking
+from field_booking.reservations import reserve_booking
+from field_management.models import Category, Venue
+
+
+class PriceSnapshotTests(TestCase):
+    """Bookings carry their billed hours and amounts as plain columns."""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="snapshot", password="secret123")
+        self.venue = Venue.objects.create(
+            category=Category.objects.create(name="Snapshot Arena"),
+            name="Snapshot Court",
+            description="Court.",
+            location="Downtown",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+        )
+        self.addon = AddOn.objects.create(venue=self.venue, name="Lights", description="Extra", price=Decimal("50000"))
+        day = timezone.localdate() + timedelta(days=7)
+        self.start = timezone.make_aware(datetime.combine(day, time(9)))
+
+    def _reserve(self, hours: int, offset_days: int = 0, addons=()) -> Booking:
+        start = self.start + timedelta(days=offset_days)
+        booking = Booking(
+            user=self.user, venue=self.venue, start_datetime=start, end_datetime=start + timedelta(hours=hours)
+        )
+        return reserve_booking(booking, save_m2m=lambda: booking.addons.set(addons), addons=list(addons))
+
+    def _snapshot(self, booking: Booking) -> tuple:
+        return Booking.objects.values_list("billed_hours", "base_amount", "addons_amount", "total_amount").get(
+            pk=booking.pk
+        )
+
+    def test_reservation_stores_the_snapshot(self) -> None:
+        booking = self._reserve(2, addons=[self.addon])
+
+        self.assertEqual(self._snapshot(booking), (2, Decimal("200000"), Decimal("50000"), Decimal("250000")))
+        self.assertEqual(booking.total_amount, booking.total_cost)
+
+    def test_changes_refresh_the_snapshot(self) -> None:
+        booking = self._reserve(2)
+
+        booking.addons.add(self.addon)
+        self.assertEqual(self._snapshot(booking)[2:], (Decimal("50000"), Decimal("250000")))
+
+        booking = Booking.objects.get(pk=booking.pk)
+        booking.end_datetime += timedelta(hours=1)
+        booking.save()
+        self.assertEqual(self._snapshot(booking), (3, Decimal("300000"), Decimal("50000"), Decimal("350000")))
+        self.assertEqual(booking.payment.total_amount, Decimal("350000"))
+
+    def test_backfill_command_prices_unpriced_rows(self) -> None:
+        first = self._reserve(2, addons=[self.addon])
+        second = self._reserve(1, offset_days=1)
+        Booking.objects.update(billed_hours=0, base_amount=0, addons_amount=0, total_amount=0)
+
+        out = StringIO()
+        call_command("backfill_booking_prices", batch_size=1, stdout=out)
+
+        self.assertIn("2 bookings", out.getvalue())
+        self.assertEqual(self._snapshot(first)[3], Decimal("250000"))
+        self.assertEqual(self._snapshot(second)[3], Decimal("100000"))
+
+    def test_revenue_is_summed_in_sql(self) -> None:
+        self._reserve(2, addons=[self.addon])
+        self._reserve(1, offset_days=1).cancel()
+        self._reserve(3, offset_days=2)
+
+        with self.assertNumQueries(1):
+            revenue = Booking.objects.exclude(status=Booking.STATUS_CANCELLED).aggregate(total=Sum("total_amount"))
+
+        self.assertEqual(revenue["total"], Decimal("550000"))
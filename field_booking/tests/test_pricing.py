@@ -0,0 +1,146 @@
+"""Tests for the single-pass booking pricing pipeline."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from addons.models import AddOn
+from field_booking.models import Booking, Payment
+from field_booking.pricing import quote_booking, quote_queryset, quote_rows, sync_payment
+from field_booking.reservations import reserve_booking
+from field_management.models import Category, Venue
+
+
+class PricingPipelineTests(TestCase):
+    """A booking submission prices itself once and writes its payment once."""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="pricer", password="secret123")
+        self.venue = Venue.objects.create(
+            category=Category.objects.create(name="Pricing Arena"),
+            name="Pricing Court",
+            description="Court.",
+            location="Downtown",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+        )
+        self.addons = [
+            AddOn.objects.create(venue=self.venue, name=name, description="Extra", price=price)
+            for name, price in (("Lights", Decimal("50000.00")), ("Balls", Decimal("25000.00")))
+        ]
+        day = timezone.localdate() + timedelta(days=6)
+        self.start = timezone.make_aware(datetime.combine(day, time(9)))
+        # Warm the venue lock row so every measurement takes the same path.
+        reserve_booking(self._booking(hours=1, offset_days=30))
+
+    def _booking(self, hours: int = 3, offset_days: int = 0) -> Booking:
+        start = self.start + timedelta(days=offset_days)
+        return Booking(
+            user=self.user, venue=self.venue, start_datetime=start, end_datetime=start + timedelta(hours=hours)
+        )
+
+    def test_reservation_writes_the_payment_once(self) -> None:
+        booking = self._booking()
+
+        # Lock, overlap and hold checks, the booking, its calendar refresh (in a savepoint), three for the add-ons,
+        # the payment, the outbox event and the hold cleanup, inside the reservation savepoint.
+        with self.assertNumQueries(17) as queries:
+            reserve_booking(booking, save_m2m=lambda: booking.addons.set(self.addons), addons=self.addons)
+
+        payment_table = Payment._meta.db_table
+        payment_queries = [query["sql"] for query in queries.captured_queries if f'"{payment_table}"' in query["sql"]]
+        self.assertEqual(len(payment_queries), 1)
+        self.assertTrue(payment_queries[0].startswith("INSERT"))
+        self.assertEqual(Payment.objects.get(booking=booking).total_amount, Decimal("375000.00"))
+
+    def test_quote_matches_total_cost(self) -> None:
+        booking = reserve_booking(self._booking(), save_m2m=lambda: None)
+        booking.addons.set(self.addons)
+        booking = Booking.objects.get(pk=booking.pk)
+
+        quote = quote_booking(booking)
+
+        self.assertEqual((quote.hours, quote.total), (booking.duration_hours, booking.total_cost))
+        self.assertEqual(booking.payment.total_amount, booking.total_cost)
+
+    def test_sync_payment_skips_writes_when_the_total_is_unchanged(self) -> None:
+        booking = reserve_booking(self._booking())
+        booking = Booking.objects.select_related("venue", "payment").prefetch_related("addons").get(pk=booking.pk)
+
+        with self.assertNumQueries(0):
+            sync_payment(booking)
+
+
+class BulkQuoteTests(TestCase):
+    """Bulk quotes agree with ``Booking.total_cost`` for every booking shape."""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="bulk-pricer", password="secret123")
+        category = Category.objects.create(name="Bulk Pricing Arena")
+        self.day_venue = Venue.objects.create(
+            category=category,
+            name="Day Court",
+            description="Court.",
+            location="Downtown",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+            available_start_time=time(8),
+            available_end_time=time(17),
+        )
+        self.night_venue = Venue.objects.create(
+            category=category,
+            name="Night Court",
+            description="Court.",
+            location="Downtown",
+            city="Jakarta",
+            price_per_hour=Decimal("150000.00"),
+            facilities="Lighting",
+            available_start_time=time(18),
+            available_end_time=time(2),
+        )
+        self.addon = AddOn.objects.create(
+            venue=self.day_venue, name="Lights", description="Extra", price=Decimal("50000")
+        )
+        self.day = timezone.localdate() + timedelta(days=10)
+
+    def _at(self, day_offset: int, hour: int):
+        return timezone.make_aware(datetime.combine(self.day + timedelta(days=day_offset), time(hour)))
+
+    def test_queryset_quotes_match_total_cost(self) -> None:
+        windows = [
+            (self.day_venue, self._at(0, 8), self._at(0, 17)),
+            (self.day_venue, self._at(1, 8), self._at(3, 17)),
+            (self.day_venue, self._at(5, 9), self._at(5, 12)),
+            (self.night_venue, self._at(0, 18), self._at(1, 2)),
+            (self.night_venue, self._at(2, 18), self._at(4, 2)),
+            (self.night_venue, self._at(6, 20), self._at(6, 23)),
+        ]
+        for venue, start, end in windows:
+            booking = Booking.objects.create(user=self.user, venue=venue, start_datetime=start, end_datetime=end)
+            if venue == self.day_venue:
+                booking.addons.add(self.addon)
+
+        with self.assertNumQueries(1):
+            quotes = quote_queryset(Booking.objects.all())
+
+        for booking in Booking.objects.select_related("venue").prefetch_related("addons"):
+            with self.subTest(start=booking.start_datetime, end=booking.end_datetime):
+                self.assertEqual(quotes[booking.pk].hours, booking.duration_hours)
+                self.assertEqual(quotes[booking.pk].total, booking.total_cost)
+
+    def test_rows_quote_without_a_database(self) -> None:
+        rows = [
+            (time(18), time(2), Decimal("150000"), self._at(0, 18), self._at(1, 2), Decimal("0")),
+            (time(8), time(17), Decimal("100000"), self._at(0, 10), self._at(0, 12), Decimal("25000")),
+        ]
+
+        with self.assertNumQueries(0):
+            quotes = quote_rows(rows)
+
+        self.assertEqual([quote.total for quote in quotes], [Decimal("1200000"), Decimal("225000")])
@@ -0,0 +1,108 @@
+"""Tests for the per-venue reserved-day bitset calendar."""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from field_booking.models import Booking, VenueReservedCalendar
+from field_booking.reserved_calendar import reserved_dates_in_range
+from field_management.models import Category, Venue
+
+
+class ReservedCalendarTests(TestCase):
+    """Keep the bitset in step with booking saves, cancellations and deletes."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="calendar", password="secret123")
+        self.venue = Venue.objects.create(
+            category=Category.objects.create(name="Calendar Arena"),
+            name="Calendar Court",
+            description="Court.",
+            location="Downtown",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+        )
+        self.today = timezone.localdate()
+
+    def _book(self, first_day: date, last_day: date, status: str = Booking.STATUS_PENDING) -> Booking:
+        return Booking.objects.create(
+            user=self.user,
+            venue=self.venue,
+            start_datetime=timezone.make_aware(datetime.combine(first_day, time(8, 0))),
+            end_datetime=timezone.make_aware(datetime.combine(last_day, time(20, 0))),
+            status=status,
+        )
+
+    def _reserved(self, days: int = 30) -> set[date]:
+        return reserved_dates_in_range(self.venue.pk, self.today, self.today + timedelta(days=days))
+
+    def test_active_booking_sets_each_covered_day(self) -> None:
+        first_day = self.today + timedelta(days=3)
+        self._book(first_day, first_day + timedelta(days=2))
+        self._book(self.today + timedelta(days=10), self.today + timedelta(days=10), Booking.STATUS_CANCELLED)
+
+        self.assertEqual(self._reserved(), {first_day + timedelta(days=offset) for offset in range(3)})
+
+    def test_cancelling_clears_only_days_not_held_by_other_bookings(self) -> None:
+        day = self.today + timedelta(days=5)
+        first = self._book(day, day + timedelta(days=1))
+        self._book(day + timedelta(days=1), day + timedelta(days=1))
+
+        first.cancel()
+
+        self.assertEqual(self._reserved(), {day + timedelta(days=1)})
+
+    def test_moving_and_deleting_a_booking_updates_both_windows(self) -> None:
+        booking = self._book(self.today + timedelta(days=2), self.today + timedelta(days=2))
+        booking.start_datetime += timedelta(days=4)
+        booking.end_datetime += timedelta(days=4)
+        booking.save()
+        self.assertEqual(self._reserved(), {self.today + timedelta(days=6)})
+
+        booking.delete()
+        self.assertEqual(self._reserved(), set())
+
+    def test_bookings_spanning_new_year_use_two_rows(self) -> None:
+        new_year = date(self.today.year + 1, 1, 1)
+        self._book(new_year - timedelta(days=1), new_year)
+
+        reserved = reserved_dates_in_range(self.venue.pk, new_year - timedelta(days=3), new_year + timedelta(days=3))
+
+        self.assertEqual(reserved, {new_year - timedelta(days=1), new_year})
+        self.assertEqual(VenueReservedCalendar.objects.filter(venue=self.venue).count(), 2)
+
+    def test_rebuild_command_recovers_from_bulk_updates(self) -> None:
+        day = self.today + timedelta(days=7)
+        self._book(day, day)
+        Booking.objects.update(status=Booking.STATUS_CANCELLED)
+        self.assertEqual(self._reserved(), {day})
+
+        call_command("rebuild_reserved_calendar", stdout=StringIO())
+
+        self.assertEqual(self._reserved(), set())
+
+    def test_availability_skips_bookings_on_quiet_dates(self) -> None:
+        self._book(self.today + timedelta(days=60), self.today + timedelta(days=60))
+        self.client.force_login(self.user)
+        quiet_month = (self.today + timedelta(days=120)).strftime("%Y-%m")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("venue-availability", kwargs={"slug": self.venue.slug}), {"month": quiet_month}
+            )
+
+        self.assertFalse(any(day["is_reserved"] for day in response.json()["days"]))
+        booking_table = Booking._meta.db_table
+        self.assertFalse(any(f'FROM "{booking_table}"' in query["sql"] for query in queries.captured_queries))
@@ -0,0 +1,135 @@
+"""Tests for short-lived checkout holds."""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from field_booking.availability_cache import month_availability
+from field_booking.models import Booking, SlotHold
+from field_booking.reservations import place_hold, reserve_booking
+from field_management.models import Category, Venue
+
+
+def _at(day: date, hour: int) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time(hour, 0)))
+
+
+class SlotHoldTests(TestCase):
+    """A live hold blocks other users until it is consumed or expires."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        user_model = get_user_model()
+        self.holder = user_model.objects.create_user(username="holder", password="secret123")
+        self.other = user_model.objects.create_user(username="other", password="secret123")
+        self.venue = Venue.objects.create(
+            category=Category.objects.create(name="Hold Arena"),
+            name="Hold Court",
+            description="Court.",
+            location="Downtown",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+            available_start_time=time(8, 0),
+            available_end_time=time(12, 0),
+        )
+        self.day = timezone.localdate() + timedelta(days=4)
+
+    def _booking(self, user, start_hour: int, end_hour: int) -> Booking:
+        return Booking(
+            user=user, venue=self.venue, start_datetime=_at(self.day, start_hour), end_datetime=_at(self.day, end_hour)
+        )
+
+    def test_hold_blocks_other_users_and_is_consumed_by_the_holder(self) -> None:
+        place_hold(self.venue.pk, self.holder.pk, _at(self.day, 9), _at(self.day, 11))
+
+        with self.assertRaisesMessage(ValidationError, "checking out"):
+            reserve_booking(self._booking(self.other, 10, 12))
+        with self.assertRaisesMessage(ValidationError, "checking out"):
+            place_hold(self.venue.pk, self.other.pk, _at(self.day, 8), _at(self.day, 10))
+
+        reserve_booking(self._booking(self.holder, 9, 11))
+
+        self.assertFalse(SlotHold.objects.exists())
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_new_hold_replaces_the_users_previous_hold(self) -> None:
+        place_hold(self.venue.pk, self.holder.pk, _at(self.day, 8), _at(self.day, 9))
+        place_hold(self.venue.pk, self.holder.pk, _at(self.day, 10), _at(self.day, 11))
+
+        self.assertEqual(
+            list(SlotHold.objects.values_list("start_datetime", flat=True)), [_at(self.day, 10)]
+        )
+
+    @override_settings(SLOT_HOLD_MAX_HOURS=24, SLOT_HOLD_MAX_PER_USER=2)
+    def test_holds_are_limited_in_length_and_number(self) -> None:
+        with self.assertRaisesMessage(ValidationError, "at most 24 hours"):
+            place_hold(self.venue.pk, self.holder.pk, _at(self.day, 9), _at(self.day + timedelta(days=2), 9))
+
+        venues = [self.venue]
+        for name in ("Second Court", "Third Court"):
+            venues.append(Venue.objects.create(category=self.venue.category, name=name, price_per_hour=Decimal("1")))
+        place_hold(venues[0].pk, self.holder.pk, _at(self.day, 9), _at(self.day, 10))
+        place_hold(venues[1].pk, self.holder.pk, _at(self.day, 9), _at(self.day, 10))
+        with self.assertRaisesMessage(ValidationError, "too many venues"):
+            place_hold(venues[2].pk, self.holder.pk, _at(self.day, 9), _at(self.day, 10))
+
+        # Replacing a hold on the same venue, or holding again once one lapsed, stays allowed.
+        place_hold(venues[1].pk, self.holder.pk, _at(self.day, 10), _at(self.day, 11))
+        SlotHold.objects.filter(venue=venues[0]).update(expires_at=timezone.now() - timedelta(seconds=1))
+        place_hold(venues[2].pk, self.holder.pk, _at(self.day, 9), _at(self.day, 10))
+        self.assertEqual(SlotHold.objects.filter(expires_at__gt=timezone.now()).count(), 2)
+
+    def test_expired_holds_are_ignored_and_swept(self) -> None:
+        hold = place_hold(self.venue.pk, self.holder.pk, _at(self.day, 9), _at(self.day, 11))
+        SlotHold.objects.filter(pk=hold.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        reserve_booking(self._booking(self.other, 9, 10))
+        place_hold(self.venue.pk, self.holder.pk, _at(self.day, 10), _at(self.day, 11))
+        SlotHold.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        call_command("sweep_slot_holds", batch_size=1, stdout=StringIO())
+
+        self.assertFalse(SlotHold.objects.exists())
+
+    def test_availability_shows_holds_to_everyone_but_the_holder(self) -> None:
+        place_hold(self.venue.pk, self.holder.pk, _at(self.day, 9), _at(self.day, 10))
+
+        def slots_for(user) -> list[tuple[bool, bool]]:
+            payload = month_availability(self.venue, self.day.replace(day=1), viewer_id=user.pk)
+            day = next(entry for entry in payload["days"] if entry["date"] == self.day.isoformat())
+            return [(slot["is_free"], slot["is_held"]) for slot in day["slots"]]
+
+        self.assertEqual(slots_for(self.other)[1], (False, True))
+        self.assertEqual(slots_for(self.holder)[1], (True, False))
+
+    def test_hold_endpoint(self) -> None:
+        url = reverse("venue-hold", kwargs={"slug": self.venue.slug})
+        payload = {
+            "start_datetime": self.day.isoformat(),
+            "end_datetime": self.day.isoformat(),
+            "start_time": "09:00",
+            "end_time": "10:00",
+        }
+
+        self.client.force_login(self.holder)
+        self.assertEqual(self.client.post(url, payload).status_code, 201)
+
+        self.client.force_login(self.other)
+        response = self.client.post(url, payload)
+        self.assertEqual(response.status_code, 409)
+        self.assertIn("checking out", response.json()["error"])
+
+        with self.settings(SLOT_HOLD_MAX_HOURS=0):
+            response = self.client.post(url, {**payload, "start_time": "10:00", "end_time": "11:00"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("at most 0 hours", response.json()["error"])
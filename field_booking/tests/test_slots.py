@@ -0,0 +1,128 @@
+"""Tests for the hour-slot availability engine."""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from field_booking.models import Booking
+from field_booking.slots import merge_intervals, venue_day_slots, venue_free_intervals
+from field_management.models import Category, Venue, VenueAvailability
+
+
+def _at(day: date, hour: int) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time(hour, 0)))
+
+
+class SlotEngineTests(TestCase):
+    """Free hours come from opening hours minus merged booking intervals."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="slots", password="secret123")
+        self.venue = Venue.objects.create(
+            category=Category.objects.create(name="Slot Arena"),
+            name="Slot Court",
+            description="Court.",
+            location="Downtown",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+            available_start_time=time(8, 0),
+            available_end_time=time(12, 0),
+        )
+        self.day = timezone.localdate() + timedelta(days=3)
+
+    def _book(self, start: datetime, end: datetime, status: str = Booking.STATUS_PENDING) -> Booking:
+        return Booking.objects.create(
+            user=self.user, venue=self.venue, start_datetime=start, end_datetime=end, status=status
+        )
+
+    def test_merge_intervals_coalesces_overlapping_and_touching(self) -> None:
+        d = self.day
+        merged = merge_intervals(
+            [(_at(d, 10), _at(d, 11)), (_at(d, 8), _at(d, 9)), (_at(d, 9), _at(d, 10)), (_at(d, 15), _at(d, 16))]
+        )
+
+        self.assertEqual(merged, [(_at(d, 8), _at(d, 11)), (_at(d, 15), _at(d, 16))])
+
+    def test_partial_booking_leaves_the_rest_of_the_day_free(self) -> None:
+        self._book(_at(self.day, 9), _at(self.day, 11))
+        self._book(_at(self.day, 8), _at(self.day, 9), Booking.STATUS_CANCELLED)
+
+        (day,) = venue_day_slots(self.venue, self.day, self.day)
+
+        self.assertFalse(day.is_reserved)
+        self.assertEqual([slot.is_free for slot in day.slots], [True, False, False, True])
+        self.assertEqual(
+            venue_free_intervals(self.venue, self.day, self.day),
+            [(_at(self.day, 8), _at(self.day, 9)), (_at(self.day, 11), _at(self.day, 12))],
+        )
+
+    def test_day_is_reserved_once_every_slot_is_taken(self) -> None:
+        self._book(_at(self.day, 8), _at(self.day, 10))
+        self._book(_at(self.day, 10), _at(self.day, 12))
+
+        (day,) = venue_day_slots(self.venue, self.day, self.day)
+
+        self.assertTrue(day.is_reserved)
+
+    def test_availability_blocks_narrow_opening_hours(self) -> None:
+        VenueAvailability.objects.create(
+            venue=self.venue, start_datetime=_at(self.day, 10), end_datetime=_at(self.day, 18)
+        )
+
+        days = venue_day_slots(self.venue, self.day - timedelta(days=1), self.day + timedelta(days=1))
+
+        self.assertEqual([day.date for day in days], [self.day])
+        self.assertEqual([slot.start for slot in days[0].slots], [_at(self.day, 10), _at(self.day, 11)])
+
+    def test_overnight_hours_belong_to_the_opening_day(self) -> None:
+        self.venue.available_start_time = time(22, 0)
+        self.venue.available_end_time = time(2, 0)
+        self.venue.save()
+
+        (day,) = venue_day_slots(self.venue, self.day, self.day)
+
+        self.assertEqual(len(day.slots), 4)
+        self.assertEqual(day.slots[-1].end, _at(self.day + timedelta(days=1), 2))
+
+    def test_booking_specific_hours_keeps_remaining_slots_sellable(self) -> None:
+        self.client.force_login(self.user)
+        url = reverse("venue-detail", kwargs={"slug": self.venue.slug})
+        payload = {"start_datetime": self.day.isoformat(), "end_datetime": self.day.isoformat()}
+
+        self.client.post(url, {**payload, "start_time": "09:00", "end_time": "11:00"})
+        response = self.client.post(url, {**payload, "start_time": "11:00", "end_time": "12:00"})
+
+        self.assertRedirects(response, reverse("booked-places"))
+        first, second = Booking.objects.order_by("start_datetime")
+        self.assertEqual((first.start_datetime, first.end_datetime), (_at(self.day, 9), _at(self.day, 11)))
+        self.assertEqual(second.duration_hours, 1)
+
+    def test_slots_endpoint_returns_days_and_validates_range(self) -> None:
+        self._book(_at(self.day, 8), _at(self.day, 9))
+        self.client.force_login(self.user)
+        url = reverse("venue-slots", kwargs={"slug": self.venue.slug})
+
+        response = self.client.get(url, {"start": self.day.isoformat(), "end": self.day.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        (day,) = response.json()["days"]
+        self.assertEqual(day["date"], self.day.isoformat())
+        self.assertEqual([slot["is_free"] for slot in day["slots"]], [False, True, True, True])
+        self.assertEqual(len(day["free"]), 1)
+
+        self.assertEqual(self.client.get(url, {"start": "soon"}).status_code, 400)
+        too_long = {"start": self.day.isoformat(), "end": (self.day + timedelta(days=90)).isoformat()}
+        self.assertEqual(self.client.get(url, too_long).status_code, 400)
+
+        beyond_horizon = {"start": "9999-12-31", "end": "9999-12-31"}
+        response = self.client.get(url, beyond_horizon)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("within", response.json()["error"])
+        self.assertEqual(self.client.get(url, {"start": "9999-12-31"}).status_code, 400)
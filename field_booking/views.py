@@ -1,43 +1,53 @@
 """Views handling booking and payment flows."""
 from __future__ import annotations
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from django.views.generic import ListView
 
+from . import outbox
 from .forms import PaymentForm
+from .idempotency import idempotent
+from .payment_events import InvalidEvent, parse_event, record_event
+from .payment_providers import SIGNATURE_HEADER, TIMESTAMP_HEADER, verify
 from .models import Booking, Payment
 
 
 class BookingCancelView(LoginRequiredMixin, View):
     """Allow a user to cancel their own booking."""
 
+    @idempotent("booking-cancel")
     def post(self, request: HttpRequest, pk: int) -> HttpResponse:
         booking = get_object_or_404(Booking.objects.select_related("payment"), pk=pk, user=request.user)
         is_ajax_request = request.headers.get("x-requested-with", "").lower() == "xmlhttprequest"
 
-        if booking.status in {Booking.STATUS_COMPLETED, Booking.STATUS_CANCELLED}:
+        if booking.status in Booking.CLOSED_STATUSES:
             message = "This booking can no longer be cancelled."
             if is_ajax_request:
                 return JsonResponse({"success": False, "message": message, "booking_id": booking.pk}, status=400)
             messages.error(request, message)
             return redirect("booked-places")
 
-        booking.cancel()
+        with transaction.atomic():
+            booking.cancel()
 
-        payment = None
-        try:
-            payment = booking.payment
-        except Payment.DoesNotExist:
-            # Ensure a payment record exists so the user can book again later.
-            payment = booking.ensure_payment()
+            payment = None
+            try:
+                payment = booking.payment
+            except Payment.DoesNotExist:
+                # Ensure a payment record exists so the user can book again later.
+                payment = booking.ensure_payment()
 
-        if payment is not None:
-            payment.status = "waiting"
-            payment.save(update_fields=["status", "updated_at"])
+            if payment is not None:
+                payment.status = "waiting"
+                payment.save(update_fields=["status", "updated_at"])
 
         success_message = "Booking cancelled successfully."
         if is_ajax_request:
@@ -61,27 +71,43 @@ class BookingPaymentView(LoginRequiredMixin, View):
         if booking.status == Booking.STATUS_PENDING:
             messages.error(request, "This booking still requires admin approval before payment.")
             return redirect("wishlist")
-        if booking.status in {Booking.STATUS_CANCELLED, Booking.STATUS_COMPLETED}:
+        if booking.status in Booking.CLOSED_STATUSES:
             messages.error(request, "This booking can no longer be paid.")
             return redirect("booked-places")
         form = PaymentForm(instance=booking.payment)
         return render(request, self.template_name, {"booking": booking, "form": form})
 
+    @idempotent("booking-payment")
     def post(self, request: HttpRequest, pk: int) -> HttpResponse:
         booking = self._get_booking(request, pk)
         if booking.status == Booking.STATUS_PENDING:
             messages.error(request, "This booking still requires admin approval before payment.")
             return redirect("wishlist")
-        if booking.status in {Booking.STATUS_CANCELLED, Booking.STATUS_COMPLETED}:
+        if booking.status in Booking.CLOSED_STATUSES:
             messages.error(request, "This booking can no longer be paid.")
             return redirect("booked-places")
         form = PaymentForm(request.POST, instance=booking.payment)
         if form.is_valid():
             payment: Payment = form.save(commit=False)
-            payment.status = "confirmed"
-            payment.save()
-            booking.status = Booking.STATUS_CONFIRMED
-            booking.save(update_fields=["status", "updated_at"])
+            if settings.PAYMENT_CONFIRMATION == "webhook":
+                # The provider's webhook confirms the payment and the booking later.
+                with transaction.atomic():
+                    payment.save(update_fields=["method", "updated_at"])
+                    outbox.record(outbox.PAYMENT_SUBMITTED, booking, method=payment.method)
+                messages.success(request, "Payment submitted! We'll confirm your booking once the provider settles it.")
+                return redirect("booked-places")
+            with transaction.atomic():
+                payment.status = "confirmed"
+                payment.save()
+                booking.status = Booking.STATUS_CONFIRMED
+                booking.save(update_fields=["status", "updated_at"])
+                outbox.record(
+                    outbox.PAYMENT_CONFIRMED,
+                    booking,
+                    method=payment.method,
+                    payment_status=payment.status,
+                    reference_code=payment.reference_code,
+                )
             messages.success(request, "Payment completed! Your booking is confirmed.")
             return redirect("booked-places")
         messages.error(request, "Could not process the payment. Please try again.")
@@ -108,3 +134,18 @@ class BookedPlacesView(LoginRequiredMixin, ListView):
             .prefetch_related("addons")
             .order_by("-start_datetime")
         )
+
+
+@csrf_exempt
+@require_POST
+def payment_webhook(request: HttpRequest, provider: str) -> JsonResponse:
+    """Verify a provider webhook and store it for the payment events job; nothing else runs here."""
+
+    if not verify(provider, request.body, request.headers.get(SIGNATURE_HEADER), request.headers.get(TIMESTAMP_HEADER)):
+        return JsonResponse({"error": "Invalid signature."}, status=401)
+    try:
+        payload = parse_event(request.body)
+    except InvalidEvent as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    created = record_event(provider, payload)
+    return JsonResponse({"received": True, "duplicate": not created}, status=202)
@@ -5,3 +5,6 @@ class FieldCatalogConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "field_catalog"
     verbose_name = "Field Catalog"
+
+    def ready(self):  # pragma: no cover
+        from . import consumers, signals  # noqa: F401
@@ -0,0 +1,118 @@
+"""Cached registry of the city and category choices shown in catalog filters.
+
+The registry is rebuilt lazily after a ``Venue`` or ``Category`` change. A
+generation counter lives in the shared cache so every process notices the
+invalidation, while each process keeps its own snapshot so that rendering a
+form costs a cache lookup instead of database queries. Generations start from
+a timestamp so an evicted counter never resurrects an older payload.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db.models import Case, IntegerField, When
+
+from field_management.constants import CATEGORY_SLUG_SEQUENCE
+from field_management.models import Category, Venue
+
+GENERATION_CACHE_KEY = "field_catalog:choices:generation"
+PAYLOAD_CACHE_KEY = "field_catalog:choices:{generation}"
+
+# Cities listed first in the navigation search, in this order.
+PREFERRED_CITY_ORDER: list[str] = [
+    "Jakarta",
+    "Bandung",
+    "Tangerang",
+    "Yogyakarta",
+    "Surabaya",
+    "Makassar",
+    "Denpasar",
+    "Palembang",
+    "Semarang",
+    "Medan",
+]
+
+
+@dataclass(frozen=True)
+class ChoiceSnapshot:
+    """Immutable lookup data backing the filter dropdowns."""
+
+    generation: int
+    cities: tuple[str, ...]
+    categories: tuple[tuple[int, str], ...]
+
+
+_lock = threading.Lock()
+_snapshot: ChoiceSnapshot | None = None
+
+
+def _build_snapshot(generation: int) -> ChoiceSnapshot:
+    cities = (
+        Venue.objects.exclude(city="")
+        .order_by("city")
+        .values_list("city", flat=True)
+        .distinct()
+    )
+    order_expression = Case(
+        *[When(slug=slug, then=position) for position, slug in enumerate(CATEGORY_SLUG_SEQUENCE)],
+        default=len(CATEGORY_SLUG_SEQUENCE),
+        output_field=IntegerField(),
+    )
+    categories = (
+        Category.objects.filter(slug__in=CATEGORY_SLUG_SEQUENCE)
+        .annotate(_display_order=order_expression)
+        .order_by("_display_order")
+        .values_list("pk", "name")
+    )
+    return ChoiceSnapshot(generation=generation, cities=tuple(cities), categories=tuple(categories))
+
+
+def get_snapshot() -> ChoiceSnapshot:
+    """Return the current choices, rebuilding them only after an invalidation."""
+
+    global _snapshot
+    generation = cache.get_or_set(GENERATION_CACHE_KEY, time.time_ns, timeout=None)
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.generation == generation:
+        return snapshot
+    with _lock:
+        payload_key = PAYLOAD_CACHE_KEY.format(generation=generation)
+        snapshot = cache.get(payload_key)
+        if snapshot is None:
+            snapshot = _build_snapshot(generation)
+            cache.set(payload_key, snapshot, timeout=None)
+        _snapshot = snapshot
+    return snapshot
+
+
+def invalidate() -> None:
+    """Force the next lookup in every process to rebuild the choices."""
+
+    global _snapshot
+    try:
+        cache.incr(GENERATION_CACHE_KEY)
+    except ValueError:
+        cache.set(GENERATION_CACHE_KEY, time.time_ns(), timeout=None)
+    _snapshot = None
+
+
+def city_choices() -> list[tuple[str, str]]:
+    """Cities that currently have venues, alphabetically."""
+
+    return [(city, city) for city in get_snapshot().cities]
+
+
+def navigation_city_choices() -> list[tuple[str, str]]:
+    """Preferred cities first, followed by any other city that has venues."""
+
+    remaining = [city for city in get_snapshot().cities if city not in PREFERRED_CITY_ORDER]
+    return [(city, city) for city in PREFERRED_CITY_ORDER + remaining]
+
+
+def category_choices() -> list[tuple[str, str]]:
+    """Catalog categories in their configured display order, keyed by primary key."""
+
+    return [(str(pk), name) for pk, name in get_snapshot().categories]
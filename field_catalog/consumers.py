@@ -0,0 +1,28 @@
+"""Outbox consumers keeping catalog caches and rankings in step with bookings."""
+from __future__ import annotations
+
+from field_booking import jobs, outbox
+from field_booking.models import OutboxEvent
+
+from . import facets, popularity
+
+# Topics that take or free a venue's window; approvals and payments keep it reserved.
+RESERVATION_TOPICS = {
+    outbox.BOOKING_REQUESTED,
+    outbox.BOOKING_CANCELLED,
+    outbox.BOOKING_COMPLETED,
+    outbox.BOOKING_EXPIRED,
+}
+
+
+@outbox.consumer("catalog-facets")
+def refresh_availability_facets(events: list[OutboxEvent]) -> None:
+    if any(event.topic in RESERVATION_TOPICS for event in events):
+        facets.invalidate_availability_counts()
+
+
+@outbox.consumer("catalog-popularity")
+def queue_popularity_refresh(events: list[OutboxEvent]) -> None:
+    if any(event.topic == outbox.BOOKING_REQUESTED for event in events):
+        # One queued recompute covers every booking relayed until a worker picks it up.
+        jobs.enqueue(popularity.POPULARITY_JOB, unique_key=popularity.POPULARITY_JOB)
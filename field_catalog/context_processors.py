@@ -1,12 +1,17 @@
 """Context processors for catalog module."""
 from __future__ import annotations
 
+from django.utils.functional import SimpleLazyObject
+
 from .forms import SearchFilterForm
 
 
 def global_filters(request):
-    """Provide the search filter form globally for navigation search bars."""
+    """Provide the search filter form globally for navigation search bars.
+
+    The form is only built when a template actually renders it.
+    """
 
     return {
-        "global_filter_form": SearchFilterForm(request.GET or None),
+        "global_filter_form": SimpleLazyObject(lambda: SearchFilterForm(request.GET or None)),
     }
@@ -0,0 +1,181 @@
+"""Faceted venue counts for the catalog sidebar.
+
+All facets are derived from a single grouped aggregate over
+``(city, category, price band)``. Each facet ignores its own selection and
+honours the others, so the sidebar always shows what picking a value would
+return.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, Count, IntegerField, Value, When
+from django.http import QueryDict
+
+from field_booking.availability import exclude_reserved_venues
+from field_management.models import Venue
+
+from . import choices
+from .search import search_venues, tokenize_query
+
+FACET_CACHE_KEY = "field_catalog:facets:{generation}:{digest}"
+# Bumped by the ``catalog-facets`` outbox consumer when bookings take or free a window.
+AVAILABILITY_GENERATION_KEY = "field_catalog:facets:availability-generation"
+
+# ``(label, lower bound inclusive, upper bound exclusive)`` in Rupiah per hour.
+PRICE_BANDS: list[tuple[str, Decimal | None, Decimal | None]] = [
+    ("Under Rp 100.000", None, Decimal("100000")),
+    ("Rp 100.000 – 200.000", Decimal("100000"), Decimal("200000")),
+    ("Rp 200.000 – 400.000", Decimal("200000"), Decimal("400000")),
+    ("Rp 400.000+", Decimal("400000"), None),
+]
+
+
+@dataclass
+class FacetValue:
+    """A single selectable value within a facet."""
+
+    value: str
+    label: str
+    count: int
+    selected: bool = False
+    # Query string that toggles this value, or empty when the facet is display-only.
+    query: str = ""
+
+
+def normalize_filters(cleaned_data: dict[str, Any]) -> dict[str, str]:
+    """Reduce filter input to the canonical form used for matching and cache keys."""
+
+    max_price = cleaned_data.get("max_price")
+    available_from = cleaned_data.get("available_from")
+    available_to = cleaned_data.get("available_to")
+    return {
+        "q": " ".join(tokenize_query(cleaned_data.get("q") or "")),
+        "city": cleaned_data.get("city") or "",
+        "category": str(cleaned_data.get("category") or ""),
+        "max_price": format(Decimal(max_price).normalize(), "f") if max_price is not None else "",
+        "available_from": (available_from or available_to).isoformat() if available_from or available_to else "",
+        "available_to": (available_to or available_from).isoformat() if available_from or available_to else "",
+    }
+
+
+def _price_band_expression() -> Case:
+    whens = []
+    for position, (_, lower, upper) in enumerate(PRICE_BANDS):
+        bounds = {}
+        if lower is not None:
+            bounds["price_per_hour__gte"] = lower
+        if upper is not None:
+            bounds["price_per_hour__lt"] = upper
+        whens.append(When(then=Value(position), **bounds))
+    return Case(*whens, output_field=IntegerField())
+
+
+def _count_facets(filters: dict[str, str]) -> dict[str, dict[str, int]]:
+    queryset = Venue.objects.all()
+    if filters["q"]:
+        queryset = search_venues(queryset, filters["q"])
+    if filters["available_from"]:
+        queryset = exclude_reserved_venues(
+            queryset,
+            date.fromisoformat(filters["available_from"]),
+            date.fromisoformat(filters["available_to"]),
+        )
+
+    annotations: dict[str, Any] = {"price_band": _price_band_expression()}
+    group_by = ["city", "category_id", "price_band"]
+    if filters["max_price"]:
+        annotations["within_budget"] = Case(
+            When(price_per_hour__lte=Decimal(filters["max_price"]), then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        group_by.append("within_budget")
+
+    rows = queryset.annotate(**annotations).values(*group_by).annotate(total=Count("id")).order_by()
+
+    city_counts: Counter[str] = Counter()
+    category_counts: Counter[str] = Counter()
+    band_counts: Counter[str] = Counter()
+    for row in rows:
+        matches_city = not filters["city"] or row["city"] == filters["city"]
+        matches_category = not filters["category"] or str(row["category_id"]) == filters["category"]
+        matches_budget = not filters["max_price"] or bool(row["within_budget"])
+        if matches_category and matches_budget:
+            city_counts[row["city"]] += row["total"]
+        if matches_city and matches_budget:
+            category_counts[str(row["category_id"])] += row["total"]
+        if matches_city and matches_category:
+            band_counts[str(row["price_band"])] += row["total"]
+    return {"city": dict(city_counts), "category": dict(category_counts), "price_band": dict(band_counts)}
+
+
+def get_facet_counts(filters: dict[str, str]) -> dict[str, dict[str, int]]:
+    """Return cached counts for a normalised filter set."""
+
+    digest = hashlib.md5(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+    # Keying on the registry generation drops cached counts whenever a venue changes.
+    generation = str(choices.get_snapshot().generation)
+    if filters["available_from"]:
+        # Date-filtered counts also depend on bookings, which the outbox relay reports.
+        generation += "." + str(cache.get_or_set(AVAILABILITY_GENERATION_KEY, time.time_ns, timeout=None))
+    key = FACET_CACHE_KEY.format(generation=generation, digest=digest)
+    counts = cache.get(key)
+    if counts is None:
+        counts = _count_facets(filters)
+        cache.set(key, counts, timeout=settings.CATALOG_FACET_CACHE_TIMEOUT)
+    return counts
+
+
+def invalidate_availability_counts() -> None:
+    """Drop cached counts of date-filtered searches after bookings changed."""
+
+    try:
+        cache.incr(AVAILABILITY_GENERATION_KEY)
+    except ValueError:
+        cache.set(AVAILABILITY_GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def _toggle_query(params: QueryDict, name: str, value: str) -> str:
+    params = params.copy()
+    params.pop("page", None)
+    if params.get(name) == value:
+        params.pop(name, None)
+    else:
+        params[name] = value
+    return params.urlencode()
+
+
+def build_facets(filterset, params: QueryDict) -> dict[str, list[FacetValue]]:
+    """Return the sidebar facets for the filters applied to ``filterset``."""
+
+    filterset.form.is_valid()
+    filters = normalize_filters(getattr(filterset.form, "cleaned_data", {}))
+    counts = get_facet_counts(filters)
+
+    cities = [
+        FacetValue(value, label, counts["city"].get(value, 0), value == filters["city"])
+        for value, label in choices.city_choices()
+        if counts["city"].get(value) or value == filters["city"]
+    ]
+    categories = [
+        FacetValue(value, label, counts["category"].get(value, 0), value == filters["category"])
+        for value, label in choices.category_choices()
+    ]
+    price_bands = [
+        FacetValue(str(position), label, counts["price_band"].get(str(position), 0))
+        for position, (label, _, _) in enumerate(PRICE_BANDS)
+    ]
+    for name, values in (("city", cities), ("category", categories)):
+        for facet_value in values:
+            facet_value.query = _toggle_query(params, name, facet_value.value)
+    return {"city": cities, "category": categories, "price_band": price_bands}
@@ -1,12 +1,24 @@
 from django import forms
-from django.db.models import Case, IntegerField, When
 import django_filters
 
-from field_management.constants import CATEGORY_SLUG_SEQUENCE
-from field_management.models import Category, Venue
+from field_booking.availability import exclude_reserved_venues, validate_within_horizon
+from field_management.models import Venue
+
+from .choices import category_choices, city_choices
+from .search import search_venues
 
 
 class VenueFilter(django_filters.FilterSet):
+    q = django_filters.CharFilter(
+        method="filter_search",
+        widget=forms.TextInput(
+            attrs={
+                "class": "w-full rounded-2xl border border-white/25 bg-slate-950/70 px-5 py-3 text-sm text-white/90 placeholder:text-white/60 backdrop-blur",
+                "placeholder": "Search venues",
+                "type": "search",
+            }
+        ),
+    )
     city = django_filters.ChoiceFilter(
         field_name="city",
         lookup_expr="exact",
@@ -17,9 +29,9 @@ class VenueFilter(django_filters.FilterSet):
             }
         ),
     )
-    category = django_filters.ModelChoiceFilter(
+    category = django_filters.ChoiceFilter(
         field_name="category",
-        queryset=Category.objects.none(),
+        lookup_expr="exact",
         empty_label="All categories",
         widget=forms.Select(
             attrs={
@@ -40,40 +52,50 @@ class VenueFilter(django_filters.FilterSet):
         ),
     )
 
+    available_from = django_filters.DateFilter(
+        method="filter_available",
+        validators=[validate_within_horizon],
+        widget=forms.DateInput(
+            attrs={
+                "type": "date",
+                "class": "w-full rounded-2xl border border-white/25 bg-slate-950/70 px-5 py-3 text-sm text-white/90 backdrop-blur",
+            }
+        ),
+    )
+    available_to = django_filters.DateFilter(
+        method="filter_available",
+        validators=[validate_within_horizon],
+        widget=forms.DateInput(
+            attrs={
+                "type": "date",
+                "class": "w-full rounded-2xl border border-white/25 bg-slate-950/70 px-5 py-3 text-sm text-white/90 backdrop-blur",
+            }
+        ),
+    )
+
     class Meta:
         model = Venue
-        fields = ["city", "category", "max_price"]
+        fields = ["q", "city", "category", "max_price", "available_from", "available_to"]
 
     def __init__(self, data=None, queryset=None, *, request=None, prefix=None):
         if queryset is None:
             queryset = Venue.objects.all()
         super().__init__(data=data, queryset=queryset, request=request, prefix=prefix)
 
-        city_values = (
-            self.queryset.order_by("city")
-            .values_list("city", flat=True)
-            .distinct()
-        )
-        city_choices = [("", "All cities")] + [
-            (value, value) for value in city_values if value
-        ]
+        # Choices come from the cached registry, so building the filter runs no lookup queries.
+        for name, choices in (("city", city_choices()), ("category", category_choices())):
+            if name in self.filters:
+                self.filters[name].field.choices = choices
+            if name in self.form.fields:
+                self.form.fields[name].choices = choices
 
-        if "city" in self.filters:
-            self.filters["city"].field.choices = city_choices
-        if "city" in self.form.fields:
-            self.form.fields["city"].choices = city_choices
+    def filter_search(self, queryset, name, value):
+        return search_venues(queryset, value)
 
-        order_expression = Case(
-            *[When(slug=slug, then=position) for position, slug in enumerate(CATEGORY_SLUG_SEQUENCE)],
-            default=len(CATEGORY_SLUG_SEQUENCE),
-            output_field=IntegerField(),
-        )
-        category_queryset = (
-            Category.objects.filter(slug__in=CATEGORY_SLUG_SEQUENCE)
-            .annotate(_display_order=order_expression)
-            .order_by("_display_order")
-        )
-        if "category" in self.filters:
-            self.filters["category"].field.queryset = category_queryset
-        if "category" in self.form.fields:
-            self.form.fields["category"].queryset = category_queryset
+    def filter_available(self, queryset, name, value):
+        start_date = self.form.cleaned_data.get("available_from")
+        end_date = self.form.cleaned_data.get("available_to")
+        # Both fields share this method; apply the anti-join once for the pair.
+        if name == "available_to" and start_date:
+            return queryset
+        return exclude_reserved_venues(queryset, start_date or end_date, end_date or start_date)
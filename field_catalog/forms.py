@@ -1,10 +1,8 @@
 from __future__ import annotations
 
 from django import forms
-from django.db.models import Case, IntegerField, When
 
-from field_management.constants import CATEGORY_SLUG_SEQUENCE
-from field_management.models import Category, Venue
+from .choices import category_choices, navigation_city_choices
 
 
 class SearchFilterForm(forms.Form):
@@ -19,10 +17,9 @@ class SearchFilterForm(forms.Form):
             }
         ),
     )
-    category = forms.ModelChoiceField(
+    category = forms.ChoiceField(
         required=False,
-        queryset=Category.objects.none(),
-        empty_label="All categories",
+        choices=(),
         widget=forms.Select(
             attrs={
                 "class": "custom-select w-full rounded-2xl border border-white/25 bg-slate-950/70 px-5 py-3 text-sm text-white/90 backdrop-blur",
@@ -42,43 +39,5 @@ class SearchFilterForm(forms.Form):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-
-        preferred_city_order = [
-            "Jakarta",
-            "Bandung",
-            "Tangerang",
-            "Yogyakarta",
-            "Surabaya",
-            "Makassar",
-            "Denpasar",
-            "Palembang",
-            "Semarang",
-            "Medan",
-        ]
-
-        city_choices = [("", "All cities")]
-        for city in preferred_city_order:
-            city_choices.append((city, city))
-
-        remaining_cities = (
-            Venue.objects.exclude(city__in=preferred_city_order)
-            .order_by("city")
-            .values_list("city", flat=True)
-            .distinct()
-        )
-        for city in remaining_cities:
-            if city:
-                city_choices.append((city, city))
-
-        self.fields["city"].choices = city_choices
-
-        order_expression = Case(
-            *[When(slug=slug, then=position) for position, slug in enumerate(CATEGORY_SLUG_SEQUENCE)],
-            default=len(CATEGORY_SLUG_SEQUENCE),
-            output_field=IntegerField(),
-        )
-        self.fields["category"].queryset = (
-            Category.objects.filter(slug__in=CATEGORY_SLUG_SEQUENCE)
-            .annotate(_display_order=order_expression)
-            .order_by("_display_order")
-        )
+        self.fields["city"].choices = [("", "All cities")] + navigation_city_choices()
+        self.fields["category"].choices = [("", "All categories")] + category_choices()
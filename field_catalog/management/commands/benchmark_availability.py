@@ -0,0 +1,97 @@
+"""Benchmark the catalog date-range availability filter against a large booking table."""
+from __future__ import annotations
+
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from field_booking.availability import exclude_reserved_venues
+from field_booking.models import Booking
+from field_management.models import Category, Venue
+
+BENCHMARK_CITY = "Benchmark City"
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the available_from/available_to anti-join on synthetic data. "
+        "Everything runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bookings", type=int, default=100_000)
+        parser.add_argument("--venues", type=int, default=500)
+        parser.add_argument("--days", type=int, default=365, help="Spread bookings over this many days.")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        with transaction.atomic():
+            venues = self._create_venues(options["venues"])
+            self._create_bookings(venues, options["bookings"], options["days"])
+            self._run(options["repeat"], options["days"])
+            transaction.set_rollback(True)
+
+    def _create_venues(self, count: int) -> list[Venue]:
+        category = Category.objects.create(name="Benchmark", slug="benchmark-availability")
+        Venue.objects.bulk_create(
+            Venue(
+                category=category,
+                name=f"Benchmark venue {index}",
+                slug=f"benchmark-venue-{index}",
+                description="Synthetic venue.",
+                location="Benchmark",
+                city=BENCHMARK_CITY,
+                price_per_hour=Decimal("100000"),
+                facilities="",
+            )
+            for index in range(count)
+        )
+        return list(Venue.objects.filter(city=BENCHMARK_CITY))
+
+    def _create_bookings(self, venues: list[Venue], count: int, days: int) -> None:
+        user = get_user_model().objects.create_user("benchmark-availability")
+        statuses = [status for status, _ in Booking.STATUS_CHOICES]
+        today = timezone.now().replace(hour=7, minute=0, second=0, microsecond=0)
+        started = time.perf_counter()
+        batch: list[Booking] = []
+        for _ in range(count):
+            start = today + timedelta(days=random.randrange(days))
+            batch.append(
+                Booking(
+                    user=user,
+                    venue=random.choice(venues),
+                    start_datetime=start,
+                    end_datetime=start + timedelta(hours=random.randint(1, 15)),
+                    status=random.choice(statuses),
+                )
+            )
+            if len(batch) == 5000:
+                Booking.objects.bulk_create(batch)
+                batch = []
+        Booking.objects.bulk_create(batch)
+        self.stdout.write(f"Inserted {count} bookings in {time.perf_counter() - started:.1f}s")
+
+    def _run(self, repeat: int, days: int) -> None:
+        queryset = Venue.objects.filter(city=BENCHMARK_CITY)
+        for span in (1, 7, 30):
+            start_date = timezone.localdate() + timedelta(days=random.randrange(max(days - span, 1)))
+            end_date = start_date + timedelta(days=span - 1)
+            timings = []
+            free = 0
+            for _ in range(repeat):
+                started = time.perf_counter()
+                free = len(list(exclude_reserved_venues(queryset, start_date, end_date).values_list("pk", flat=True)))
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(
+                f"{span:>2}-day window: {free} free venues, "
+                f"median {statistics.median(timings):.1f} ms, best {min(timings):.1f} ms"
+            )
@@ -0,0 +1,17 @@
+"""Rebuild the venue full-text search index from scratch."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from field_catalog.search import get_search_backend
+from field_management.models import Venue
+
+
+class Command(BaseCommand):
+    help = "Re-index every venue in the configured catalog search backend."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            get_search_backend().rebuild(Venue.objects.iterator())
+        self.stdout.write(self.style.SUCCESS(f"Indexed {Venue.objects.count()} venues."))
@@ -0,0 +1,17 @@
+"""Recompute the materialised venue popularity scores."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from field_catalog.popularity import recompute_popularity
+
+
+class Command(BaseCommand):
+    help = "Refresh Venue.popularity_score from bookings, wishlists and reviews. Schedule it periodically."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        updated = recompute_popularity(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Updated popularity for {updated} venues."))
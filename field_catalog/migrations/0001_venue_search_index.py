@@ -0,0 +1,67 @@
+from django.db import migrations
+
+# Frozen copy of the search index the backends in field_catalog.search created
+# when this migration was written, so later edits there cannot change it.
+SEARCH_FIELDS = ("name", "description", "location", "city", "facilities")
+SQLITE_TABLE = "field_catalog_venue_fts"
+POSTGRES_TABLE = "field_catalog_venue_search"
+POSTGRES_WEIGHTS = {"name": "A", "city": "B", "location": "B", "facilities": "C", "description": "D"}
+
+
+def _sqlite_index(schema_editor, rows):
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_TABLE} USING fts5("
+        f"{', '.join(SEARCH_FIELDS)}, "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    schema_editor.execute(f"DELETE FROM {SQLITE_TABLE}")
+    placeholders = ", ".join(["%s"] * (len(SEARCH_FIELDS) + 1))
+    for row in rows:
+        schema_editor.execute(
+            f"INSERT INTO {SQLITE_TABLE} (rowid, {', '.join(SEARCH_FIELDS)}) VALUES ({placeholders})", row
+        )
+
+
+def _postgres_index(schema_editor, rows):
+    schema_editor.execute(
+        f"CREATE TABLE IF NOT EXISTS {POSTGRES_TABLE} ("
+        "venue_id bigint PRIMARY KEY REFERENCES field_management_venue(id) ON DELETE CASCADE, "
+        "document tsvector NOT NULL)"
+    )
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {POSTGRES_TABLE}_document_idx ON {POSTGRES_TABLE} USING GIN (document)"
+    )
+    schema_editor.execute(f"DELETE FROM {POSTGRES_TABLE}")
+    document = " || ".join(
+        f"setweight(to_tsvector('simple', %s), '{POSTGRES_WEIGHTS[field]}')" for field in SEARCH_FIELDS
+    )
+    for row in rows:
+        schema_editor.execute(f"INSERT INTO {POSTGRES_TABLE} (venue_id, document) VALUES (%s, {document})", row)
+
+
+def create_search_index(apps, schema_editor):
+    Venue = apps.get_model("field_management", "Venue")
+    venues = Venue.objects.using(schema_editor.connection.alias).values_list("pk", *SEARCH_FIELDS)
+    rows = ([pk, *(value or "" for value in values)] for pk, *values in venues.iterator())
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _sqlite_index(schema_editor, rows)
+    elif vendor == "postgresql":
+        _postgres_index(schema_editor, rows)
+
+
+def drop_search_index(apps, schema_editor):
+    table = {"sqlite": SQLITE_TABLE, "postgresql": POSTGRES_TABLE}.get(schema_editor.connection.vendor)
+    if table:
+        schema_editor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("field_management", "0004_venue_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
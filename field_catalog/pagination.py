@@ -0,0 +1,99 @@
+"""Keyset pagination helpers for catalog APIs."""
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Field, Q, QuerySet
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+@dataclass
+class KeysetPage:
+    """A single page of results plus the token for the following page."""
+
+    items: list[Any]
+    next_cursor: str | None
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Serialise the sort key of the last row into an opaque URL-safe token."""
+
+    payload = json.dumps(list(values), cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, fields: Sequence[Field]) -> list[Any]:
+    """Return the sort key values stored in ``token``, converted to the types of ``fields``."""
+
+    padded = token + "=" * (-len(token) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise InvalidCursor("Malformed cursor.") from exc
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise InvalidCursor("Cursor does not match the requested ordering.")
+    try:
+        # Keyset columns are never null, and a nested value is no sort key.
+        if any(value is None or isinstance(value, (dict, list)) for value in values):
+            raise ValueError("Cursor values must be scalars.")
+        return [field.to_python(value) for field, value in zip(fields, values)]
+    except (ValidationError, TypeError, ValueError) as exc:
+        raise InvalidCursor("Cursor does not match the requested ordering.") from exc
+
+
+def _ordering_fields(queryset: QuerySet, ordering: Sequence[str]) -> list[Field]:
+    fields = []
+    for field in ordering:
+        name = field.lstrip("-")
+        annotation = queryset.query.annotations.get(name)
+        fields.append(annotation.output_field if annotation is not None else queryset.model._meta.get_field(name))
+    return fields
+
+
+def _keyset_filter(ordering: Sequence[str], values: Sequence[Any]) -> Q:
+    """Build ``(a, b, ...) > (x, y, ...)`` respecting each field's direction."""
+
+    condition = Q()
+    for position, field in enumerate(ordering):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        clause = Q(**{f"{name}__{lookup}": values[position]})
+        for previous_field, previous_value in zip(ordering[:position], values[:position]):
+            clause &= Q(**{previous_field.lstrip("-"): previous_value})
+        condition |= clause
+    return condition
+
+
+def paginate_keyset(
+    queryset: QuerySet,
+    *,
+    ordering: Sequence[str],
+    page_size: int,
+    cursor: str | None = None,
+) -> KeysetPage:
+    """Return one page of ``queryset`` ordered by ``ordering`` after ``cursor``.
+
+    ``ordering`` must end with a unique column (usually ``id``) so that the
+    keyset is total and no row is skipped or repeated between pages.
+    """
+
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor, _ordering_fields(queryset, ordering))
+        queryset = queryset.filter(_keyset_filter(ordering, values))
+
+    rows = list(queryset[: page_size + 1])
+    items = rows[:page_size]
+    next_cursor = None
+    if len(rows) > page_size:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, field.lstrip("-")) for field in ordering])
+    return KeysetPage(items=items, next_cursor=next_cursor)
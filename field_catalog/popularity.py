@@ -0,0 +1,90 @@
+"""Materialised venue popularity ranking.
+
+``recompute_popularity`` aggregates bookings, wishlists and reviews with a
+handful of grouped queries and stores the result on
+``Venue.popularity_score`` so the home page can read the top venues from an
+index instead of grouping the whole bookings table on every request. Besides
+the scheduled command, new bookings queue a coalesced ``catalog.popularity``
+job so the ranking follows demand between runs.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+
+from django.conf import settings
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from field_booking import jobs
+from field_booking.models import Booking
+from field_management.models import Venue
+from user_interactions.models import Review, Wishlist
+
+
+POPULARITY_JOB = "catalog.popularity"
+
+
+def _decay(age_days: int, half_life_days: float | None) -> float:
+    if not half_life_days:
+        return 1.0
+    return 0.5 ** (max(age_days, 0) / half_life_days)
+
+
+def compute_popularity_scores(today: date | None = None) -> dict[int, float]:
+    """Return the popularity score of every venue with any activity."""
+
+    today = today or timezone.localdate()
+    half_life = settings.POPULARITY_HALF_LIFE_DAYS
+    scores: dict[int, float] = defaultdict(float)
+
+    bookings_per_day = (
+        Booking.objects.filter(status__in=Booking.COUNTED_STATUSES)
+        .annotate(day=TruncDate("created_at"))
+        .values("venue_id", "day")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for row in bookings_per_day.iterator():
+        scores[row["venue_id"]] += row["total"] * _decay((today - row["day"]).days, half_life)
+
+    weighted_sources = (
+        (Wishlist, settings.POPULARITY_WISHLIST_WEIGHT),
+        (Review, settings.POPULARITY_REVIEW_WEIGHT),
+    )
+    for model, weight in weighted_sources:
+        if not weight:
+            continue
+        counts = model.objects.values("venue_id").annotate(total=Count("id")).order_by()
+        for row in counts.iterator():
+            scores[row["venue_id"]] += row["total"] * weight
+    return dict(scores)
+
+
+def recompute_popularity(batch_size: int = 500) -> int:
+    """Persist fresh popularity scores, writing only venues whose score changed."""
+
+    scores = compute_popularity_scores()
+    changed = [
+        Venue(pk=venue_id, popularity_score=round(scores.get(venue_id, 0.0), 6))
+        for venue_id, current in Venue.objects.values_list("pk", "popularity_score").iterator()
+        if abs(current - round(scores.get(venue_id, 0.0), 6)) > 1e-9
+    ]
+    Venue.objects.bulk_update(changed, ["popularity_score"], batch_size=batch_size)
+    return len(changed)
+
+
+def popular_venues(limit: int = 3):
+    """Top venues by the materialised score, served from ``venue_popularity_idx``."""
+
+    return (
+        Venue.objects.select_related("category")
+        .order_by("-popularity_score", "name")
+        .prefetch_related("addons")[:limit]
+    )
+
+
+@jobs.job(POPULARITY_JOB, concurrency=1, priority=jobs.PRIORITY_LOW)
+def recompute_popularity_job() -> None:
+    recompute_popularity()
@@ -0,0 +1,183 @@
+"""Full-text search over the venue catalog.
+
+Each backend keeps a side index of the searchable venue columns and exposes
+``apply`` which narrows a ``Venue`` queryset to the matches and annotates a
+``search_rank`` where lower values are better matches. Matching always goes
+through the engine's full-text index; there is no ``icontains`` fallback.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Iterable
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import FloatField, QuerySet
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+SEARCH_FIELDS: tuple[str, ...] = ("name", "description", "location", "city", "facilities")
+
+# Guard against pathological queries turning into huge match expressions.
+MAX_QUERY_TERMS = 8
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize_query(query: str) -> list[str]:
+    """Split free text into lower-cased word terms safe to embed in a match expression."""
+
+    return _TERM_PATTERN.findall((query or "").lower())[:MAX_QUERY_TERMS]
+
+
+class BaseSearchBackend:
+    """Interface shared by the venue search backends."""
+
+    table_name = "field_catalog_venue_search"
+
+    def create_index(self, schema_editor) -> None:
+        raise NotImplementedError
+
+    def drop_index(self, schema_editor) -> None:
+        raise NotImplementedError
+
+    def index_venue(self, venue) -> None:
+        raise NotImplementedError
+
+    def remove_venue(self, venue_id: int) -> None:
+        raise NotImplementedError
+
+    def apply(self, queryset: QuerySet, query: str) -> QuerySet:
+        raise NotImplementedError
+
+    def rebuild(self, venues: Iterable) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table_name}")
+        for venue in venues:
+            self.index_venue(venue)
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """Search backed by an SQLite FTS5 virtual table keyed by the venue id."""
+
+    table_name = "field_catalog_venue_fts"
+    # bm25 column weights, in ``SEARCH_FIELDS`` order.
+    column_weights = (10.0, 1.0, 3.0, 5.0, 2.0)
+
+    def create_index(self, schema_editor) -> None:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table_name} USING fts5("
+            f"{', '.join(SEARCH_FIELDS)}, "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+
+    def drop_index(self, schema_editor) -> None:
+        schema_editor.execute(f"DROP TABLE IF EXISTS {self.table_name}")
+
+    def index_venue(self, venue) -> None:
+        columns = ", ".join(SEARCH_FIELDS)
+        placeholders = ", ".join(["%s"] * (len(SEARCH_FIELDS) + 1))
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table_name} WHERE rowid = %s", [venue.pk])
+            cursor.execute(
+                f"INSERT INTO {self.table_name} (rowid, {columns}) VALUES ({placeholders})",
+                [venue.pk, *[getattr(venue, field) or "" for field in SEARCH_FIELDS]],
+            )
+
+    def remove_venue(self, venue_id: int) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table_name} WHERE rowid = %s", [venue_id])
+
+    def apply(self, queryset: QuerySet, query: str) -> QuerySet:
+        terms = tokenize_query(query)
+        if not terms:
+            return queryset
+        expression = " ".join(f'"{term}"*' for term in terms)
+        venue_table = queryset.model._meta.db_table
+        weights = ", ".join(str(weight) for weight in self.column_weights)
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {self.table_name} WHERE {self.table_name} MATCH %s",
+                [expression],
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT bm25({self.table_name}, {weights}) FROM {self.table_name} "
+                f"WHERE {self.table_name} MATCH %s AND rowid = {venue_table}.id",
+                [expression],
+                output_field=FloatField(),
+            )
+        )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Search backed by a weighted ``tsvector`` column with a GIN index."""
+
+    config = "simple"
+
+    def create_index(self, schema_editor) -> None:
+        schema_editor.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table_name} ("
+            "venue_id bigint PRIMARY KEY REFERENCES field_management_venue(id) ON DELETE CASCADE, "
+            "document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.table_name}_document_idx "
+            f"ON {self.table_name} USING GIN (document)"
+        )
+
+    def drop_index(self, schema_editor) -> None:
+        schema_editor.execute(f"DROP TABLE IF EXISTS {self.table_name}")
+
+    def index_venue(self, venue) -> None:
+        weights = {"name": "A", "city": "B", "location": "B", "facilities": "C", "description": "D"}
+        document = " || ".join(
+            f"setweight(to_tsvector('{self.config}', %s), '{weights[field]}')" for field in SEARCH_FIELDS
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.table_name} (venue_id, document) VALUES (%s, {document}) "
+                "ON CONFLICT (venue_id) DO UPDATE SET document = EXCLUDED.document",
+                [venue.pk, *[getattr(venue, field) or "" for field in SEARCH_FIELDS]],
+            )
+
+    def remove_venue(self, venue_id: int) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table_name} WHERE venue_id = %s", [venue_id])
+
+    def apply(self, queryset: QuerySet, query: str) -> QuerySet:
+        terms = tokenize_query(query)
+        if not terms:
+            return queryset
+        expression = " & ".join(f"{term}:*" for term in terms)
+        venue_table = queryset.model._meta.db_table
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT venue_id FROM {self.table_name} "
+                f"WHERE document @@ to_tsquery('{self.config}', %s)",
+                [expression],
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT -ts_rank(document, to_tsquery('{self.config}', %s)) FROM {self.table_name} "
+                f"WHERE venue_id = {venue_table}.id",
+                [expression],
+                output_field=FloatField(),
+            )
+        )
+
+
+@lru_cache(maxsize=None)
+def get_search_backend() -> BaseSearchBackend:
+    """Return the configured backend instance."""
+
+    return import_string(settings.CATALOG_SEARCH_BACKEND)()
+
+
+def search_venues(queryset: QuerySet, query: str) -> QuerySet:
+    """Restrict ``queryset`` to venues matching ``query``, best matches first."""
+
+    if not tokenize_query(query):
+        return queryset
+    return get_search_backend().apply(queryset, query).order_by("search_rank", "id")
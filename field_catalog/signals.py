@@ -0,0 +1,37 @@
+"""Signals keeping the venue search index and choice registry in sync."""
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from field_management.models import Category, Venue
+
+from . import choices
+from .search import get_search_backend
+
+
+@receiver(post_save, sender=Venue)
+def index_venue_on_save(sender, instance: Venue, **kwargs):
+    """Refresh the search document whenever a venue is saved."""
+
+    get_search_backend().index_venue(instance)
+
+
+@receiver(post_delete, sender=Venue)
+def remove_venue_from_index(sender, instance: Venue, **kwargs):
+    """Drop the search document of a deleted venue."""
+
+    get_search_backend().remove_venue(instance.pk)
+
+
+@receiver(post_save, sender=Venue)
+@receiver(post_delete, sender=Venue)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_filter_choices(sender, **kwargs):
+    """Rebuild the city/category dropdowns after venues or categories change."""
+
+    choices.invalidate()
+    # Invalidate again once committed so no other process caches pre-commit rows.
+    transaction.on_commit(choices.invalidate)
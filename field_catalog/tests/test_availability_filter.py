@@ -0,0 +1,108 @@
+"""Tests for the catalog date-range availability filter."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from field_booking.models import Booking
+from field_catalog import choices
+from field_catalog.filters import VenueFilter
+from field_management.models import Category, Venue
+
+
+class AvailabilityFilterTests(TestCase):
+    """Ensure venues with overlapping active bookings are excluded."""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="planner", password="secret123")
+        category = Category.objects.create(name="Arena")
+        self.free, self.booked, self.cancelled = (
+            Venue.objects.create(
+                category=category,
+                name=name,
+                description="Court.",
+                location="Downtown",
+                city="Jakarta",
+                price_per_hour=Decimal("100000.00"),
+                facilities="Lighting",
+            )
+            for name in ("Free Court", "Booked Court", "Cancelled Court")
+        )
+        self.start_date = timezone.localdate() + timedelta(days=10)
+        self._book(self.booked, self.start_date + timedelta(days=2), Booking.STATUS_ACTIVE)
+        self._book(self.cancelled, self.start_date + timedelta(days=2), Booking.STATUS_CANCELLED)
+
+    def _book(self, venue: Venue, day, status: str) -> Booking:
+        start = timezone.make_aware(datetime.combine(day, time(9, 0)))
+        return Booking.objects.create(
+            user=self.user,
+            venue=venue,
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=2),
+            status=status,
+        )
+
+    def _names(self, data: dict[str, str]) -> set[str]:
+        return {venue.name for venue in VenueFilter(data).qs}
+
+    def test_overlapping_active_bookings_are_excluded(self) -> None:
+        names = self._names(
+            {
+                "available_from": self.start_date.isoformat(),
+                "available_to": (self.start_date + timedelta(days=3)).isoformat(),
+            }
+        )
+
+        self.assertEqual(names, {"Free Court", "Cancelled Court"})
+
+    def test_window_outside_bookings_keeps_every_venue(self) -> None:
+        names = self._names(
+            {
+                "available_from": self.start_date.isoformat(),
+                "available_to": (self.start_date + timedelta(days=1)).isoformat(),
+            }
+        )
+
+        self.assertEqual(names, {"Free Court", "Booked Court", "Cancelled Court"})
+
+    def test_single_date_is_treated_as_one_day(self) -> None:
+        names = self._names({"available_to": (self.start_date + timedelta(days=2)).isoformat()})
+
+        self.assertNotIn("Booked Court", names)
+
+    def test_filter_api_uses_single_anti_join(self) -> None:
+        self.client.force_login(self.user)
+        params = {
+            "available_from": self.start_date.isoformat(),
+            "available_to": (self.start_date + timedelta(days=5)).isoformat(),
+        }
+
+        choices.get_snapshot()
+        with CaptureQueriesContext(connection) as queries:
+            payload = self.client.get(reverse("catalog-filter"), params).json()
+
+        venue_queries = [
+            query["sql"] for query in queries.captured_queries if 'FROM "field_management_venue"' in query["sql"]
+        ]
+        self.assertEqual(len(venue_queries), 1)
+        self.assertIn("NOT (EXISTS", venue_queries[0].upper())
+        self.assertEqual({venue["name"] for venue in payload["venues"]}, {"Free Court", "Cancelled Court"})
+
+    def test_dates_beyond_the_booking_horizon_are_form_errors(self) -> None:
+        self.client.force_login(self.user)
+        params = {"available_from": "9999-12-31", "available_to": "9999-12-31"}
+
+        response = self.client.get(reverse("catalog-filter"), params)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("available_from", response.json()["errors"])
+
+        response = self.client.get(reverse("catalog"), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Dates must fall between")
@@ -0,0 +1,94 @@
+"""Tests for the keyset-paginated catalog filter API."""
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from field_catalog.pagination import encode_cursor
+from field_management.models import Category, Venue
+
+
+@override_settings(CATALOG_FILTER_PAGE_SIZE=2, CATALOG_FILTER_MAX_PAGE_SIZE=3)
+class CatalogFilterPaginationTests(TestCase):
+    """Ensure the filter endpoint returns bounded pages linked by cursors."""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="catalog-user",
+            password="secret123",
+        )
+        self.category = Category.objects.create(name="Futsal Court")
+        for index, (name, city) in enumerate(
+            [
+                ("Alpha Court", "Jakarta"),
+                ("Bravo Court", "Jakarta"),
+                ("Bravo Court", "Jakarta"),
+                ("Charlie Court", "Bandung"),
+                ("Delta Court", "Jakarta"),
+            ]
+        ):
+            Venue.objects.create(
+                category=self.category,
+                name=name,
+                slug=f"venue-{index}",
+                description="Indoor court.",
+                location="Downtown",
+                city=city,
+                price_per_hour=Decimal("100000.00") + index,
+                facilities="Lighting",
+            )
+        self.client.force_login(self.user)
+
+    def _collect_pages(self, params: dict[str, str]) -> list[list[int]]:
+        pages: list[list[int]] = []
+        cursor = None
+        while True:
+            query = dict(params)
+            if cursor:
+                query["cursor"] = cursor
+            payload = self.client.get(reverse("catalog-filter"), query).json()
+            pages.append([venue["id"] for venue in payload["venues"]])
+            cursor = payload["next_cursor"]
+            if cursor is None:
+                return pages
+
+    def test_pages_cover_every_venue_exactly_once(self) -> None:
+        pages = self._collect_pages({})
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        collected = [venue_id for page in pages for venue_id in page]
+        expected = list(Venue.objects.order_by("name", "id").values_list("id", flat=True))
+        self.assertEqual(collected, expected)
+
+    def test_pagination_respects_filters_and_sort(self) -> None:
+        pages = self._collect_pages({"city": "Jakarta", "sort": "-price"})
+
+        collected = [venue_id for page in pages for venue_id in page]
+        expected = list(
+            Venue.objects.filter(city="Jakarta")
+            .order_by("-price_per_hour", "-id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(collected, expected)
+
+    def test_page_size_is_capped(self) -> None:
+        payload = self.client.get(reverse("catalog-filter"), {"page_size": "500"}).json()
+
+        self.assertEqual(len(payload["venues"]), 3)
+        self.assertIsNotNone(payload["next_cursor"])
+
+    def test_invalid_cursor_returns_bad_request(self) -> None:
+        response = self.client.get(reverse("catalog-filter"), {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_values_of_the_wrong_type_return_bad_request(self) -> None:
+        for values in (["abc", "x"], [None, None], [{"price": 1}, 2], [[1], 2]):
+            with self.subTest(values=values):
+                params = {"sort": "price", "cursor": encode_cursor(values)}
+                response = self.client.get(reverse("catalog-filter"), params)
+
+                self.assertEqual(response.status_code, 400)
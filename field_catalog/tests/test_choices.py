@@ -0,0 +1,65 @@
+"""Tests for the cached city and category choice registry."""
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from field_catalog.filters import VenueFilter
+from field_catalog.forms import SearchFilterForm
+from field_management.models import Category, Venue
+
+
+class ChoiceRegistryTests(TestCase):
+    """Ensure filter forms read choices from the registry without queries."""
+
+    def setUp(self) -> None:
+        self.category, _ = Category.objects.get_or_create(slug="futsal", defaults={"name": "Futsal"})
+        self._create_venue("Garuda Arena", "Bogor")
+
+    def _create_venue(self, name: str, city: str) -> Venue:
+        return Venue.objects.create(
+            category=self.category,
+            name=name,
+            description="Indoor court.",
+            location="Downtown",
+            city=city,
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+        )
+
+    def test_forms_build_without_queries_once_warm(self) -> None:
+        SearchFilterForm()
+
+        with CaptureQueriesContext(connection) as queries:
+            search_form = SearchFilterForm()
+            venue_filter = VenueFilter({})
+            str(search_form["city"])
+            str(venue_filter.form["category"])
+
+        self.assertEqual(len(queries.captured_queries), 0)
+        self.assertIn(("Bogor", "Bogor"), search_form.fields["city"].choices)
+        self.assertIn((str(self.category.pk), "Futsal"), list(venue_filter.form.fields["category"].choices))
+
+    def test_registry_rebuilds_after_venue_and_category_changes(self) -> None:
+        SearchFilterForm()
+
+        self._create_venue("Cendana Court", "Cirebon")
+        self.category.name = "Futsal Indoor"
+        self.category.save()
+
+        form = SearchFilterForm()
+        self.assertIn(("Cirebon", "Cirebon"), form.fields["city"].choices)
+        self.assertIn((str(self.category.pk), "Futsal Indoor"), form.fields["category"].choices)
+
+    def test_category_filter_accepts_registry_values(self) -> None:
+        other = Category.objects.get(slug="padel")
+        venue = self._create_venue("Padel Point", "Bogor")
+        venue.category = other
+        venue.save()
+
+        venue_filter = VenueFilter({"category": str(other.pk)})
+
+        self.assertEqual(list(venue_filter.qs), [venue])
@@ -0,0 +1,111 @@
+"""Tests ensuring global context processors stay lazy."""
+from __future__ import annotations
+
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from field_catalog import choices
+from field_management.models import Category, Venue
+from user_interactions.models import Wishlist
+
+GLOBAL_PROCESSORS = (
+    "field_catalog.context_processors.global_filters",
+    "accounts.context_processors.csrf_token_context",
+)
+
+
+def _templates_without_global_processors() -> list[dict]:
+    templates = [dict(engine) for engine in settings.TEMPLATES]
+    for engine in templates:
+        options = dict(engine.get("OPTIONS", {}))
+        options["context_processors"] = [
+            processor
+            for processor in options.get("context_processors", [])
+            if processor not in GLOBAL_PROCESSORS
+        ]
+        engine["OPTIONS"] = options
+    return templates
+
+
+class LazyContextProcessorTests(TestCase):
+    """Pages must not pay for global context they never render."""
+
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.user = user_model.objects.create_user(username="lazy-user", password="secret123")
+        self.admin = user_model.objects.create_user(
+            username="lazy-admin", password="secret123", is_staff=True
+        )
+        category = Category.objects.create(name="Futsal Court")
+        self.venue = Venue.objects.create(
+            category=category,
+            name="Downtown Arena",
+            description="Indoor futsal court.",
+            location="Downtown",
+            city="Jakarta",
+            price_per_hour=Decimal("150000.00"),
+            facilities="Locker room",
+        )
+
+    def _count_queries(self, method: str, url: str, **extra) -> int:
+        # Each run starts without a wishlist entry so toggles always render the card partial.
+        Wishlist.objects.all().delete()
+        # A cold registry makes any eager form construction visible as queries.
+        choices.invalidate()
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, **extra)
+        self.assertLess(response.status_code, 400)
+        return len(queries.captured_queries)
+
+    def _assert_processors_are_free(self, user, method: str, url: str, **extra) -> None:
+        if user is not None:
+            self.client.force_login(user)
+        with_processors = self._count_queries(method, url, **extra)
+        with override_settings(TEMPLATES=_templates_without_global_processors()):
+            without_processors = self._count_queries(method, url, **extra)
+        self.assertEqual(with_processors, without_processors, url)
+
+    def test_login_page_pays_nothing_for_unused_processors(self) -> None:
+        self._assert_processors_are_free(None, "get", reverse("auth:login"))
+
+    def test_admin_workspace_pays_nothing_for_unused_processors(self) -> None:
+        self._assert_processors_are_free(self.admin, "get", reverse("admin-dashboard"))
+
+    def test_wishlist_partial_pays_nothing_for_unused_processors(self) -> None:
+        url = reverse("wishlist-toggle-api", args=[self.venue.pk])
+        self._assert_processors_are_free(
+            self.user,
+            "post",
+            url,
+            content_type="application/json",
+            data="{}",
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+
+    def test_partials_do_not_build_form_or_token(self) -> None:
+        self.client.force_login(self.user)
+        with patch("field_catalog.context_processors.SearchFilterForm") as form_class, patch(
+            "accounts.context_processors.get_token"
+        ) as get_token:
+            self.client.post(
+                reverse("wishlist-toggle-api", args=[self.venue.pk]),
+                data="{}",
+                content_type="application/json",
+                HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+            )
+        form_class.assert_not_called()
+        get_token.assert_not_called()
+
+    def test_home_page_still_renders_global_form(self) -> None:
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("home"))
+
+        self.assertContains(response, '<option value="Jakarta"')
@@ -0,0 +1,85 @@
+"""Tests for the catalog facet counts."""
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from field_catalog.facets import build_facets
+from field_catalog.filters import VenueFilter
+from field_management.models import Category, Venue
+
+
+class CatalogFacetTests(TestCase):
+    """Ensure facet counts respect the other active filters."""
+
+    def setUp(self) -> None:
+        self.futsal = Category.objects.get(slug="futsal")
+        self.padel = Category.objects.get(slug="padel")
+        self._create_venue("Alpha", "Jakarta", self.futsal, "80000")
+        self._create_venue("Bravo", "Jakarta", self.padel, "150000")
+        self._create_venue("Charlie", "Bandung", self.futsal, "250000")
+        self._create_venue("Delta", "Bandung", self.futsal, "90000")
+
+    def _create_venue(self, name: str, city: str, category: Category, price: str) -> Venue:
+        return Venue.objects.create(
+            category=category,
+            name=name,
+            description="Indoor court.",
+            location="Downtown",
+            city=city,
+            price_per_hour=Decimal(price),
+            facilities="Lighting",
+        )
+
+    def _facets(self, query: str) -> dict[str, dict[str, int]]:
+        params = QueryDict(query)
+        facets = build_facets(VenueFilter(params), params)
+        return {name: {item.value: item.count for item in items} for name, items in facets.items()}
+
+    def test_counts_without_filters(self) -> None:
+        facets = self._facets("")
+
+        self.assertEqual(facets["city"], {"Bandung": 2, "Jakarta": 2})
+        self.assertEqual(facets["category"][str(self.futsal.pk)], 3)
+        self.assertEqual(facets["category"][str(self.padel.pk)], 1)
+        self.assertEqual(facets["price_band"], {"0": 2, "1": 1, "2": 1, "3": 0})
+
+    def test_each_facet_ignores_only_its_own_selection(self) -> None:
+        facets = self._facets(f"city=Bandung&category={self.futsal.pk}&max_price=100000")
+
+        self.assertEqual(facets["city"], {"Bandung": 1, "Jakarta": 1})
+        self.assertEqual(facets["category"][str(self.futsal.pk)], 1)
+        self.assertEqual(facets["category"][str(self.padel.pk)], 0)
+        self.assertEqual(facets["price_band"], {"0": 1, "1": 0, "2": 1, "3": 0})
+
+    def test_counts_use_one_query_and_are_cached(self) -> None:
+        self._facets("city=Jakarta")  # warm the choice registry
+
+        with CaptureQueriesContext(connection) as first:
+            self._facets("city=Bandung")
+        with CaptureQueriesContext(connection) as second:
+            self._facets("city=Bandung")
+
+        self.assertEqual(len(first.captured_queries), 1)
+        self.assertEqual(len(second.captured_queries), 0)
+
+    def test_counts_refresh_after_venue_changes(self) -> None:
+        self._facets("")
+        self._create_venue("Echo", "Jakarta", self.padel, "500000")
+
+        self.assertEqual(self._facets("")["city"]["Jakarta"], 3)
+
+    def test_catalog_page_renders_facets(self) -> None:
+        user = get_user_model().objects.create_user(username="facet-user", password="secret123")
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("catalog"), {"city": "Jakarta"})
+
+        self.assertContains(response, 'id="catalog-facets"')
+        self.assertContains(response, "?city=Bandung")
@@ -0,0 +1,87 @@
+"""Tests for the materialised popularity ranking."""
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from field_booking.models import Booking
+from field_management.models import Category, Venue
+from user_interactions.models import Wishlist
+
+
+@override_settings(POPULARITY_HALF_LIFE_DAYS=None, POPULARITY_WISHLIST_WEIGHT=0.5)
+class PopularityRankingTests(TestCase):
+    """Ensure the home page reads the persisted ranking."""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="fan", password="secret123")
+        category = Category.objects.create(name="Arena")
+        self.quiet, self.busy, self.loved = (
+            Venue.objects.create(
+                category=category,
+                name=name,
+                description="Court.",
+                location="Downtown",
+                city="Jakarta",
+                price_per_hour=Decimal("100000.00"),
+                facilities="Lighting",
+            )
+            for name in ("Quiet Court", "Busy Court", "Loved Court")
+        )
+
+    def _book(self, venue: Venue, status: str = Booking.STATUS_PENDING) -> Booking:
+        start = timezone.now() + timedelta(days=1)
+        return Booking.objects.create(
+            user=self.user,
+            venue=venue,
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=2),
+            status=status,
+        )
+
+    def test_recompute_orders_by_weighted_activity(self) -> None:
+        self._book(self.busy)
+        self._book(self.busy)
+        self._book(self.quiet, status=Booking.STATUS_CANCELLED)
+        self._book(self.quiet, status=Booking.STATUS_EXPIRED)
+        self._book(self.loved, status=Booking.STATUS_COMPLETED)
+        Wishlist.objects.create(user=self.user, venue=self.loved)
+
+        call_command("recompute_popularity", stdout=StringIO())
+
+        self.busy.refresh_from_db()
+        self.loved.refresh_from_db()
+        self.quiet.refresh_from_db()
+        self.assertEqual(self.busy.popularity_score, 2)
+        self.assertEqual(self.loved.popularity_score, 1.5)
+        self.assertEqual(self.quiet.popularity_score, 0)
+
+    @override_settings(POPULARITY_HALF_LIFE_DAYS=10, POPULARITY_WISHLIST_WEIGHT=0)
+    def test_old_bookings_decay(self) -> None:
+        old = self._book(self.quiet)
+        Booking.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=10))
+        self._book(self.busy)
+
+        call_command("recompute_popularity", stdout=StringIO())
+
+        self.quiet.refresh_from_db()
+        self.assertAlmostEqual(self.quiet.popularity_score, 0.5, places=2)
+
+    def test_home_page_uses_persisted_score_without_booking_join(self) -> None:
+        Venue.objects.filter(pk=self.quiet.pk).update(popularity_score=9)
+        self.client.force_login(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("home"))
+
+        self.assertFalse(any("field_booking_booking" in query["sql"] for query in queries.captured_queries))
+        self.assertEqual(list(response.context["popular_venues"])[0], self.quiet)
@@ -0,0 +1,84 @@
+"""Tests for the venue full-text search index."""
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from field_catalog.search import search_venues
+from field_management.models import Category, Venue
+
+
+class VenueSearchTests(TestCase):
+    """Ensure search stays in sync with venues and ranks matches."""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="searcher", password="secret123")
+        self.category = Category.objects.create(name="Futsal Court")
+        self.futsal = self._create_venue("Garuda Futsal Arena", "Jakarta", "Premium futsal pitch.")
+        self.padel = self._create_venue("Senayan Padel Club", "Jakarta", "Covered padel courts, futsal nearby.")
+        self.pool = self._create_venue("Bandung Billiard Hall", "Bandung", "Eight tables.")
+
+    def _create_venue(self, name: str, city: str, description: str) -> Venue:
+        return Venue.objects.create(
+            category=self.category,
+            name=name,
+            description=description,
+            location="Downtown",
+            city=city,
+            price_per_hour=Decimal("100000.00"),
+            facilities="Locker room, Shower",
+        )
+
+    def test_name_matches_rank_above_description_matches(self) -> None:
+        results = list(search_venues(Venue.objects.all(), "futsal"))
+
+        self.assertEqual(results, [self.futsal, self.padel])
+
+    def test_prefix_and_multi_term_queries(self) -> None:
+        self.assertEqual(list(search_venues(Venue.objects.all(), "band bill")), [self.pool])
+
+    def test_index_follows_updates_and_deletes(self) -> None:
+        self.pool.description = "Eight tables and a futsal cage."
+        self.pool.save()
+        self.assertIn(self.pool, search_venues(Venue.objects.all(), "futsal"))
+
+        self.futsal.delete()
+        self.assertEqual(list(search_venues(Venue.objects.all(), "garuda")), [])
+
+    def test_search_never_uses_like_scans(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            list(search_venues(Venue.objects.all(), "futsal"))
+
+        self.assertTrue(all("LIKE" not in query["sql"].upper() for query in queries.captured_queries))
+
+    def test_catalog_filter_returns_ranked_results(self) -> None:
+        self.client.force_login(self.user)
+
+        payload = self.client.get(reverse("catalog-filter"), {"q": "futsal"}).json()
+
+        self.assertEqual([venue["id"] for venue in payload["venues"]], [self.futsal.pk, self.padel.pk])
+
+    @override_settings(CATALOG_FILTER_PAGE_SIZE=1)
+    def test_ranked_results_paginate_by_cursor(self) -> None:
+        self.client.force_login(self.user)
+
+        first = self.client.get(reverse("catalog-filter"), {"q": "futsal"}).json()
+        second = self.client.get(
+            reverse("catalog-filter"), {"q": "futsal", "cursor": first["next_cursor"]}
+        ).json()
+
+        self.assertEqual([venue["id"] for venue in first["venues"]], [self.futsal.pk])
+        self.assertEqual([venue["id"] for venue in second["venues"]], [self.padel.pk])
+        self.assertIsNone(second["next_cursor"])
+
+    def test_catalog_view_accepts_query(self) -> None:
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("catalog"), {"q": "billiard"})
+
+        self.assertEqual(list(response.context["venues"]), [self.pool])
@@ -1,11 +1,14 @@
 """Public catalog URLs."""
 from django.urls import path
 
-from .views import CatalogView, HomeView, VenueDetailView, catalog_filter
+from .views import CatalogView, HomeView, VenueDetailView, catalog_filter, venue_availability, venue_hold, venue_slots
 
 urlpatterns = [
     path("", HomeView.as_view(), name="home"),
     path("catalog/", CatalogView.as_view(), name="catalog"),
     path("api/catalog/filter/", catalog_filter, name="catalog-filter"),
+    path("api/venues/<slug:slug>/availability/", venue_availability, name="venue-availability"),
+    path("api/venues/<slug:slug>/holds/", venue_hold, name="venue-hold"),
+    path("api/venues/<slug:slug>/slots/", venue_slots, name="venue-slots"),
     path("venue/<slug:slug>/", VenueDetailView.as_view(), name="venue-detail"),
 ]
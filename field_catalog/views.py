@@ -4,25 +4,36 @@ from __future__ import annotations
 from datetime import date, timedelta
 from typing import Any
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.core.exceptions import ValidationError
 from django.http import HttpRequest, HttpResponse, JsonResponse
-from django.shortcuts import redirect
+from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.text import Truncator
+from django.views.decorators.http import require_POST
 from django.views.generic import DetailView, ListView, TemplateView
 
 from accounts.mixins import EnsureCsrfCookieMixin
+from field_booking.availability import booking_horizon
+from field_booking.availability_cache import month_availability, month_label, parse_month
 from field_booking.forms import BookingForm
+from field_booking.idempotency import idempotent
 from field_booking.models import Booking
+from field_booking.reservations import place_hold, reserve_booking
+from field_booking.slots import SLOT_LENGTH, venue_day_slots, with_live_holds
 from field_management.models import Venue
 from user_interactions.forms import ReviewForm
 from user_interactions.models import Review, Wishlist
 
+from .facets import build_facets
 from .filters import VenueFilter
+from .pagination import InvalidCursor, paginate_keyset
+from .popularity import popular_venues
+from .search import tokenize_query
 
 
 class HomeView(EnsureCsrfCookieMixin, TemplateView):
@@ -31,11 +42,6 @@ class HomeView(EnsureCsrfCookieMixin, TemplateView):
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
         venue_filter = VenueFilter(self.request.GET, queryset=Venue.objects.all())
-        popular_venues = (
-            Venue.objects.annotate(bookings_count=Count("bookings"))
-            .order_by("-bookings_count")
-            .prefetch_related("addons")[:3]
-        )
         wishlist_ids: set[int] = set()
         if self.request.user.is_authenticated:
             wishlist_ids = set(
@@ -45,7 +51,7 @@ class HomeView(EnsureCsrfCookieMixin, TemplateView):
             {
                 "filter": venue_filter,
                 "venues": venue_filter.qs[:6],
-                "popular_venues": popular_venues,
+                "popular_venues": popular_venues(),
                 "wishlist_ids": wishlist_ids,
             }
         )
@@ -66,15 +72,52 @@ class CatalogView(EnsureCsrfCookieMixin, LoginRequiredMixin, ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["filter"] = self.filterset
+        context["facets"] = build_facets(self.filterset, self.request.GET)
         context["wishlist_ids"] = set(
             Wishlist.objects.filter(user=self.request.user).values_list("venue_id", flat=True)
         )
         return context
 
 
+CATALOG_SORT_ORDERINGS: dict[str, tuple[str, ...]] = {
+    "name": ("name", "id"),
+    "price": ("price_per_hour", "id"),
+    "-price": ("-price_per_hour", "-id"),
+}
+SEARCH_ORDERING: tuple[str, ...] = ("search_rank", "id")
+SLOT_QUERY_MAX_DAYS = 31
+# Hold refusals that are not conflicts with someone else's booking or hold.
+HOLD_ERROR_STATUSES = {"hold_too_long": 400, "too_many_holds": 429}
+
+
+def _resolve_page_size(raw_value: str | None) -> int:
+    default = settings.CATALOG_FILTER_PAGE_SIZE
+    maximum = settings.CATALOG_FILTER_MAX_PAGE_SIZE
+    try:
+        page_size = int(raw_value) if raw_value else default
+    except (TypeError, ValueError):
+        page_size = default
+    return max(1, min(page_size, maximum))
+
+
 @login_required
 def catalog_filter(request: HttpRequest) -> JsonResponse:
-    filterset = VenueFilter(request.GET, queryset=Venue.objects.all())
+    filterset = VenueFilter(request.GET, queryset=Venue.objects.select_related("category"))
+    date_errors = {name: errors for name, errors in filterset.errors.items() if name.startswith("available_")}
+    if date_errors:
+        return JsonResponse({"error": "Please pick valid dates.", "errors": date_errors}, status=400)
+    ordering = CATALOG_SORT_ORDERINGS.get(request.GET.get("sort", ""))
+    if ordering is None:
+        ordering = SEARCH_ORDERING if tokenize_query(request.GET.get("q", "")) else CATALOG_SORT_ORDERINGS["name"]
+    try:
+        page = paginate_keyset(
+            filterset.qs,
+            ordering=ordering,
+            page_size=_resolve_page_size(request.GET.get("page_size")),
+            cursor=request.GET.get("cursor") or None,
+        )
+    except InvalidCursor as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
     wishlist_ids = set(
         Wishlist.objects.filter(user=request.user).values_list("venue_id", flat=True)
     )
@@ -91,9 +134,70 @@ def catalog_filter(request: HttpRequest) -> JsonResponse:
             "wishlisted": venue.id in wishlist_ids,
             "toggle_url": reverse("wishlist-toggle-api", args=[venue.id]),
         }
-        for venue in filterset.qs
+        for venue in page.items
     ]
-    return JsonResponse({"venues": rendered_cards})
+    return JsonResponse({"venues": rendered_cards, "next_cursor": page.next_cursor})
+
+
+@login_required
+def venue_slots(request: HttpRequest, slug: str) -> JsonResponse:
+    venue = get_object_or_404(Venue, slug=slug)
+    today = timezone.localdate()
+    try:
+        first_day = date.fromisoformat(request.GET.get("start") or today.isoformat())
+        last_day = date.fromisoformat(request.GET["end"]) if request.GET.get("end") else None
+    except ValueError:
+        return JsonResponse({"error": "Dates must use the YYYY-MM-DD format."}, status=400)
+    horizon_start, horizon_end = booking_horizon()
+    if not horizon_start <= first_day <= horizon_end or not horizon_start <= (last_day or first_day) <= horizon_end:
+        return JsonResponse(
+            {"error": f"Dates must fall within {settings.BOOKING_HORIZON_DAYS} days of today."}, status=400
+        )
+    if last_day is None:
+        last_day = first_day + timedelta(days=6)
+    if last_day < first_day or (last_day - first_day).days >= SLOT_QUERY_MAX_DAYS:
+        return JsonResponse(
+            {"error": f"Request between 1 and {SLOT_QUERY_MAX_DAYS} days at a time."},
+            status=400,
+        )
+    days = with_live_holds(venue.pk, venue_day_slots(venue, first_day, last_day), viewer_id=request.user.pk)
+    return JsonResponse(
+        {
+            "venue": venue.slug,
+            "slot_minutes": int(SLOT_LENGTH.total_seconds() // 60),
+            "days": [day.as_dict() for day in days],
+        }
+    )
+
+
+@login_required
+def venue_availability(request: HttpRequest, slug: str) -> JsonResponse:
+    venue = get_object_or_404(Venue, slug=slug)
+    try:
+        first_day = parse_month(request.GET.get("month") or month_label(timezone.localdate()))
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    return JsonResponse(month_availability(venue, first_day, viewer_id=request.user.pk))
+
+
+@login_required
+@require_POST
+def venue_hold(request: HttpRequest, slug: str) -> JsonResponse:
+    """Lease the window picked in the booking form while the user completes it."""
+
+    venue = get_object_or_404(Venue, slug=slug)
+    if request.user.is_staff:
+        return JsonResponse({"error": "Administrators cannot create bookings."}, status=403)
+    form = BookingForm(request.POST, venue=venue)
+    if not form.is_valid():
+        return JsonResponse({"error": "Please pick valid dates.", "errors": form.errors}, status=400)
+    try:
+        hold = place_hold(
+            venue.pk, request.user.pk, form.cleaned_data["start_datetime"], form.cleaned_data["end_datetime"]
+        )
+    except ValidationError as exc:
+        return JsonResponse({"error": exc.messages[0]}, status=HOLD_ERROR_STATUSES.get(exc.code, 409))
+    return JsonResponse({"hold": hold.pk, "expires_at": hold.expires_at.isoformat()}, status=201)
 
 
 class VenueDetailView(EnsureCsrfCookieMixin, LoginRequiredMixin, DetailView):
@@ -110,13 +214,14 @@ class VenueDetailView(EnsureCsrfCookieMixin, LoginRequiredMixin, DetailView):
         if can_book:
             booking_form = BookingForm(self.request.POST or None, venue=venue)
         review_form = ReviewForm(self.request.POST or None)
-        date_availability = self._build_date_availability(venue)
         context.update(
             {
                 "booking_form": booking_form,
                 "review_form": review_form,
                 "can_book": can_book,
-                "date_availability": date_availability,
+                "availability_url": reverse("venue-availability", kwargs={"slug": venue.slug}),
+                "hold_url": reverse("venue-hold", kwargs={"slug": venue.slug}),
+                "availability_month": month_label(timezone.localdate()),
                 "wishlist_ids": set(
                     Wishlist.objects.filter(user=self.request.user).values_list("venue_id", flat=True)
                 ),
@@ -125,38 +230,6 @@ class VenueDetailView(EnsureCsrfCookieMixin, LoginRequiredMixin, DetailView):
         )
         return context
 
-    def _build_date_availability(self, venue: Venue) -> list[dict[str, Any]]:
-        today = timezone.localdate()
-        available_dates: set[date] = set()
-        for availability in venue.availabilities.all():
-            start = timezone.localtime(availability.start_datetime).date()
-            end = timezone.localtime(availability.end_datetime).date()
-            current = start
-            while current <= end:
-                if current >= today:
-                    available_dates.add(current)
-                current += timedelta(days=1)
-
-        if not available_dates:
-            available_dates = {today + timedelta(days=offset) for offset in range(14)}
-
-        reserved_dates: set[date] = set()
-        bookings = venue.bookings.filter(status__in=Booking.ACTIVE_STATUSES)
-        for booking in bookings:
-            for reserved_date in booking.reserved_dates:
-                if reserved_date >= today:
-                    reserved_dates.add(reserved_date)
-
-        availability = []
-        for availability_date in sorted(available_dates):
-            availability.append(
-                {
-                    "date": availability_date,
-                    "is_reserved": availability_date in reserved_dates,
-                }
-            )
-        return availability
-
     def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
         self.object = self.get_object()
         if "submit_review" in request.POST:
@@ -176,6 +249,7 @@ class VenueDetailView(EnsureCsrfCookieMixin, LoginRequiredMixin, DetailView):
             messages.error(request, "Unable to save review. Please check the form.")
         return redirect("venue-detail", slug=self.object.slug)
 
+    @idempotent("booking-create")
     def handle_booking(self, request: HttpRequest) -> HttpResponse:
         if request.user.is_staff:
             messages.error(
@@ -188,8 +262,11 @@ class VenueDetailView(EnsureCsrfCookieMixin, LoginRequiredMixin, DetailView):
             booking: Booking = form.save(commit=False)
             booking.user = request.user
             booking.venue = self.object
-            booking.save()
-            form.save_m2m()
+            try:
+                reserve_booking(booking, save_m2m=form.save_m2m, addons=form.cleaned_data.get("addons"))
+            except ValidationError as exc:
+                messages.error(request, exc.messages[0])
+                return redirect("venue-detail", slug=self.object.slug)
             messages.success(
                 request,
                 "Your booking request was submitted and is awaiting admin approval.",
@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from addons.models import AddOn
+from field_catalog.search import search_venues
 
 from .models import Category, Venue, VenueAvailability
 
@@ -24,6 +25,11 @@ class VenueAdmin(admin.ModelAdmin):
     prepopulated_fields = {"slug": ("name",)}
     inlines = [AddOnInline]
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search_venues(queryset, search_term), False
+
 
 @admin.register(VenueAvailability)
 class VenueAvailabilityAdmin(admin.ModelAdmin):
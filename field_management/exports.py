@@ -0,0 +1,189 @@
+"""Streaming CSV and JSONL exports of bookings, payments and add-ons.
+
+Each dataset is a flat ``values_list`` query read with a chunked
+``.iterator()``, so rows are fetched ``EXPORT_CHUNK_SIZE`` at a time (through
+a server-side cursor on PostgreSQL) and written out as they arrive. Memory use
+does not grow with the size of the export. Rows are encoded one chunk at a
+time, and the view streams the chunks with ``StreamingHttpResponse``. In CSV
+output, text cells a spreadsheet would run as a formula get a leading ``'``.
+"""
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, Iterator, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model, QuerySet
+from django.utils import timezone
+
+from field_booking.models import Booking, Payment
+
+from .models import Venue
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+CONTENT_TYPES = {
+    FORMAT_CSV: "text/csv; charset=utf-8",
+    FORMAT_JSONL: "application/x-ndjson; charset=utf-8",
+}
+# Spreadsheets evaluate text cells that start with these as formulas.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """An exportable table: its rows and the booking lookup its filters go through."""
+
+    name: str
+    model: type[Model]
+    # Path from the dataset's model to its booking; "" for bookings themselves.
+    booking_path: str
+    columns: tuple[tuple[str, str], ...]
+
+    def lookup(self, field: str) -> str:
+        return f"{self.booking_path}__{field}" if self.booking_path else field
+
+    def queryset(self, filters: dict[str, Any]) -> QuerySet:
+        rows = self.model.objects.all()
+        date_from: Optional[date] = filters.get("date_from")
+        date_to: Optional[date] = filters.get("date_to")
+        if date_from:
+            rows = rows.filter(**{self.lookup("start_datetime__gte"): _day_start(date_from)})
+        if date_to:
+            rows = rows.filter(**{self.lookup("start_datetime__lt"): _day_start(date_to + timedelta(days=1))})
+        venue: Optional[Venue] = filters.get("venue")
+        if venue:
+            rows = rows.filter(**{self.lookup("venue"): venue})
+        if filters.get("city"):
+            rows = rows.filter(**{self.lookup("venue__city__iexact"): filters["city"]})
+        if filters.get("status"):
+            rows = rows.filter(**{self.lookup("status"): filters["status"]})
+        return rows.order_by("pk").values_list(*(field for _, field in self.columns))
+
+    @property
+    def header(self) -> list[str]:
+        return [name for name, _ in self.columns]
+
+
+DATASETS = {
+    dataset.name: dataset
+    for dataset in (
+        Dataset(
+            "bookings",
+            Booking,
+            "",
+            (
+                ("booking_id", "pk"),
+                ("venue", "venue__name"),
+                ("city", "venue__city"),
+                ("user", "user__username"),
+                ("start", "start_datetime"),
+                ("end", "end_datetime"),
+                ("status", "status"),
+                ("billed_hours", "billed_hours"),
+                ("base_amount", "base_amount"),
+                ("addons_amount", "addons_amount"),
+                ("total_amount", "total_amount"),
+                ("created_at", "created_at"),
+            ),
+        ),
+        Dataset(
+            "payments",
+            Payment,
+            "booking",
+            (
+                ("booking_id", "booking_id"),
+                ("reference_code", "reference_code"),
+                ("venue", "booking__venue__name"),
+                ("booking_status", "booking__status"),
+                ("method", "method"),
+                ("status", "status"),
+                ("total_amount", "total_amount"),
+                ("deposit_amount", "deposit_amount"),
+                ("created_at", "created_at"),
+                ("updated_at", "updated_at"),
+            ),
+        ),
+        Dataset(
+            "addons",
+            Booking.addons.through,
+            "booking",
+            (
+                ("booking_id", "booking_id"),
+                ("venue", "booking__venue__name"),
+                ("booking_status", "booking__status"),
+                ("addon_id", "addon_id"),
+                ("addon", "addon__name"),
+                # Bookings snapshot only the add-on total, so this is the current list price.
+                ("price", "addon__price"),
+            ),
+        ),
+    )
+}
+
+
+def _day_start(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _localize(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return timezone.localtime(value).replace(microsecond=0).isoformat()
+    return value
+
+
+def _csv_cell(value: Any) -> Any:
+    value = _localize(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the encoded line back to ``csv.writer``."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _csv_lines(dataset: Dataset, rows: Iterator[tuple]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(dataset.header)
+    for row in rows:
+        yield writer.writerow(map(_csv_cell, row))
+
+
+def _jsonl_lines(dataset: Dataset, rows: Iterator[tuple]) -> Iterator[str]:
+    header = dataset.header
+    for row in rows:
+        yield json.dumps(dict(zip(header, map(_localize, row))), cls=DjangoJSONEncoder) + "\n"
+
+
+def stream_export(
+    dataset: Dataset, fmt: str, filters: dict[str, Any], chunk_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """Yield the encoded export of ``dataset`` one chunk of rows at a time."""
+
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    rows = dataset.queryset(filters).iterator(chunk_size=chunk_size)
+    lines = _csv_lines(dataset, rows) if fmt == FORMAT_CSV else _jsonl_lines(dataset, rows)
+    chunk: list[str] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield "".join(chunk).encode()
+            chunk = []
+    if chunk:
+        yield "".join(chunk).encode()
+
+
+def export_filename(dataset: Dataset, fmt: str, filters: dict[str, Any]) -> str:
+    parts = [dataset.name]
+    for key in ("date_from", "date_to"):
+        if filters.get(key):
+            parts.append(filters[key].isoformat())
+    return f"{'_'.join(parts)}.{fmt}"
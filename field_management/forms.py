@@ -2,12 +2,15 @@
 from __future__ import annotations
 
 from django import forms
+from django.db import transaction
 from django.db.models import Case, IntegerField, When
 from django.utils.text import slugify
 
+from field_booking.approvals import BulkDecisionResult, apply_bulk_decision
 from field_booking.models import Booking
 
 from .constants import CATEGORY_SLUG_SEQUENCE
+from .exports import DATASETS, FORMAT_CSV, FORMAT_JSONL
 from .models import Category, Venue
 
 
@@ -161,6 +164,7 @@ class BookingDecisionForm(forms.Form):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.booking: Booking | None = None
+        self.auto_cancelled: list[int] = []
 
     def clean(self):
         cleaned_data = super().clean()
@@ -190,13 +194,88 @@ class BookingDecisionForm(forms.Form):
         booking = self.booking
 
         if decision == self.APPROVE:
-            booking.approve(approver)
+            self.auto_cancelled = booking.approve(approver)
         elif decision == self.CANCEL:
-            booking.cancel()
-            if hasattr(booking, "payment"):
-                booking.payment.status = "waiting"
-                booking.payment.save(update_fields=["status", "updated_at"])
+            with transaction.atomic():
+                booking.cancel(reason="admin")
+                if hasattr(booking, "payment"):
+                    booking.payment.status = "waiting"
+                    booking.payment.save(update_fields=["status", "updated_at"])
         else:  # pragma: no cover - guarded by ChoiceField
             raise ValueError("Keputusan tidak valid.")
 
         return booking, decision
+
+
+class BookingIdsField(forms.Field):
+    """A list of booking primary keys posted as repeated hidden inputs."""
+
+    widget = forms.MultipleHiddenInput
+    default_error_messages = {
+        "required": "Pilih minimal satu booking.",
+        "invalid": "Pilihan booking tidak valid.",
+    }
+
+    def to_python(self, value) -> list[int]:
+        if not value:
+            return []
+        try:
+            return sorted({int(item) for item in value})
+        except (TypeError, ValueError) as exc:
+            raise forms.ValidationError(self.error_messages["invalid"], code="invalid") from exc
+
+
+class BulkBookingDecisionForm(forms.Form):
+    """Validate a decision applied to several selected booking requests."""
+
+    booking_ids = BookingIdsField()
+    decision = forms.ChoiceField(choices=BookingDecisionForm.DECISION_CHOICES, widget=forms.HiddenInput)
+
+    def apply_decision(self, approver) -> BulkDecisionResult:
+        """Apply the decision; bookings that are no longer pending are skipped, not failed."""
+
+        if not self.is_valid():
+            raise ValueError("Form harus divalidasi sebelum diproses.")
+        return apply_bulk_decision(self.cleaned_data["booking_ids"], self.cleaned_data["decision"], approver)
+
+
+class BookingFilterForm(forms.Form):
+    """Narrow booking figures to a local date range, a venue or a city."""
+
+    date_from = forms.DateField(required=False, widget=forms.DateInput(attrs={"type": "date"}))
+    date_to = forms.DateField(required=False, widget=forms.DateInput(attrs={"type": "date"}))
+    venue = forms.ModelChoiceField(queryset=Venue.objects.order_by("name"), required=False)
+    city = forms.CharField(max_length=100, required=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for field in self.fields.values():
+            css = "custom-select " if isinstance(field.widget, forms.Select) else ""
+            field.widget.attrs.setdefault(
+                "class",
+                css + "w-full rounded-2xl border border-white/25 bg-slate-950/70 px-4 py-2 text-sm text-white/90 backdrop-blur",
+            )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        date_from = cleaned_data.get("date_from")
+        date_to = cleaned_data.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            raise forms.ValidationError("Tanggal awal tidak boleh melewati tanggal akhir.")
+        return cleaned_data
+
+
+class ExportForm(BookingFilterForm):
+    """Choose an export dataset and format and filter it by the bookings it covers."""
+
+    FILTER_FIELDS = ("date_from", "date_to", "venue", "city", "status")
+
+    dataset = forms.ChoiceField(choices=[(name, name.title()) for name in DATASETS])
+    format = forms.ChoiceField(choices=((FORMAT_CSV, "CSV"), (FORMAT_JSONL, "JSON Lines")))
+    status = forms.ChoiceField(choices=(("", "All statuses"), *Booking.STATUS_CHOICES), required=False)
+
+    field_order = ("dataset", "format", *FILTER_FIELDS)
+
+    @property
+    def filters(self) -> dict:
+        return {name: self.cleaned_data.get(name) for name in self.FILTER_FIELDS}
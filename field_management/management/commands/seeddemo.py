@@ -12,6 +12,7 @@ from django.utils.text import slugify
 
 from addons.models import AddOn
 from field_booking.models import Booking, Payment
+from field_catalog.popularity import recompute_popularity
 from field_management.constants import CATEGORY_DEFINITIONS
 from field_management.models import Category, Venue, VenueAvailability
 from user_interactions.models import Review, Wishlist
@@ -359,6 +360,7 @@ class Command(BaseCommand):
             user = self._create_demo_user()
             venues = self._create_catalog()
             self._create_bookings(user, venues)
+            recompute_popularity()
         self.stdout.write(self.style.SUCCESS("Demo data ready. You can log in with 'demo' / 'Demo123!'"))
 
     def _create_admin(self):
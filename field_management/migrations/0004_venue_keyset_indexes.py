@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('field_management', '0003_update_categories'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['name', 'id'], name='venue_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['price_per_hour', 'id'], name='venue_price_id_idx'),
+        ),
+    ]
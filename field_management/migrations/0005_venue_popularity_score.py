@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('field_management', '0004_venue_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='popularity_score',
+            field=models.FloatField(default=0, editable=False, help_text='Materialised by the recompute_popularity command.'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['-popularity_score', 'name'], name='venue_popularity_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Written by hand to catch the migration state up with the baseline model.
+# 0001 declared the opening-hours defaults as the strings "07:00:00" and
+# "22:00:00"; the model has always used time objects. Django applies field
+# defaults in Python, so no stored value or column changes.
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('field_management', '0005_venue_popularity_score'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='venue',
+            name='available_end_time',
+            field=models.TimeField(default=datetime.time(22, 0)),
+        ),
+        migrations.AlterField(
+            model_name='venue',
+            name='available_start_time',
+            field=models.TimeField(default=datetime.time(7, 0)),
+        ),
+    ]
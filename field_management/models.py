@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from datetime import time
+from datetime import date, datetime, time, timedelta
 
 from django.core.exceptions import ValidationError
 from django.db import models
@@ -53,9 +53,20 @@ class Venue(TimestampedModel):
     image_url = models.URLField(blank=True)
     available_start_time = models.TimeField(default=time(7, 0))
     available_end_time = models.TimeField(default=time(22, 0))
+    popularity_score = models.FloatField(
+        default=0,
+        editable=False,
+        help_text="Materialised by the recompute_popularity command.",
+    )
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            # Keyset pagination in the catalog API walks these orderings.
+            models.Index(fields=["name", "id"], name="venue_name_id_idx"),
+            models.Index(fields=["price_per_hour", "id"], name="venue_price_id_idx"),
+            models.Index(fields=["-popularity_score", "name"], name="venue_popularity_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -72,6 +83,15 @@ class Venue(TimestampedModel):
     def hourly_total(self, hours: int) -> Decimal:
         return self.price_per_hour * Decimal(hours)
 
+    @property
+    def open_hours_per_day(self) -> int:
+        opening = datetime.combine(date.min, self.available_start_time)
+        closing = datetime.combine(date.min, self.available_end_time)
+        if closing <= opening:
+            # Overnight hours close on the following day.
+            closing += timedelta(days=1)
+        return int((closing - opening).total_seconds() // 3600)
+
 
 class VenueAvailability(TimestampedModel):
     """Represents a block of time when the venue is available for booking."""
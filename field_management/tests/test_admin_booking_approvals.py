@@ -6,11 +6,13 @@ from decimal import Decimal
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
-from field_booking.models import Booking
+from field_booking.models import Booking, Payment
 from field_management.models import Category, Venue
 
 
@@ -44,8 +46,8 @@ class AdminBookingApprovalViewTests(TestCase):
             image_url="https://example.com/venue.jpg",
         )
 
-    def _create_booking(self) -> Booking:
-        start = timezone.now() + timedelta(days=1)
+    def _create_booking(self, day_offset: int = 1) -> Booking:
+        start = timezone.now() + timedelta(days=day_offset)
         end = start + timedelta(hours=2)
         return Booking.objects.create(
             user=self.user,
@@ -119,3 +121,52 @@ class AdminBookingApprovalViewTests(TestCase):
         self.assertRedirects(response, reverse("admin-bookings"))
         messages = list(response.context["messages"])
         self.assertTrue(any("sudah diproses" in str(message) for message in messages))
+
+    def test_bulk_approve_updates_bookings_and_payments_together(self) -> None:
+        bookings = [self._create_booking(day_offset) for day_offset in (1, 2, 3)]
+        Payment.objects.filter(booking=bookings[0]).update(status="confirmed")
+        Payment.objects.filter(booking=bookings[1]).delete()
+        self.client.force_login(self.admin)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse("admin-bookings-bulk"),
+                {"booking_ids": [booking.pk for booking in bookings], "decision": "approve"},
+            )
+
+        tables = (f'UPDATE "{Booking._meta.db_table}"', f'UPDATE "{Payment._meta.db_table}"')
+        updates = [query["sql"] for query in queries.captured_queries if query["sql"].startswith(tables)]
+        self.assertEqual(sorted(update.split(" SET ")[0] for update in updates), list(tables))
+        self.assertRedirects(response, reverse("admin-bookings"), fetch_redirect_response=False)
+        for booking in Booking.objects.filter(pk__in=[booking.pk for booking in bookings]).select_related("payment"):
+            self.assertEqual(booking.status, Booking.STATUS_ACTIVE)
+            self.assertEqual(booking.approved_by, self.admin)
+            self.assertEqual(booking.payment.status, "waiting")
+            self.assertEqual(booking.payment.total_amount, booking.total_cost)
+
+    def test_bulk_cancel_skips_bookings_that_are_no_longer_pending(self) -> None:
+        pending = self._create_booking(1)
+        handled = self._create_booking(2)
+        handled.approve(self.admin)
+        self.client.force_login(self.admin)
+
+        response = self.client.post(
+            reverse("admin-bookings-bulk"),
+            {"booking_ids": [pending.pk, handled.pk], "decision": "cancel"},
+            follow=True,
+        )
+
+        pending.refresh_from_db()
+        handled.refresh_from_db()
+        self.assertEqual(pending.status, Booking.STATUS_CANCELLED)
+        self.assertEqual(handled.status, Booking.STATUS_ACTIVE)
+        messages = [str(message) for message in response.context["messages"]]
+        self.assertTrue(any("dilewati" in message for message in messages))
+
+    def test_bulk_decision_requires_a_selection(self) -> None:
+        self.client.force_login(self.admin)
+
+        response = self.client.post(reverse("admin-bookings-bulk"), {"decision": "approve"}, follow=True)
+
+        messages = [str(message) for message in response.context["messages"]]
+        self.assertIn("Pilih minimal satu booking.", messages)
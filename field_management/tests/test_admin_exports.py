@@ -0,0 +1,136 @@
+"""Tests for the streaming workspace exports."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from addons.models import AddOn
+from field_booking.models import Booking
+from field_booking.reservations import reserve_booking
+from field_management.models import Category, Venue
+
+
+class AdminExportViewTests(TestCase):
+    """Administrators stream filtered bookings, payments and add-ons."""
+
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.admin = user_model.objects.create_user(username="exporter", password="secret123", is_staff=True)
+        self.user = user_model.objects.create_user(username="guest", password="secret123")
+        category = Category.objects.create(name="Export Arena")
+        self.jakarta = Venue.objects.create(
+            category=category,
+            name="Jakarta Court",
+            description="Court.",
+            location="Central",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+        )
+        self.bandung = Venue.objects.create(
+            category=category,
+            name="Bandung Court",
+            description="Court.",
+            location="North",
+            city="Bandung",
+            price_per_hour=Decimal("80000.00"),
+            facilities="Lighting",
+        )
+        self.racket = AddOn.objects.create(venue=self.jakarta, name="Racket", price=Decimal("15000.00"))
+        self.today = timezone.localdate()
+        self.first = self._reserve(self.jakarta, 2, addons=[self.racket])
+        self.second = self._reserve(self.jakarta, 5)
+        self.elsewhere = self._reserve(self.bandung, 2)
+        self.first.approve(self.admin)
+        self.client.force_login(self.admin)
+
+    def _reserve(self, venue: Venue, day_offset: int, addons=()) -> Booking:
+        start = timezone.make_aware(datetime.combine(self.today + timedelta(days=day_offset), time(9)))
+        booking = Booking(user=self.user, venue=venue, start_datetime=start, end_datetime=start + timedelta(hours=2))
+        return reserve_booking(booking, save_m2m=lambda: booking.addons.set(addons), addons=list(addons))
+
+    def _export(self, **params) -> StreamingHttpResponse:
+        response = self.client.get(reverse("admin-export"), params)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return response
+
+    def test_bookings_stream_as_csv_within_the_date_range(self) -> None:
+        response = self._export(
+            dataset="bookings", format="csv", date_from=self.today, date_to=self.today + timedelta(days=3)
+        )
+
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn(f"bookings_{self.today.isoformat()}", response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual([int(row["booking_id"]) for row in rows], [self.first.pk, self.elsewhere.pk])
+        self.assertEqual(rows[0]["status"], Booking.STATUS_ACTIVE)
+        self.assertEqual(Decimal(rows[0]["total_amount"]), self.first.total_amount)
+        self.assertTrue(rows[0]["start"].endswith("09:00:00+07:00"))
+
+    def test_csv_cells_that_look_like_formulas_are_escaped(self) -> None:
+        self.user.username = "=HYPERLINK(\"http://evil.test\")"
+        self.user.save(update_fields=["username"])
+        self.racket.name = "@SUM(A1)"
+        self.racket.save(update_fields=["name"])
+
+        response = self._export(dataset="bookings", format="csv")
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[0]["user"], "'=HYPERLINK(\"http://evil.test\")")
+        self.assertEqual(rows[0]["venue"], "Jakarta Court")
+
+        response = self._export(dataset="addons", format="csv")
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[0]["addon"], "'@SUM(A1)")
+
+        # JSON lines keep the value as typed.
+        response = self._export(dataset="addons", format="jsonl")
+        self.assertEqual(json.loads(b"".join(response.streaming_content))["addon"], "@SUM(A1)")
+
+    def test_payments_and_addons_filter_by_venue_city_and_status(self) -> None:
+        response = self._export(dataset="payments", format="jsonl", city="jakarta", status=Booking.STATUS_ACTIVE)
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson; charset=utf-8")
+        payments = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(payments), 1)
+        self.assertEqual(payments[0]["booking_id"], self.first.pk)
+        self.assertEqual(payments[0]["reference_code"], self.first.payment.reference_code)
+
+        response = self._export(dataset="addons", format="jsonl", venue=self.jakarta.pk)
+        addons = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        expected = {
+            "booking_id": self.first.pk,
+            "venue": "Jakarta Court",
+            "booking_status": Booking.STATUS_ACTIVE,
+            "addon_id": self.racket.pk,
+            "addon": "Racket",
+            "price": "15000.00",
+        }
+        self.assertEqual(addons, [expected])
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_rows_are_written_one_chunk_at_a_time(self) -> None:
+        response = self._export(dataset="bookings", format="jsonl")
+
+        chunks = list(response.streaming_content)
+        self.assertEqual([chunk.count(b"\n") for chunk in chunks], [2, 1])
+
+    def test_invalid_filters_and_non_admins_are_turned_away(self) -> None:
+        params = {"dataset": "bookings", "format": "csv", "date_from": self.today}
+        response = self.client.get(
+            reverse("admin-export"), {**params, "date_to": self.today - timedelta(days=1)}, follow=True
+        )
+        self.assertRedirects(response, reverse("admin-dashboard"))
+        self.assertContains(response, "Tanggal awal tidak boleh melewati tanggal akhir.")
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("admin-export"), {"dataset": "bookings", "format": "csv"})
+        self.assertRedirects(response, reverse("home"), fetch_redirect_response=False)
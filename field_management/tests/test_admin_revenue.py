@@ -0,0 +1,100 @@
+"""Tests for the workspace revenue dashboard."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from field_booking.models import Booking, VenueDailyRollup
+from field_management.models import Category, Venue
+
+
+class AdminRevenueViewTests(TestCase):
+    """The dashboard sums daily rollups without reading bookings or payments."""
+
+    def setUp(self) -> None:
+        self.admin = get_user_model().objects.create_user(username="finance", password="secret123", is_staff=True)
+        category = Category.objects.create(name="Revenue Arena")
+        self.jakarta = Venue.objects.create(
+            category=category,
+            name="Jakarta Court",
+            description="Court.",
+            location="Central",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Lighting",
+            available_start_time=time(8),
+            available_end_time=time(18),
+        )
+        self.bandung = Venue.objects.create(
+            category=category,
+            name="Bandung Court",
+            description="Court.",
+            location="North",
+            city="Bandung",
+            price_per_hour=Decimal("80000.00"),
+            facilities="Lighting",
+        )
+        self.day = timezone.localdate().replace(day=1)
+        for venue, day, hours, revenue in (
+            (self.jakarta, self.day, 4, "400000.00"),
+            (self.jakarta, self.day + timedelta(days=1), 1, "100000.00"),
+            (self.bandung, self.day, 2, "160000.00"),
+            (self.bandung, self.day - timedelta(days=1), 8, "640000.00"),
+        ):
+            VenueDailyRollup.objects.create(
+                venue=venue,
+                day=day,
+                bookings=1,
+                booked_hours=hours,
+                revenue=Decimal(revenue),
+                paid_revenue=Decimal(revenue) / 2,
+            )
+        self.client.force_login(self.admin)
+
+    def test_current_month_is_summed_per_venue_and_day(self) -> None:
+        # Session, user, three rollup aggregates, their venues and the venue filter choices.
+        with self.assertNumQueries(7):
+            response = self.client.get(reverse("admin-revenue"))
+
+        totals = response.context["totals"]
+        self.assertEqual((totals["bookings"], totals["booked_hours"]), (3, 7))
+        self.assertEqual((totals["revenue"], totals["paid_revenue"]), (Decimal("660000.00"), Decimal("330000.00")))
+        by_venue = response.context["by_venue"]
+        self.assertEqual([row["venue"] for row in by_venue], [self.jakarta, self.bandung])
+        month_days = (response.context["date_to"] - self.day).days + 1
+        self.assertEqual(by_venue[0]["occupancy"], round(100 * 5 / (10 * month_days), 1))
+        self.assertEqual([row["share"] for row in response.context["by_day"]], [100, 18])
+        self.assertContains(response, "Jakarta Court")
+
+    def test_filters_narrow_the_rollups(self) -> None:
+        params = {"date_from": self.day - timedelta(days=1), "date_to": self.day, "city": "bandung"}
+        response = self.client.get(reverse("admin-revenue"), params)
+
+        self.assertEqual(response.context["totals"]["revenue"], Decimal("800000.00"))
+        self.assertEqual([row["venue"] for row in response.context["by_venue"]], [self.bandung])
+
+        params = {"date_from": self.day, "date_to": self.day - timedelta(days=1)}
+        response = self.client.get(reverse("admin-revenue"), params)
+        self.assertContains(response, "Filter tidak valid; menampilkan bulan ini.")
+        self.assertEqual(response.context["date_from"], self.day)
+
+    def test_overview_counts_only_live_and_completed_bookings(self) -> None:
+        start = timezone.make_aware(datetime.combine(self.day + timedelta(days=40), time(9)))
+        for offset, status in enumerate(Booking.STATUS_CHOICES):
+            booking = Booking.objects.create(
+                user=self.admin,
+                venue=self.jakarta,
+                start_datetime=start + timedelta(days=offset),
+                end_datetime=start + timedelta(days=offset, hours=2),
+            )
+            Booking.objects.filter(pk=booking.pk).update(status=status[0])
+
+        response = self.client.get(reverse("admin-dashboard"))
+
+        # Pending, active, confirmed and completed count; cancelled and expired do not.
+        self.assertEqual(response.context["stats"]["booked_revenue"], Decimal("800000.00"))
@@ -3,7 +3,10 @@ from django.urls import path
 
 from .views import (
     AdminBookingApprovalView,
+    AdminBookingBulkDecisionView,
     AdminDashboardView,
+    AdminExportView,
+    AdminRevenueView,
     AdminVenueCreateView,
     AdminVenueDeleteView,
     AdminVenueListView,
@@ -13,6 +16,9 @@ from .views import (
 urlpatterns = [
     path("", AdminDashboardView.as_view(), name="admin-dashboard"),
     path("bookings/", AdminBookingApprovalView.as_view(), name="admin-bookings"),
+    path("bookings/bulk/", AdminBookingBulkDecisionView.as_view(), name="admin-bookings-bulk"),
+    path("exports/", AdminExportView.as_view(), name="admin-export"),
+    path("revenue/", AdminRevenueView.as_view(), name="admin-revenue"),
     path("venues/", AdminVenueListView.as_view(), name="admin-venues"),
     path("venues/add/", AdminVenueCreateView.as_view(), name="admin-venue-create"),
     path("venues/<int:pk>/edit/", AdminVenueUpdateView.as_view(), name="admin-venue-edit"),
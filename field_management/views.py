@@ -2,16 +2,21 @@
 from __future__ import annotations
 
 import logging
+from datetime import timedelta
 from typing import Any
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import ValidationError
 from django.db import IntegrityError
+from django.db.models import Sum
 from django.forms import inlineformset_factory
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
+from django.utils import timezone
 from django.views import View
 from django.views.generic import ListView, TemplateView
 
@@ -19,9 +24,11 @@ from accounts.forms import AdminCreationForm
 from accounts.mixins import AdminRequiredMixin
 from addons.forms import AddOnForm
 from addons.models import AddOn
-from field_booking.models import Booking, Payment
+from field_booking.approvals import CONFLICT_CANCEL, flag_blocked_requests, group_overlapping
+from field_booking.models import Booking, Payment, VenueDailyRollup
 
-from .forms import BookingDecisionForm, VenueForm
+from .exports import CONTENT_TYPES, DATASETS, export_filename, stream_export
+from .forms import BookingDecisionForm, BookingFilterForm, BulkBookingDecisionForm, ExportForm, VenueForm
 from .models import Venue
 
 AddOnFormSet = inlineformset_factory(Venue, AddOn, form=AddOnForm, extra=3, can_delete=True)
@@ -43,9 +50,14 @@ class AdminDashboardView(AdminRequiredMixin, LoginRequiredMixin, TemplateView):
                     "bookings": Booking.objects.count(),
                     "payments": Payment.objects.count(),
                     "pending_bookings": Booking.objects.filter(status=Booking.STATUS_PENDING).count(),
+                    "booked_revenue": Booking.objects.filter(status__in=Booking.COUNTED_STATUSES).aggregate(
+                        total=Sum("total_amount")
+                    )["total"]
+                    or 0,
                 },
                 "admins": user_model.objects.filter(is_staff=True).order_by("username"),
                 "admin_form": kwargs.get("admin_form") or self.form_class(),
+                "export_form": ExportForm(initial={"dataset": "bookings", "format": "csv"}),
             }
         )
         return context
@@ -184,12 +196,16 @@ class AdminBookingApprovalView(AdminRequiredMixin, LoginRequiredMixin, TemplateV
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        context["pending_bookings"] = (
+        pending = list(
             Booking.objects.select_related("venue", "user")
             .prefetch_related("addons")
             .filter(status=Booking.STATUS_PENDING)
             .order_by("start_datetime")
         )
+        flag_blocked_requests(pending)
+        context["pending_bookings"] = pending
+        context["request_groups"] = group_overlapping(pending)
+        context["cancels_conflicts"] = settings.BOOKING_CONFLICT_POLICY == CONFLICT_CANCEL
         return context
 
     def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
@@ -205,9 +221,132 @@ class AdminBookingApprovalView(AdminRequiredMixin, LoginRequiredMixin, TemplateV
                 messages.error(request, error)
             return redirect("admin-bookings")
 
-        _, decision = form.apply_decision(request.user)
+        try:
+            _, decision = form.apply_decision(request.user)
+        except ValidationError as exc:
+            for error in exc.messages:
+                messages.error(request, error)
+            return redirect("admin-bookings")
         if decision == BookingDecisionForm.APPROVE:
             messages.success(request, "Booking approved successfully.")
         else:
             messages.success(request, "Booking request cancelled.")
+        _add_conflict_message(request, form.auto_cancelled)
+        return redirect("admin-bookings")
+
+
+class AdminBookingBulkDecisionView(AdminRequiredMixin, LoginRequiredMixin, View):
+    """Approve or cancel every selected booking request in one transaction."""
+
+    http_method_names = ["post"]
+
+    def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        form = BulkBookingDecisionForm(request.POST)
+        if not form.is_valid():
+            for field_errors in form.errors.values():
+                for error in field_errors:
+                    messages.error(request, error)
+            return redirect("admin-bookings")
+
+        result = form.apply_decision(request.user)
+        if result.decision == BookingDecisionForm.APPROVE:
+            messages.success(request, f"Approved {len(result.processed)} booking request(s).")
+        else:
+            messages.success(request, f"Cancelled {len(result.processed)} booking request(s).")
+        if result.conflicted:
+            messages.error(
+                request, f"{len(result.conflicted)} booking tidak disetujui karena bentrok dengan booking lain."
+            )
+        if result.skipped:
+            messages.warning(request, f"{len(result.skipped)} booking sudah diproses sebelumnya dan dilewati.")
+        _add_conflict_message(request, result.auto_cancelled)
         return redirect("admin-bookings")
+
+
+def _add_conflict_message(request: HttpRequest, auto_cancelled: list[int]) -> None:
+    if auto_cancelled:
+        messages.info(
+            request, f"{len(auto_cancelled)} permintaan lain yang bentrok dengan booking ini dibatalkan otomatis."
+        )
+
+
+class AdminExportView(AdminRequiredMixin, LoginRequiredMixin, View):
+    """Stream a filtered bookings, payments or add-ons export as CSV or JSON Lines."""
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        form = ExportForm(request.GET)
+        if not form.is_valid():
+            errors = [error for field_errors in form.errors.values() for error in field_errors]
+            messages.error(request, f"Unable to export: {' '.join(errors)}")
+            return redirect("admin-dashboard")
+        dataset = DATASETS[form.cleaned_data["dataset"]]
+        fmt = form.cleaned_data["format"]
+        response = StreamingHttpResponse(stream_export(dataset, fmt, form.filters), content_type=CONTENT_TYPES[fmt])
+        response["Content-Disposition"] = f'attachment; filename="{export_filename(dataset, fmt, form.filters)}"'
+        logger.info("Admin %s exported %s as %s.", request.user.pk, dataset.name, fmt)
+        return response
+
+
+class AdminRevenueView(AdminRequiredMixin, LoginRequiredMixin, TemplateView):
+    """Revenue and occupancy per day and venue, read from the daily rollups."""
+
+    template_name = "admin/revenue.html"
+    TOTALS = {
+        "bookings": Sum("bookings"),
+        "booked_hours": Sum("booked_hours"),
+        "revenue": Sum("revenue"),
+        "addon_revenue": Sum("addon_revenue"),
+        "paid_revenue": Sum("paid_revenue"),
+    }
+
+    def _filter_form(self) -> BookingFilterForm:
+        today = timezone.localdate()
+        month_start = today.replace(day=1)
+        month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        data = self.request.GET.copy()
+        # Without a range the dashboard shows the current month.
+        for key, default in (("date_from", month_start), ("date_to", month_end)):
+            if not data.get(key):
+                data[key] = default.isoformat()
+        form = BookingFilterForm(data)
+        if not form.is_valid():
+            messages.error(self.request, "Filter tidak valid; menampilkan bulan ini.")
+            form = BookingFilterForm({"date_from": month_start.isoformat(), "date_to": month_end.isoformat()})
+            form.is_valid()
+        return form
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        form = self._filter_form()
+        date_from = form.cleaned_data["date_from"]
+        date_to = form.cleaned_data["date_to"]
+        rollups = VenueDailyRollup.objects.filter(day__gte=date_from, day__lte=date_to)
+        if form.cleaned_data["venue"]:
+            rollups = rollups.filter(venue=form.cleaned_data["venue"])
+        if form.cleaned_data["city"]:
+            rollups = rollups.filter(venue__city__iexact=form.cleaned_data["city"])
+
+        days = (date_to - date_from).days + 1
+        by_venue = list(rollups.values("venue_id").annotate(**self.TOTALS).order_by("-revenue", "venue_id"))
+        venues = Venue.objects.in_bulk([row["venue_id"] for row in by_venue])
+        for row in by_venue:
+            row["venue"] = venues[row["venue_id"]]
+            open_hours = row["venue"].open_hours_per_day * days
+            # Bookings outside the opening hours count on their start day, so cap the share.
+            row["occupancy"] = min(round(100 * row["booked_hours"] / open_hours, 1), 100) if open_hours else 0
+        by_day = list(rollups.values("day").annotate(**self.TOTALS).order_by("day"))
+        peak = max((row["revenue"] for row in by_day), default=0)
+        for row in by_day:
+            row["share"] = round(100 * row["revenue"] / peak) if peak else 0
+
+        context.update(
+            {
+                "filter_form": form,
+                "date_from": date_from,
+                "date_to": date_to,
+                "totals": {name: value or 0 for name, value in rollups.aggregate(**self.TOTALS).items()},
+                "by_venue": by_venue,
+                "by_day": by_day,
+            }
+        )
+        return context
@@ -1126,11 +1126,55 @@ document.addEventListener('DOMContentLoaded', () => {
   window.RagaSpace.refreshInteractive = refreshInteractive;
 });
 
+const createCatalogCard = (venue) => {
+  const card = document.createElement('article');
+  card.className = 'card-tilt group relative overflow-hidden rounded-3xl border border-white/10 bg-white/5 p-5 shadow-xl shadow-slate-950/40 backdrop-blur-xl transition hover:bg-white/10';
+  card.setAttribute('data-animate', '');
+  const wishlistedClass = venue.wishlisted ? 'wishlist-button--active' : '';
+  const heartFill = venue.wishlisted ? '#ef4444' : 'none';
+  const heartStroke = venue.wishlisted ? '#ef4444' : 'currentColor';
+  const wishlistedState = venue.wishlisted ? 'true' : 'false';
+  const priceDisplay = formatCurrency(venue.price);
+  card.innerHTML = `
+    <div class="relative">
+      <img src="${escapeHtml(venue.image_url)}" alt="${escapeHtml(venue.name)}" class="h-48 w-full rounded-2xl object-cover" />
+      <button data-venue="${escapeHtml(venue.id)}" data-wishlisted="${wishlistedState}" data-venue-name="${escapeHtml(venue.name)}" data-venue-city="${escapeHtml(venue.city)}" data-venue-category="${escapeHtml(venue.category)}" data-venue-price="${escapeHtml(venue.price)}" data-venue-url="${escapeHtml(venue.url)}" data-venue-image="${escapeHtml(venue.image_url)}" data-venue-description="${escapeHtml(venue.description || '')}" data-toggle-url="${escapeHtml(venue.toggle_url)}" class="wishlist-button ${wishlistedClass} absolute right-3 top-3 rounded-full border border-white/30 bg-white/10 p-2 text-white transition hover:bg-white/20" aria-label="Toggle wishlist" aria-pressed="${wishlistedState}">
+        <svg xmlns="http://www.w3.org/2000/svg" fill="${heartFill}" viewBox="0 0 24 24" stroke-width="1.5" stroke="${heartStroke}" class="h-6 w-6">
+          <path stroke-linecap="round" stroke-linejoin="round" d="M21 8.25c0-2.485-2.099-4.5-4.688-4.5-1.935 0-3.597 1.126-4.312 2.733-.715-1.607-2.377-2.733-4.313-2.733C5.1 3.75 3 5.765 3 8.25c0 7.22 9 12 9 12s9-4.78 9-12z" />
+        </svg>
+      </button>
+    </div>
+    <div class="mt-4 flex flex-col gap-2">
+      <p class="text-xs uppercase tracking-[0.4em] text-white/50">${escapeHtml(venue.category)}</p>
+      <h3 class="text-xl font-semibold text-white">${escapeHtml(venue.name)}</h3>
+      <p class="text-sm text-white/60">${escapeHtml(venue.city)}</p>
+    </div>
+    <div class="mt-4 flex items-center justify-between">
+      <span class="rounded-full border border-white/20 bg-white/10 px-3 py-1 text-xs uppercase tracking-widest text-white/70">Rp ${escapeHtml(priceDisplay)}</span>
+      <a href="${escapeHtml(venue.url)}" class="interactive-glow rounded-2xl bg-white/10 px-4 py-2 text-sm font-semibold text-white transition hover:bg-white/20" data-ripple>View product</a>
+    </div>
+  `;
+  return card;
+};
+
 const filterForm = document.querySelector('#catalog-filter-form');
 if (filterForm) {
-  filterForm.addEventListener('submit', (event) => {
-    event.preventDefault();
-    const params = new URLSearchParams(new FormData(filterForm));
+  const catalogState = {
+    params: null,
+    nextCursor: null,
+    loading: false,
+  };
+  const sentinel = document.querySelector('#catalog-grid-sentinel');
+
+  const loadCatalogPage = ({ reset = false } = {}) => {
+    const grid = document.querySelector('#catalog-grid');
+    if (!grid || catalogState.loading) return;
+    if (!reset && !catalogState.nextCursor) return;
+    const params = new URLSearchParams(catalogState.params);
+    if (!reset) {
+      params.set('cursor', catalogState.nextCursor);
+    }
+    catalogState.loading = true;
     fetch(`/api/catalog/filter/?${params.toString()}`, {
       headers: {
         'X-Requested-With': 'XMLHttpRequest',
@@ -1138,47 +1182,162 @@ if (filterForm) {
     })
       .then((response) => response.json())
       .then((data) => {
-        const grid = document.querySelector('#catalog-grid');
-        if (!grid) return;
-        grid.innerHTML = '';
-        if (data.venues.length === 0) {
+        if (reset) {
+          grid.innerHTML = '';
+          const pagination = document.querySelector('#catalog-pagination');
+          if (pagination) pagination.remove();
+        }
+        catalogState.nextCursor = data.next_cursor || null;
+        if (reset && data.venues.length === 0) {
           grid.innerHTML = '<p class="text-white/70">No venues match your filters yet.</p>';
           return;
         }
-        data.venues.forEach((venue) => {
-          const card = document.createElement('article');
-          card.className = 'card-tilt group relative overflow-hidden rounded-3xl border border-white/10 bg-white/5 p-5 shadow-xl shadow-slate-950/40 backdrop-blur-xl transition hover:bg-white/10';
-          card.setAttribute('data-animate', '');
-          const wishlistedClass = venue.wishlisted ? 'wishlist-button--active' : '';
-          const heartFill = venue.wishlisted ? '#ef4444' : 'none';
-          const heartStroke = venue.wishlisted ? '#ef4444' : 'currentColor';
-          const wishlistedState = venue.wishlisted ? 'true' : 'false';
-          const priceDisplay = formatCurrency(venue.price);
-          card.innerHTML = `
-            <div class="relative">
-              <img src="${escapeHtml(venue.image_url)}" alt="${escapeHtml(venue.name)}" class="h-48 w-full rounded-2xl object-cover" />
-              <button data-venue="${escapeHtml(venue.id)}" data-wishlisted="${wishlistedState}" data-venue-name="${escapeHtml(venue.name)}" data-venue-city="${escapeHtml(venue.city)}" data-venue-category="${escapeHtml(venue.category)}" data-venue-price="${escapeHtml(venue.price)}" data-venue-url="${escapeHtml(venue.url)}" data-venue-image="${escapeHtml(venue.image_url)}" data-venue-description="${escapeHtml(venue.description || '')}" data-toggle-url="${escapeHtml(venue.toggle_url)}" class="wishlist-button ${wishlistedClass} absolute right-3 top-3 rounded-full border border-white/30 bg-white/10 p-2 text-white transition hover:bg-white/20" aria-label="Toggle wishlist" aria-pressed="${wishlistedState}">
-                <svg xmlns="http://www.w3.org/2000/svg" fill="${heartFill}" viewBox="0 0 24 24" stroke-width="1.5" stroke="${heartStroke}" class="h-6 w-6">
-                  <path stroke-linecap="round" stroke-linejoin="round" d="M21 8.25c0-2.485-2.099-4.5-4.688-4.5-1.935 0-3.597 1.126-4.312 2.733-.715-1.607-2.377-2.733-4.313-2.733C5.1 3.75 3 5.765 3 8.25c0 7.22 9 12 9 12s9-4.78 9-12z" />
-                </svg>
-              </button>
-            </div>
-            <div class="mt-4 flex flex-col gap-2">
-              <p class="text-xs uppercase tracking-[0.4em] text-white/50">${escapeHtml(venue.category)}</p>
-              <h3 class="text-xl font-semibold text-white">${escapeHtml(venue.name)}</h3>
-              <p class="text-sm text-white/60">${escapeHtml(venue.city)}</p>
-            </div>
-            <div class="mt-4 flex items-center justify-between">
-              <span class="rounded-full border border-white/20 bg-white/10 px-3 py-1 text-xs uppercase tracking-widest text-white/70">Rp ${escapeHtml(priceDisplay)}</span>
-              <a href="${escapeHtml(venue.url)}" class="interactive-glow rounded-2xl bg-white/10 px-4 py-2 text-sm font-semibold text-white transition hover:bg-white/20" data-ripple>View product</a>
-            </div>
-          `;
-          grid.appendChild(card);
-        });
+        data.venues.forEach((venue) => grid.appendChild(createCatalogCard(venue)));
         if (window.RagaSpace && typeof window.RagaSpace.refreshInteractive === 'function') {
           window.RagaSpace.refreshInteractive(grid);
         }
       })
-      .catch((error) => console.error('Filter failed', error));
+      .catch((error) => console.error('Filter failed', error))
+      .finally(() => {
+        catalogState.loading = false;
+      });
+  };
+
+  if (sentinel && 'IntersectionObserver' in window) {
+    const observer = new IntersectionObserver(
+      (entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) {
+          loadCatalogPage();
+        }
+      },
+      { rootMargin: '400px 0px' }
+    );
+    observer.observe(sentinel);
+  }
+
+  filterForm.addEventListener('submit', (event) => {
+    event.preventDefault();
+    catalogState.params = new URLSearchParams(new FormData(filterForm));
+    catalogState.nextCursor = null;
+    loadCatalogPage({ reset: true });
+  });
+}
+
+const formatSlotTime = (value) => String(value).slice(11, 16);
+
+const createAvailabilityDay = (day) => {
+  const item = document.createElement('div');
+  const stateClass = day.is_reserved ? 'border-white/20 bg-white/10' : 'border-emerald-400/40 bg-emerald-400/10';
+  item.className = `flex items-center justify-between rounded-2xl border px-4 py-3 ${stateClass}`;
+  const label = new Date(`${day.date}T00:00:00`).toLocaleDateString(undefined, {
+    month: 'short',
+    day: '2-digit',
+    year: 'numeric',
+  });
+  let status = '<span class="text-xs font-medium text-emerald-200">Available</span>';
+  if (day.is_reserved) {
+    status = '<span class="text-xs font-medium text-white/70">Reserved</span>';
+  } else if (day.slots.some((slot) => !slot.is_free)) {
+    const ranges = day.free.map(([start, end]) => `${formatSlotTime(start)}–${formatSlotTime(end)}`).join(', ');
+    status = `<span class="text-right text-xs font-medium text-emerald-200">${escapeHtml(ranges)}</span>`;
+  }
+  item.innerHTML = `<span class="text-sm font-semibold text-white">${escapeHtml(label)}</span>${status}`;
+  return item;
+};
+
+const availabilityCalendar = document.querySelector('[data-availability-calendar]');
+if (availabilityCalendar) {
+  const daysContainer = availabilityCalendar.querySelector('[data-availability-days]');
+  const monthLabel = availabilityCalendar.querySelector('[data-availability-label]');
+  const today = availabilityCalendar.dataset.availabilityToday;
+  const currentMonth = availabilityCalendar.dataset.availabilityMonth;
+  const calendarState = { month: currentMonth, request: 0 };
+
+  const shiftMonth = (month, offset) => {
+    const [year, monthIndex] = month.split('-').map(Number);
+    const shifted = new Date(year, monthIndex - 1 + offset, 1);
+    return `${shifted.getFullYear()}-${String(shifted.getMonth() + 1).padStart(2, '0')}`;
+  };
+
+  const loadAvailabilityMonth = (month) => {
+    calendarState.month = month;
+    calendarState.request += 1;
+    const requestId = calendarState.request;
+    if (monthLabel) monthLabel.textContent = month;
+    fetch(`${availabilityCalendar.dataset.availabilityUrl}?month=${encodeURIComponent(month)}`, {
+      headers: {
+        'X-Requested-With': 'XMLHttpRequest',
+      },
+    })
+      .then((response) => response.json())
+      .then((data) => {
+        if (requestId !== calendarState.request) return;
+        const upcoming = (data.days || []).filter((day) => day.date >= today);
+        daysContainer.innerHTML = '';
+        if (upcoming.length === 0) {
+          daysContainer.innerHTML = '<p class="text-sm text-white/60">No upcoming availability found.</p>';
+          return;
+        }
+        upcoming.forEach((day) => daysContainer.appendChild(createAvailabilityDay(day)));
+      })
+      .catch((error) => console.error('Availability failed', error));
+  };
+
+  const previousButton = availabilityCalendar.querySelector('[data-availability-prev]');
+  const nextButton = availabilityCalendar.querySelector('[data-availability-next]');
+  if (previousButton) {
+    previousButton.addEventListener('click', () => {
+      if (calendarState.month > currentMonth) {
+        loadAvailabilityMonth(shiftMonth(calendarState.month, -1));
+      }
+    });
+  }
+  if (nextButton) {
+    nextButton.addEventListener('click', () => loadAvailabilityMonth(shiftMonth(calendarState.month, 1)));
+  }
+  loadAvailabilityMonth(currentMonth);
+}
+
+const bookingForm = document.querySelector('[data-booking-form]');
+if (bookingForm && bookingForm.dataset.holdUrl) {
+  const holdStatus = bookingForm.querySelector('[data-hold-status]');
+  const holdFields = ['start_datetime', 'end_datetime', 'start_time', 'end_time'];
+  let lastHoldKey = '';
+
+  const requestHold = () => {
+    const formData = new FormData(bookingForm);
+    if (!formData.get('start_datetime') || !formData.get('end_datetime')) return;
+    const holdKey = holdFields.map((name) => formData.get(name) || '').join('|');
+    if (holdKey === lastHoldKey) return;
+    lastHoldKey = holdKey;
+    const csrfToken = getCsrfToken();
+    fetch(bookingForm.dataset.holdUrl, {
+      method: 'POST',
+      headers: {
+        'X-Requested-With': 'XMLHttpRequest',
+        Accept: 'application/json',
+        ...(csrfToken ? { 'X-CSRFToken': csrfToken } : {}),
+      },
+      credentials: 'same-origin',
+      body: formData,
+    })
+      .then((response) => response.json().then((data) => ({ ok: response.ok, data })))
+      .then(({ ok, data }) => {
+        if (!holdStatus) return;
+        if (ok) {
+          const expiresAt = new Date(data.expires_at);
+          holdStatus.textContent = `We're holding these hours for you until ${expiresAt.toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' })}.`;
+          holdStatus.classList.remove('hidden');
+        } else {
+          holdStatus.classList.add('hidden');
+          showToast(data.error || 'These hours are not available.', { level: 'error' });
+        }
+      })
+      .catch((error) => console.error('Hold failed', error));
+  };
+
+  holdFields.forEach((name) => {
+    const field = bookingForm.elements.namedItem(name);
+    if (field) field.addEventListener('change', requestHold);
   });
 }
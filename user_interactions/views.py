@@ -40,7 +40,6 @@ class WishlistView(EnsureCsrfCookieMixin, LoginRequiredMixin, ListView):
         context["approved_bookings"] = (
             Booking.objects.filter(user=self.request.user, status=Booking.STATUS_ACTIVE)
             .select_related("venue")
-            .prefetch_related("addons")
             .order_by("-start_datetime")
         )
         return context
@@ -97,6 +97,55 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+CATALOG_FILTER_PAGE_SIZE = int(os.getenv("CATALOG_FILTER_PAGE_SIZE", "12"))
+CATALOG_FILTER_MAX_PAGE_SIZE = int(os.getenv("CATALOG_FILTER_MAX_PAGE_SIZE", "48"))
+CATALOG_FACET_CACHE_TIMEOUT = int(os.getenv("CATALOG_FACET_CACHE_TIMEOUT", "300"))
+AVAILABILITY_CACHE_TIMEOUT = int(os.getenv("AVAILABILITY_CACHE_TIMEOUT", "86400"))
+SLOT_HOLD_MINUTES = int(os.getenv("SLOT_HOLD_MINUTES", "10"))
+SLOT_HOLD_MAX_HOURS = int(os.getenv("SLOT_HOLD_MAX_HOURS", "72"))
+# Live holds one user may keep at once, each on a different venue.
+SLOT_HOLD_MAX_PER_USER = int(os.getenv("SLOT_HOLD_MAX_PER_USER", "3"))
+BOOKING_CONFLICT_POLICY = os.getenv("BOOKING_CONFLICT_POLICY", "cancel")
+# Dates further than this from today are rejected by availability filters and calendars.
+BOOKING_HORIZON_DAYS = int(os.getenv("BOOKING_HORIZON_DAYS", "365"))
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+# A request still unfinished after this long is presumed dead, and a retry may run it again.
+IDEMPOTENCY_PROCESSING_LEASE_SECONDS = int(os.getenv("IDEMPOTENCY_PROCESSING_LEASE_SECONDS", "300"))
+# "sync" confirms payments in the payment view; "webhook" waits for the provider's webhook.
+PAYMENT_CONFIRMATION = os.getenv("PAYMENT_CONFIRMATION", "sync")
+PAYMENT_WEBHOOK_SECRETS = {
+    "qris": os.getenv("PAYMENT_WEBHOOK_SECRET_QRIS", ""),
+    "gopay": os.getenv("PAYMENT_WEBHOOK_SECRET_GOPAY", ""),
+}
+PAYMENT_WEBHOOK_TOLERANCE_SECONDS = int(os.getenv("PAYMENT_WEBHOOK_TOLERANCE_SECONDS", "300"))
+# Outbox events younger than this wait for the next relay run so late commits are not skipped.
+OUTBOX_RELAY_DELAY_SECONDS = int(os.getenv("OUTBOX_RELAY_DELAY_SECONDS", "5"))
+# A job still running after this long is assumed lost and queued again; keep it above the slowest job.
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+
+EMAIL_BACKEND = os.getenv("DJANGO_EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend")
+EMAIL_HOST = os.getenv("DJANGO_EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.getenv("DJANGO_EMAIL_PORT", "25"))
+EMAIL_HOST_USER = os.getenv("DJANGO_EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.getenv("DJANGO_EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.getenv("DJANGO_EMAIL_USE_TLS", "0") == "1"
+EMAIL_TIMEOUT = int(os.getenv("DJANGO_EMAIL_TIMEOUT", "10"))
+DEFAULT_FROM_EMAIL = os.getenv("DJANGO_DEFAULT_FROM_EMAIL", "RagaSpace <no-reply@ragaspace.local>")
+# Absolute base for links in emails, which are rendered outside any request.
+SITE_URL = os.getenv("SITE_URL", "http://127.0.0.1:8000").rstrip("/")
+NOTIFICATION_BATCH_SIZE = int(os.getenv("NOTIFICATION_BATCH_SIZE", "100"))
+# Rows fetched and written per chunk by the workspace exports.
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+POPULARITY_HALF_LIFE_DAYS = float(os.getenv("POPULARITY_HALF_LIFE_DAYS", "30")) or None
+POPULARITY_WISHLIST_WEIGHT = float(os.getenv("POPULARITY_WISHLIST_WEIGHT", "0.5"))
+POPULARITY_REVIEW_WEIGHT = float(os.getenv("POPULARITY_REVIEW_WEIGHT", "1"))
+CATALOG_SEARCH_BACKEND = os.getenv(
+    "CATALOG_SEARCH_BACKEND",
+    "field_catalog.search.PostgresSearchBackend"
+    if "postgresql" in DATABASES["default"]["ENGINE"]
+    else "field_catalog.search.SQLiteFTS5Backend",
+)
+
 LOGIN_REDIRECT_URL = "home"
 LOGOUT_REDIRECT_URL = "auth:login"
 LOGIN_URL = "auth:login"